@@ -0,0 +1,140 @@
+"""
+Agregados de los resultados de simulaciones calculados en la base de datos.
+Los campos de `results` (p. ej. `accuracy` o `metrics.f1_score`) se leen con
+las funciones JSON del motor (JSON_EXTRACT en SQLite, #>> en PostgreSQL) y
+los percentiles se calculan con funciones de ventana (método del rango más
+cercano), así al backend solo llega una fila por grupo y campo.
+
+Las respuestas se cachean por usuario con su versión de datos
+(`users.data_version`, ver etags.py) en la clave: la incrementan tanto los
+endpoints del backend como el runner al completar una simulación, así que un
+cambio en cualquier proceso deja obsoletas las entradas sin invalidar nada y
+expiran por LRU o TTL (ANALYTICS_CACHE_TTL). Comprobarla cuesta una lectura
+por clave primaria.
+"""
+
+import os
+import re
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from cache import TTLCache
+from etags import version_statement
+from models import Simulation
+from queries import simulation_filters
+
+FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*){0,3}$")
+DEFAULT_FIELDS = ["accuracy", "loss"]
+DEFAULT_PERCENTILES = [50, 90, 99]
+GROUP_BY_HELP = "robot, sweep o param:<nombre>"
+
+analytics_cache = TTLCache(
+    maxsize=int(os.getenv("ANALYTICS_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("ANALYTICS_CACHE_TTL", "30")),
+)
+
+
+def valid_field(field: str) -> bool:
+    return bool(FIELD_PATTERN.match(field))
+
+
+def _json_path(column, path: str):
+    return column[tuple(path.split("."))]
+
+
+def group_expression(group_by: str):
+    """Expresión de agrupación; ValueError si `group_by` no es válido"""
+    if group_by == "robot":
+        return Simulation.robot_id
+    if group_by == "sweep":
+        return Simulation.sweep_id
+    if group_by.startswith("param:") and valid_field(group_by[len("param:"):]):
+        return _json_path(Simulation.parameters, group_by[len("param:"):]).as_string()
+    raise ValueError(f"group_by inválido: {group_by!r} (opciones: {GROUP_BY_HELP})")
+
+
+def field_statement(
+    user_id: int,
+    field: str,
+    group_by: str,
+    percentiles: Sequence[int],
+    best: str,
+    robot_id: Optional[int] = None,
+    sweep_id: Optional[str] = None,
+):
+    """
+    SELECT con count/mean/min/max, percentiles y mejor valor (con su
+    simulación) de `results.<field>` por grupo, sobre las simulaciones
+    completadas del usuario.
+    """
+    group = group_expression(group_by)
+    value = _json_path(Simulation.results, field).as_float()
+    best_order = value.desc() if best == "max" else value.asc()
+    ranked = (
+        select(
+            group.label("group_key"),
+            Simulation.id.label("simulation_id"),
+            value.label("value"),
+            func.row_number().over(partition_by=group, order_by=value).label("value_rank"),
+            func.row_number().over(partition_by=group, order_by=(best_order, Simulation.id)).label("best_rank"),
+            func.count().over(partition_by=group).label("total"),
+        )
+        .where(*simulation_filters(user_id, "completed", robot_id, sweep_id=sweep_id), value.is_not(None))
+        .subquery()
+    )
+    columns = [
+        ranked.c.group_key,
+        func.count().label("count"),
+        func.avg(ranked.c.value).label("mean"),
+        func.min(ranked.c.value).label("min"),
+        func.max(ranked.c.value).label("max"),
+    ]
+    for p in percentiles:
+        # Rango más cercano: el valor en la posición ceil(p/100 * total)
+        nearest_rank = (ranked.c.total * p + 99) // 100
+        columns.append(func.max(case((ranked.c.value_rank == nearest_rank, ranked.c.value))).label(f"p{p}"))
+    columns.append(func.max(case((ranked.c.best_rank == 1, ranked.c.value))).label("best"))
+    columns.append(func.max(case((ranked.c.best_rank == 1, ranked.c.simulation_id))).label("best_simulation_id"))
+    return select(*columns).group_by(ranked.c.group_key).order_by(ranked.c.group_key)
+
+
+def aggregate_results(
+    db: Session,
+    user_id: int,
+    fields: Sequence[str],
+    group_by: str,
+    percentiles: Sequence[int],
+    best: str = "max",
+    robot_id: Optional[int] = None,
+    sweep_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Agregados por grupo de cada campo, cacheados por usuario y versión de datos"""
+    key = (
+        user_id, db.scalar(version_statement(user_id)), tuple(fields), group_by,
+        tuple(percentiles), best, robot_id, sweep_id,
+    )
+    cached = analytics_cache.get(key)
+    if cached is not None:
+        return cached
+
+    groups: Dict[Any, Dict[str, Any]] = {}
+    for field in fields:
+        statement = field_statement(user_id, field, group_by, percentiles, best, robot_id, sweep_id)
+        for row in db.execute(statement).mappings():
+            stats = dict(row)
+            group_key = stats.pop("group_key")
+            stats["percentiles"] = {f"p{p}": stats.pop(f"p{p}") for p in percentiles}
+            group = groups.setdefault(group_key, {"key": None if group_key is None else str(group_key), "fields": {}})
+            group["fields"][field] = stats
+
+    result = {
+        "group_by": group_by,
+        "fields": list(fields),
+        "percentiles": list(percentiles),
+        "best": best,
+        "groups": list(groups.values()),
+    }
+    analytics_cache.set(key, result)
+    return result
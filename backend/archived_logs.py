@@ -0,0 +1,96 @@
+"""
+Lectura de logs archivados (ver log_retention.py del runner).
+Cuando una simulación tiene `logs_archive_path`, sus logs ya no están (o
+están dejando de estar) en `training_logs`; los endpoints los sirven desde el
+archivo con el mismo orden, filtros y formato de cursor que la consulta a la
+base, así el cliente no nota la diferencia.
+
+Un archivo se descomprime una vez y queda en una cache LRU por ruta (es
+inmutable: si la simulación se vuelve a archivar cambia la ruta).
+"""
+
+import bisect
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache import TTLCache
+from log_archive import LogArchive
+from pagination import decode_cursor, encode_cursor
+
+archive_cache = TTLCache(
+    maxsize=int(os.getenv("LOG_ARCHIVE_CACHE_SIZE", "16")),
+    ttl=float(os.getenv("LOG_ARCHIVE_CACHE_TTL", "300")),
+)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ArchivedLogs:
+    """Logs de un archivo indexados por id y por (timestamp, id)"""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            row["timestamp_raw"] = str(row["timestamp"])
+            row["timestamp"] = _naive_utc(datetime.fromisoformat(row["timestamp_raw"]))
+        # El archivo está en orden de id
+        self.by_id = rows
+        self.ids = [row["id"] for row in rows]
+        self.by_key = sorted(rows, key=lambda row: (row["timestamp_raw"], row["id"]))
+        self.keys = [(row["timestamp_raw"], row["id"]) for row in self.by_key]
+
+    def after(self, after_id: int, limit: int, until_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Logs con id > after_id (y <= until_id) en orden ascendente"""
+        start = bisect.bisect_right(self.ids, after_id)
+        rows = self.by_id[start:start + limit]
+        if until_id is not None:
+            rows = [row for row in rows if row["id"] <= until_id]
+        return rows
+
+    def page(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        level: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Página del más reciente al más antiguo, como `keyset_statement` sobre LOG_PAGE_KEYS"""
+        end = len(self.keys)
+        if cursor:
+            timestamp_raw, log_id = decode_cursor(cursor, 2)
+            end = bisect.bisect_left(self.keys, (str(timestamp_raw), log_id))
+        level = level.upper() if level else None
+        since = _naive_utc(since) if since else None
+        until = _naive_utc(until) if until else None
+
+        rows = []
+        for index in range(end - 1, -1, -1):
+            row = self.by_key[index]
+            if level and row["log_level"] != level:
+                continue
+            if since and row["timestamp"] < since:
+                continue
+            if until and row["timestamp"] >= until:
+                continue
+            rows.append(row)
+            if len(rows) > limit:
+                break
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1]["timestamp_raw"], rows[-1]["id"]])
+        return rows, next_cursor
+
+
+def load(path: str) -> ArchivedLogs:
+    archived = archive_cache.get(path)
+    if archived is None:
+        archived = ArchivedLogs(list(LogArchive.read(path)))
+        archive_cache.set(path, archived)
+    return archived
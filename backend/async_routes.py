@@ -0,0 +1,165 @@
+"""
+Variantes async de los endpoints de lectura y creación más frecuentes.
+Usan AsyncSession (aiosqlite/asyncpg) en el event loop en lugar del
+threadpool, así la concurrencia queda limitada por el pool de conexiones
+(DB_POOL_SIZE + DB_MAX_OVERFLOW) y no por los hilos del threadpool.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+import archived_logs
+from auth import get_current_active_user_async
+from database import get_async_db
+from etags import bump_version, conditional_response, make_etag, version_statement, versioned_body, versioned_response
+from models import Robot, Simulation, User
+from notifications import notifier
+from pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_statement
+)
+from projections import LOG_PROJECTION, ROBOT_PROJECTION, SIMULATION_PROJECTION, Projection, dumps
+from queries import (
+    ROBOT_PAGE_KEYS, SIMULATION_PAGE_KEYS, LOG_PAGE_KEYS,
+    robot_filters, simulation_filters, log_filters
+)
+from schemas import (
+    RobotResponse, SimulationCreate, SimulationResponse, TrainingLogResponse,
+    SIMULATION_ADAPTER
+)
+
+router = APIRouter(prefix="/async", tags=["async"])
+
+
+async def _fetch_rows(db: AsyncSession, projection: Projection, stmt, keys, cursor, limit, descending: bool = True):
+    """Página de dicts del camino ligero (ver projections.py)"""
+    rows = (await db.execute(keyset_statement(stmt, keys, cursor, limit, descending))).all()
+    return projection.page(rows, limit)
+
+
+async def _etag(db: AsyncSession, request: Request, user_id: int) -> str:
+    return make_etag(request, user_id, await db.scalar(version_statement(user_id)))
+
+
+def _cursor_headers(next_cursor: Optional[str]):
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+
+
+async def _owned_simulation(db: AsyncSession, simulation_id: int, user_id: int) -> Simulation:
+    simulation = (await db.execute(
+        select(Simulation).where(Simulation.id == simulation_id, Simulation.user_id == user_id)
+    )).scalars().first()
+    if not simulation:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    return simulation
+
+
+@router.get("/robots/", response_model=List[RobotResponse])
+async def get_robots(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    robot_status: Optional[str] = Query(None, alias="status"),
+    robot_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Obtener lista de robots del usuario (async)"""
+    etag = await _etag(db, request, current_user.id)
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    stmt = ROBOT_PROJECTION.select().where(*robot_filters(current_user.id, robot_status, robot_type))
+    robots, next_cursor = await _fetch_rows(db, ROBOT_PROJECTION, stmt, ROBOT_PAGE_KEYS, cursor, limit, descending=False)
+    return versioned_body(etag, dumps(robots), _cursor_headers(next_cursor))
+
+
+@router.get("/simulations/", response_model=List[SimulationResponse])
+async def get_simulations(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    simulation_status: Optional[str] = Query(None, alias="status"),
+    robot_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sweep_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Obtener lista de simulaciones del usuario (async)"""
+    etag = await _etag(db, request, current_user.id)
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    stmt = SIMULATION_PROJECTION.select().where(*simulation_filters(
+        current_user.id, simulation_status, robot_id, created_after, created_before, sweep_id
+    ))
+    simulations, next_cursor = await _fetch_rows(db, SIMULATION_PROJECTION, stmt, SIMULATION_PAGE_KEYS, cursor, limit)
+    return versioned_body(etag, dumps(simulations), _cursor_headers(next_cursor))
+
+
+@router.post("/simulations/", response_model=SimulationResponse)
+async def create_simulation(
+    simulation: SimulationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Crear una nueva simulación (async)"""
+    robot = (await db.execute(
+        select(Robot.id).where(Robot.id == simulation.robot_id, Robot.user_id == current_user.id)
+    )).first()
+    if not robot:
+        raise HTTPException(status_code=404, detail="Robot no encontrado")
+
+    db_simulation = Simulation(**simulation.dict(), user_id=current_user.id)
+    db.add(db_simulation)
+    await db.execute(bump_version(current_user.id))
+    await db.commit()
+    await db.refresh(db_simulation)
+
+    notifier.notify("simulation_created", simulation_id=db_simulation.id)
+    return db_simulation
+
+
+@router.get("/simulations/{simulation_id}", response_model=SimulationResponse)
+async def get_simulation(
+    simulation_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Obtener una simulación específica (async)"""
+    etag = await _etag(db, request, current_user.id)
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    simulation = await _owned_simulation(db, simulation_id, current_user.id)
+    return versioned_response(etag, SIMULATION_ADAPTER, simulation)
+
+
+@router.get("/simulations/{simulation_id}/logs", response_model=List[TrainingLogResponse])
+async def get_simulation_logs(
+    simulation_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    level: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Obtener logs de una simulación (async)"""
+    simulation = await _owned_simulation(db, simulation_id, current_user.id)
+    if simulation.logs_archive_path:
+        archived = await run_in_threadpool(archived_logs.load, simulation.logs_archive_path)
+        rows, next_cursor = archived.page(cursor, limit, level, since, until)
+        logs = [LOG_PROJECTION.from_mapping(row) for row in rows]
+    else:
+        stmt = LOG_PROJECTION.select().where(*log_filters(simulation_id, level, since, until))
+        logs, next_cursor = await _fetch_rows(db, LOG_PROJECTION, stmt, LOG_PAGE_KEYS, cursor, limit)
+    return Response(content=dumps(logs), media_type="application/json", headers=_cursor_headers(next_cursor))
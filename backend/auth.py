@@ -1,13 +1,19 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 import os
+import threading
+import time
 
-from database import get_db
+from cache import TTLCache
+from database import get_db, get_async_db
+from hashing import HashingOverloaded, password_executor
 from models import User
 
 # Configuración de seguridad
@@ -15,12 +21,23 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Contexto para hash de contraseñas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Contexto para hash de contraseñas (costo de bcrypt configurable)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # Esquema de seguridad
 security = HTTPBearer()
 
+# Cache de tokens decodificados y de usuarios autenticados
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+token_cache = TTLCache(maxsize=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")), ttl=AUTH_CACHE_TTL)
+user_cache = TTLCache(maxsize=int(os.getenv("AUTH_USER_CACHE_SIZE", "10000")), ttl=AUTH_CACHE_TTL)
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+# Latencia acumulada de get_current_user según si el usuario salió de cache
+_lookup_lock = threading.Lock()
+_lookup_stats = {"hit": [0, 0.0], "miss": [0, 0.0]}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar contraseña contra hash"""
     # Si el hash es bcrypt válido, usar passlib
@@ -37,6 +54,36 @@ def get_password_hash(password: str) -> str:
     """Generar hash de contraseña"""
     return pwd_context.hash(password)
 
+def _hashing_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servicio de autenticación saturado, reintente en unos segundos",
+        headers={"Retry-After": "1"},
+    )
+
+def ensure_hashing_capacity():
+    """Rechazar de entrada (antes de tocar la base) si la cola de hashing está llena"""
+    try:
+        password_executor.check_capacity()
+    except HashingOverloaded:
+        raise _hashing_overloaded()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password en el executor de hashing; 503 si la cola está llena"""
+    if not hashed_password.startswith('$2b$'):
+        return verify_password(plain_password, hashed_password)
+    try:
+        return await password_executor.run(verify_password, plain_password, hashed_password)
+    except HashingOverloaded:
+        raise _hashing_overloaded()
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash en el executor de hashing; 503 si la cola está llena"""
+    try:
+        return await password_executor.run(get_password_hash, password)
+    except HashingOverloaded:
+        raise _hashing_overloaded()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Crear token JWT de acceso"""
     to_encode = data.copy()
@@ -51,38 +98,114 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def verify_token(token: str) -> Optional[str]:
     """Verificar y decodificar token JWT"""
+    email, _ = _decode_token(token)
+    return email
+
+def _decode_token(token: str) -> Tuple[Optional[str], Optional[float]]:
+    """Decodificar token JWT devolviendo (email, expiración epoch)"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            return None
-        return email
+            return None, None
+        return email, payload.get("exp")
     except JWTError:
+        return None, None
+
+def verify_token_cached(token: str) -> Optional[str]:
+    """Como verify_token, pero reutiliza decodificaciones previas hasta que el token expira"""
+    email = token_cache.get(token)
+    if email is not None:
+        return email
+    email, exp = _decode_token(token)
+    if email is not None:
+        ttl = exp - time.time() if exp else None
+        token_cache.set(token, email, ttl)
+    return email
+
+def _cached_user_instance(email: str) -> Optional[User]:
+    """Reconstruir el usuario cacheado como instancia detached, sin consultar la base"""
+    snapshot = user_cache.get(email)
+    if snapshot is None:
         return None
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+def _user_from_cache(db: Session, email: str) -> Optional[User]:
+    """Usuario cacheado asociado a la sesión de la petición"""
+    user = _cached_user_instance(email)
+    return db.merge(user, load=False) if user is not None else None
+
+def _cache_user(user: User):
+    user_cache.set(user.email, {key: getattr(user, key) for key in _USER_COLUMNS})
+
+def invalidate_user(email: str):
+    """Descartar el usuario cacheado (p. ej. tras actualizarlo o desactivarlo)"""
+    user_cache.delete(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    invalidate_user(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted or ():
+        invalidate_user(old_email)
+
+def _record_lookup(kind: str, seconds: float):
+    with _lookup_lock:
+        _lookup_stats[kind][0] += 1
+        _lookup_stats[kind][1] += seconds
+
+def auth_cache_stats() -> dict:
+    """Métricas de la cache de autenticación: hit ratio y latencia ahorrada"""
+    with _lookup_lock:
+        hits, hit_seconds = _lookup_stats["hit"]
+        misses, miss_seconds = _lookup_stats["miss"]
+    avg_hit = hit_seconds / hits if hits else 0.0
+    avg_miss = miss_seconds / misses if misses else 0.0
+    return {
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+        "lookup_ms": {"hit": round(avg_hit * 1000, 4), "miss": round(avg_miss * 1000, 4)},
+        "saved_ms_per_hit": round(max(avg_miss - avg_hit, 0.0) * 1000, 4),
+        "saved_ms_total": round(max(avg_miss - avg_hit, 0.0) * hits * 1000, 2),
+    }
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="No se pudieron validar las credenciales",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _email_from_credentials(credentials: HTTPAuthorizationCredentials) -> str:
+    try:
+        email = verify_token_cached(credentials.credentials)
+    except Exception:
+        email = None
+    if email is None:
+        raise _credentials_exception()
+    return email
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """Obtener usuario actual desde token JWT"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="No se pudieron validar las credenciales",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    started = time.perf_counter()
+    email = _email_from_credentials(credentials)
     
-    try:
-        token = credentials.credentials
-        email = verify_token(token)
-        if email is None:
-            raise credentials_exception
-    except:
-        raise credentials_exception
+    user = _user_from_cache(db, email)
+    if user is not None:
+        _record_lookup("hit", time.perf_counter() - started)
+        return user
     
     user = db.query(User).filter(User.email == email).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
+    _cache_user(user)
+    _record_lookup("miss", time.perf_counter() - started)
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -90,3 +213,30 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Usuario inactivo")
     return current_user
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Versión async de get_current_user (comparte las caches)"""
+    started = time.perf_counter()
+    email = _email_from_credentials(credentials)
+    
+    user = _cached_user_instance(email)
+    if user is not None:
+        _record_lookup("hit", time.perf_counter() - started)
+        return await db.merge(user, load=False)
+    
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if user is None:
+        raise _credentials_exception()
+    
+    _cache_user(user)
+    _record_lookup("miss", time.perf_counter() - started)
+    return user
+
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """Versión async de get_current_active_user"""
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return current_user
@@ -1,19 +1,110 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
+import time
+
+import instrumentation
+from sqlite_profile import profile as sqlite_profile
 
 # Obtener URL de la base de datos desde variables de entorno
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./robot_training.db")
 
+# Tamaño del pool de conexiones (por engine y por proceso)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+def async_database_url(url: str) -> str:
+    """Traducir la URL síncrona al driver async equivalente"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+def _pool_options(url: str) -> dict:
+    # SQLite en memoria usa un pool de una conexión por hilo sin tamaño configurable
+    if ":memory:" in url:
+        return {}
+    options = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
+    if not url.startswith("sqlite"):
+        # Servidores como PostgreSQL cortan conexiones inactivas o al reiniciar
+        options["pool_pre_ping"] = True
+    return options
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_database_url(DATABASE_URL))
+
 # Crear engine de SQLAlchemy
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    connect_args={"check_same_thread": False, "timeout": sqlite_profile.timeout} if DATABASE_URL.startswith("sqlite") else {},
+    **_pool_options(DATABASE_URL)
+)
+
+# Engine async para los endpoints que no usan el threadpool
+# (aiosqlite usa NullPool por defecto; se fuerza un pool real para poder dimensionarlo)
+_async_pool_options = _pool_options(ASYNC_DATABASE_URL)
+if _async_pool_options:
+    _async_pool_options["poolclass"] = AsyncAdaptedQueuePool
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_pool_options)
+
+# Pragmas de SQLite (WAL, busy timeout, mmap, cache) en cada conexión nueva
+def _apply_sqlite_profile(dbapi_connection, connection_record):
+    sqlite_profile.apply(dbapi_connection)
+
+for _engine in (engine, async_engine.sync_engine):
+    if _engine.dialect.name == "sqlite":
+        event.listen(_engine, "connect", _apply_sqlite_profile)
+
+# Métricas de consultas (solo con PROMETHEUS_ENABLED: sin él no se registran los eventos)
+QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "PRAGMA", "BEGIN", "COMMIT"}
+query_duration = instrumentation.histogram(
+    "db_query_duration_seconds", "Duración de las consultas SQL", ["engine", "operation"]
 )
+query_errors = instrumentation.counter("db_query_errors_total", "Consultas SQL que fallaron", ["engine", "operation"])
+active_sessions = instrumentation.gauge("db_sessions_active", "Sesiones de base de datos abiertas por peticiones", ["engine"])
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in QUERY_OPERATIONS else "OTHER"
+
+def _instrument(target, name: str):
+    """Registrar duración y errores de cada consulta de `target`"""
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        query_duration.labels(name, _operation(statement)).observe(time.perf_counter() - started)
+
+    def handle_error(context):
+        stack = context.connection.info.get("query_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
+        query_errors.labels(name, _operation(context.statement or "")).inc()
+
+    event.listen(target, "before_cursor_execute", before_cursor_execute)
+    event.listen(target, "after_cursor_execute", after_cursor_execute)
+    event.listen(target, "handle_error", handle_error)
+
+def _pool_samples():
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        if hasattr(pool, "checkedout"):
+            yield "gauge", "db_pool_connections_in_use", "Conexiones del pool en uso", {"engine": name}, pool.checkedout()
+            yield "gauge", "db_pool_size", "Tamaño base del pool", {"engine": name}, pool.size()
+
+if instrumentation.ENABLED:
+    _instrument(engine, "sync")
+    _instrument(async_engine.sync_engine, "async")
+instrumentation.register_callback(_pool_samples)
 
 # Crear sesión local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base para los modelos
 Base = declarative_base()
@@ -21,7 +112,40 @@ Base = declarative_base()
 # Dependency para obtener la sesión de la base de datos
 def get_db():
     db = SessionLocal()
+    active_sessions.labels("sync").inc()
     try:
         yield db
     finally:
         db.close()
+        active_sessions.labels("sync").dec()
+
+# Dependency para obtener una sesión async
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        active_sessions.labels("async").inc()
+        try:
+            yield db
+        finally:
+            active_sessions.labels("async").dec()
+
+def upgrade_schema(bind=engine):
+    """
+    Agregar a tablas existentes las columnas e índices nuevos de los modelos.
+    `create_all` solo crea tablas que no existen, así que las bases ya
+    desplegadas necesitan este paso para recibir columnas nuevas.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
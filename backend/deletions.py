@@ -0,0 +1,208 @@
+"""
+Borrado en bloque de robots y simulaciones.
+`db.delete(robot)` con la cascada del ORM carga en la sesión cada simulación
+y cada log antes de borrarlos uno a uno: con millones de logs tarda minutos,
+ocupa gigabytes y mantiene el lock de escritura todo ese tiempo. Aquí el
+borrado son sentencias SQL por conjuntos:
+
+1. Los logs se borran por simulación en lotes de `batch_size` filas, cada
+   lote en su propia transacción corta (usa el índice por simulation_id) y
+   con una pausa entre lotes para que el runner pueda escribir.
+2. Una última transacción borra los logs que el runner haya escrito entre
+   medias, las simulaciones y el robot, e incrementa la versión de datos del
+   usuario (ETags).
+3. Confirmado el borrado se eliminan los ficheros asociados: series de
+   métricas, archivos de logs y checkpoints.
+
+La memoria es constante y la latencia de cada transacción no depende del
+historial. Un borrado puede ejecutarse en la petición o como trabajo en
+segundo plano (`?background=true`) consultable en `GET /deletions/{id}`; los
+trabajos corren de uno en uno para no competir entre sí por el lock.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+import instrumentation
+from archived_logs import archive_cache
+from cache import TTLCache
+from etags import bump_version
+from log_archive import LogArchive
+from metrics_store import MetricsStore
+
+logger = logging.getLogger(__name__)
+
+DELETE_LOG_BATCH = text("""
+    DELETE FROM training_logs WHERE id IN (
+        SELECT id FROM training_logs WHERE simulation_id = :simulation_id LIMIT :batch_size
+    )
+""")
+
+deletion_duration = instrumentation.histogram(
+    "deletion_duration_seconds", "Duración de los borrados en bloque", ["kind"],
+    buckets=instrumentation.DURATION_BUCKETS,
+)
+
+
+class DeletionJob:
+    """Estado de un borrado en segundo plano"""
+
+    def __init__(self, kind: str, target_id: int, user_id: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.target_id = target_id
+        self.user_id = user_id
+        self.status = "pending"  # pending, running, completed, failed
+        self.deleted = {"training_logs": 0, "simulations": 0, "robots": 0}
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "target_id": self.target_id,
+            "status": self.status,
+            "deleted": dict(self.deleted),
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class Deleter:
+    def __init__(
+        self,
+        engine: Engine,
+        metrics: MetricsStore,
+        batch_size: int = 5000,
+        batch_pause: float = 0.05,
+        job_ttl: float = 3600,
+    ):
+        self.engine = engine
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.jobs = TTLCache(maxsize=1024, ttl=job_ttl)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deletions")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.failed = 0
+
+    def _simulation_ids(self, kind: str, target_id: int) -> List[int]:
+        column = "robot_id" if kind == "robot" else "id"
+        with self.engine.connect() as conn:
+            return list(conn.execute(
+                text(f"SELECT id FROM simulations WHERE {column} = :target_id"), {"target_id": target_id}
+            ).scalars())
+
+    def _delete_logs(self, simulation_id: int, deleted: Dict[str, int]):
+        while True:
+            with self.engine.begin() as conn:
+                removed = conn.execute(
+                    DELETE_LOG_BATCH, {"simulation_id": simulation_id, "batch_size": self.batch_size}
+                ).rowcount
+            deleted["training_logs"] += removed
+            if removed < self.batch_size:
+                return
+            time.sleep(self.batch_pause)
+
+    def _delete_rows(self, kind: str, target_id: int, user_id: int, deleted: Dict[str, int]) -> List[Dict[str, Any]]:
+        """Última transacción: restos de logs, simulaciones y robot. Devuelve las simulaciones borradas"""
+        column = "robot_id" if kind == "robot" else "id"
+        params = {"target_id": target_id}
+        with self.engine.begin() as conn:
+            simulations = [dict(row._mapping) for row in conn.execute(text(f"""
+                SELECT id, checkpoint_path, logs_archive_path FROM simulations WHERE {column} = :target_id
+            """), params)]
+            deleted["training_logs"] += conn.execute(text(f"""
+                DELETE FROM training_logs
+                WHERE simulation_id IN (SELECT id FROM simulations WHERE {column} = :target_id)
+            """), params).rowcount
+            deleted["simulations"] += conn.execute(
+                text(f"DELETE FROM simulations WHERE {column} = :target_id"), params
+            ).rowcount
+            if kind == "robot":
+                deleted["robots"] += conn.execute(text("DELETE FROM robots WHERE id = :target_id"), params).rowcount
+            conn.execute(bump_version(user_id))
+        return simulations
+
+    def _delete_files(self, simulations: List[Dict[str, Any]]):
+        for simulation in simulations:
+            try:
+                self.metrics.delete(simulation["id"])
+                if simulation["logs_archive_path"]:
+                    LogArchive.delete(simulation["logs_archive_path"])
+                    archive_cache.delete(simulation["logs_archive_path"])
+                if simulation["checkpoint_path"]:
+                    # Los checkpoints de una simulación comparten directorio (ver checkpoints.py del runner)
+                    shutil.rmtree(os.path.dirname(simulation["checkpoint_path"]), ignore_errors=True)
+            except OSError as e:
+                logger.warning(f"Error borrando ficheros de la simulación {simulation['id']}: {e}")
+
+    def delete(self, kind: str, target_id: int, user_id: int, deleted: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Borrar un robot (`kind="robot"`) o una simulación con todo lo que
+        cuelga de ellos. La propiedad se comprueba antes, en el endpoint.
+        Devuelve el número de filas borradas de cada tabla.
+        """
+        started = time.perf_counter()
+        deleted = deleted if deleted is not None else {"training_logs": 0, "simulations": 0, "robots": 0}
+        for simulation_id in self._simulation_ids(kind, target_id):
+            self._delete_logs(simulation_id, deleted)
+        simulations = self._delete_rows(kind, target_id, user_id, deleted)
+        self._delete_files(simulations)
+        deletion_duration.labels(kind).observe(time.perf_counter() - started)
+        return deleted
+
+    def _run(self, job: DeletionJob):
+        with self._lock:
+            self.pending -= 1
+            self.running += 1
+        job.status = "running"
+        try:
+            self.delete(job.kind, job.target_id, job.user_id, job.deleted)
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Error en el borrado {job.id} ({job.kind} {job.target_id}): {e}")
+            job.status = "failed"
+            job.error = str(e)
+            with self._lock:
+                self.failed += 1
+        finally:
+            job.finished_at = datetime.utcnow()
+            # El estado final se conserva `job_ttl` desde que termina
+            self.jobs.set(job.id, job)
+            with self._lock:
+                self.running -= 1
+
+    def submit(self, kind: str, target_id: int, user_id: int) -> DeletionJob:
+        """Encolar el borrado en segundo plano y devolver su trabajo"""
+        job = DeletionJob(kind, target_id, user_id)
+        self.jobs.set(job.id, job)
+        with self._lock:
+            self.pending += 1
+        self._executor.submit(self._run, job)
+        return job
+
+    def job(self, job_id: str, user_id: int) -> Optional[DeletionJob]:
+        job = self.jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"pending": self.pending, "running": self.running, "failed": self.failed}
@@ -0,0 +1,101 @@
+"""
+GET condicionales (ETag / If-None-Match) para los listados y detalles de
+robots y simulaciones.
+Cada usuario tiene un contador `users.data_version` que se incrementa en la
+misma transacción que cualquier cambio visible de sus robots o simulaciones:
+los endpoints de escritura del backend y los cambios de estado del runner.
+El ETag combina usuario, versión y URL, así que saber si el cliente tiene la
+respuesta vigente cuesta una lectura por clave primaria; si coincide con
+If-None-Match se responde 304 sin consultar ni serializar la lista.
+
+Opcionalmente (RESPONSE_CACHE_SIZE > 0) el cuerpo serializado se guarda en
+memoria con el ETag como clave, y otra pestaña u otro cliente del mismo
+usuario lo recibe sin repetir la consulta. Como la versión es parte de la
+clave, una escritura deja obsoletas las entradas sin invalidar nada: expiran
+por LRU o TTL. La cache es por proceso (ver cache.py).
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, update
+
+from cache import TTLCache
+from models import User
+
+CACHE_CONTROL = "private, no-cache"
+
+response_cache = TTLCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "0")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "60")),
+)
+
+
+def bump_version(user_id: int):
+    """UPDATE que incrementa la versión de datos del usuario (ejecutar antes del commit)"""
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def version_statement(user_id: int):
+    return select(User.data_version).where(User.id == user_id)
+
+
+def make_etag(request: Request, user_id: int, version: Optional[int]) -> str:
+    url = request.url.path
+    if request.url.query:
+        url += "?" + request.url.query
+    digest = hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+    return f'W/"{user_id}.{version or 0}.{digest}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Comparación débil: W/"x" y "x" son equivalentes
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def conditional_response(request: Request, etag: str) -> Optional[Response]:
+    """304 si el cliente tiene la versión vigente, la respuesta cacheada si existe, o None"""
+    if _matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    cached = response_cache.get(etag)
+    if cached is None:
+        return None
+    body, headers = cached
+    return _json_response(etag, body, headers)
+
+
+def versioned_response(
+    etag: str,
+    adapter: TypeAdapter,
+    content: Any,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serializar `content` con el esquema de respuesta, cachearlo y etiquetarlo con `etag`"""
+    return versioned_body(etag, adapter.dump_json(adapter.validate_python(content, from_attributes=True)), headers)
+
+
+def versioned_body(etag: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Como `versioned_response` para un cuerpo ya serializado (ver projections.py)"""
+    headers = headers or {}
+    response_cache.set(etag, (body, headers))
+    return _json_response(etag, body, headers)
+
+
+def _json_response(etag: str, body: bytes, headers: Dict[str, str]) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**headers, "ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
@@ -0,0 +1,87 @@
+"""
+Executor dedicado para el hashing de contraseñas (bcrypt).
+bcrypt tarda cientos de milisegundos por llamada; ejecutarlo en el threadpool
+general de FastAPI lo acapara durante una ráfaga de logins y deja sin hilos al
+resto de endpoints. Este executor tiene su propio número de hilos y una cola
+acotada: cuando se llena, las peticiones se rechazan en lugar de encolarse.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class HashingOverloaded(Exception):
+    """La cola de hashing está llena"""
+
+
+def _lower_thread_priority(niceness: int):
+    """
+    Bajar la prioridad del hilo de hashing (Linux: cada hilo tiene su propio
+    nice) para que el event loop y el resto de endpoints no esperen CPU.
+    """
+    if niceness <= 0:
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), niceness)
+    except (AttributeError, OSError):
+        pass
+
+
+class HashingExecutor:
+    def __init__(self, workers: int, queue_limit: int, niceness: int = 0):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="bcrypt",
+            initializer=_lower_thread_priority,
+            initargs=(niceness,),
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def saturated(self) -> bool:
+        """True si una petición nueva sería rechazada"""
+        return self.pending >= self.workers + self.queue_limit
+
+    def check_capacity(self):
+        """Lanzar HashingOverloaded (y contarlo) si una petición nueva sería rechazada"""
+        with self._lock:
+            if self.saturated():
+                self.rejected += 1
+                raise HashingOverloaded()
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Ejecutar `fn(*args)` en el executor o lanzar HashingOverloaded"""
+        with self._lock:
+            if self.saturated():
+                self.rejected += 1
+                raise HashingOverloaded()
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_executor = HashingExecutor(
+    workers=int(os.getenv("HASH_WORKERS", str(max(1, (os.cpu_count() or 2) - 1)))),
+    queue_limit=int(os.getenv("HASH_QUEUE_LIMIT", "64")),
+    niceness=int(os.getenv("HASH_THREAD_NICE", "10")),
+)
@@ -0,0 +1,193 @@
+"""
+Streaming incremental de logs de entrenamiento (Server-Sent Events).
+Un único poller por simulación lee las filas nuevas de `training_logs` a
+partir de un cursor (id del último log) y las reparte a todos los clientes
+suscritos, así N espectadores de la misma simulación cuestan una sola
+lectura. Cada cliente tiene una cola acotada: si no consume a tiempo se
+le cierra el stream y el navegador reconecta con `Last-Event-ID`.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+import archived_logs
+from database import SessionLocal
+from models import Simulation, TrainingLog
+from schemas import TrainingLogResponse
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+def read_logs(simulation_id: int, after_id: int, limit: int, until_id: Optional[int] = None) -> List[Dict]:
+    """Leer logs con id > after_id (y <= until_id) en orden ascendente"""
+    with SessionLocal() as db:
+        archive_path = db.query(Simulation.logs_archive_path).filter(Simulation.id == simulation_id).scalar()
+        if archive_path:
+            # Logs compactados por el runner (ver archived_logs.py)
+            rows = archived_logs.load(archive_path).after(after_id, limit, until_id)
+            return [TrainingLogResponse.model_validate(row).model_dump(mode="json") for row in rows]
+        query = db.query(TrainingLog).filter(
+            TrainingLog.simulation_id == simulation_id,
+            TrainingLog.id > after_id,
+        )
+        if until_id is not None:
+            query = query.filter(TrainingLog.id <= until_id)
+        rows = query.order_by(TrainingLog.id.asc()).limit(limit).all()
+        return [TrainingLogResponse.model_validate(row).model_dump(mode="json") for row in rows]
+
+
+def read_status(simulation_id: int) -> Optional[str]:
+    with SessionLocal() as db:
+        row = db.query(Simulation.status).filter(Simulation.id == simulation_id).first()
+        return row[0] if row else None
+
+
+class Subscriber:
+    def __init__(self, cursor: int, queue_size: int):
+        self.cursor = cursor
+        self.queue: "asyncio.Queue" = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, item) -> bool:
+        """Entregar un item sin bloquear; False si el cliente va retrasado"""
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed = True
+            return False
+
+
+class Channel:
+    """Poller compartido de una simulación"""
+
+    def __init__(self, simulation_id: int, cursor: int):
+        self.simulation_id = simulation_id
+        self.cursor = cursor
+        self.subscribers: Set[Subscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.finished = False
+
+
+class LogStreamHub:
+    def __init__(self, poll_interval: float = 1.0, batch_size: int = 500, queue_size: int = 64):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.channels: Dict[int, Channel] = {}
+        self.reads = 0
+
+    async def _backlog(self, subscriber: Subscriber, simulation_id: int, until_id: int):
+        """Enviar a un cliente que llega tarde los logs entre su cursor y el del canal"""
+        cursor = subscriber.cursor
+        while cursor < until_id:
+            rows = await run_in_threadpool(read_logs, simulation_id, cursor, self.batch_size, until_id)
+            self.reads += 1
+            if not rows:
+                break
+            yield rows
+            cursor = rows[-1]["id"]
+
+    def _join(self, simulation_id: int, subscriber: Subscriber) -> Channel:
+        channel = self.channels.get(simulation_id)
+        if channel is None or channel.finished:
+            channel = Channel(simulation_id, subscriber.cursor)
+            self.channels[simulation_id] = channel
+        channel.subscribers.add(subscriber)
+        if channel.task is None:
+            channel.task = asyncio.create_task(self._poll(channel))
+        return channel
+
+    def _leave(self, channel: Channel, subscriber: Subscriber):
+        channel.subscribers.discard(subscriber)
+        if not channel.subscribers and channel.task is not None:
+            channel.task.cancel()
+            if self.channels.get(channel.simulation_id) is channel:
+                del self.channels[channel.simulation_id]
+
+    def _publish(self, channel: Channel, item):
+        for subscriber in list(channel.subscribers):
+            if not subscriber.offer(item):
+                logger.info(f"Cliente lento en simulación {channel.simulation_id}, cerrando stream")
+                channel.subscribers.discard(subscriber)
+
+    async def _poll(self, channel: Channel):
+        try:
+            while channel.subscribers:
+                rows = await run_in_threadpool(read_logs, channel.simulation_id, channel.cursor, self.batch_size)
+                self.reads += 1
+                if rows:
+                    channel.cursor = rows[-1]["id"]
+                    self._publish(channel, rows)
+                    if len(rows) == self.batch_size:
+                        continue
+
+                if not rows:
+                    status = await run_in_threadpool(read_status, channel.simulation_id)
+                    if status is None or status in FINISHED_STATUSES:
+                        channel.finished = True
+                        self._publish(channel, {"end": status})
+                        break
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error en stream de simulación {channel.simulation_id}: {e}")
+            channel.finished = True
+            self._publish(channel, {"end": "error"})
+        finally:
+            if self.channels.get(channel.simulation_id) is channel:
+                del self.channels[channel.simulation_id]
+
+    async def stream(self, simulation_id: int, cursor: int, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """Generador SSE para un cliente a partir de `cursor`"""
+        subscriber = Subscriber(cursor, self.queue_size)
+        channel = self._join(simulation_id, subscriber)
+        try:
+            if subscriber.cursor < channel.cursor:
+                async for rows in self._backlog(subscriber, simulation_id, channel.cursor):
+                    for event in self._format(subscriber, rows):
+                        yield event
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    if subscriber.overflowed:
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+
+                if isinstance(item, dict):
+                    yield f"event: end\ndata: {json.dumps(item)}\n\n"
+                    break
+                for event in self._format(subscriber, item):
+                    yield event
+                if subscriber.overflowed and subscriber.queue.empty():
+                    break
+        finally:
+            self._leave(channel, subscriber)
+
+    @staticmethod
+    def _format(subscriber: Subscriber, rows: List[Dict]):
+        for row in rows:
+            if row["id"] <= subscriber.cursor:
+                continue
+            subscriber.cursor = row["id"]
+            yield f"id: {row['id']}\nevent: log\ndata: {json.dumps(row)}\n\n"
+
+
+hub = LogStreamHub(
+    poll_interval=float(os.getenv("LOG_STREAM_POLL_INTERVAL", "1.0")),
+    batch_size=int(os.getenv("LOG_STREAM_BATCH_SIZE", "500")),
+    queue_size=int(os.getenv("LOG_STREAM_QUEUE_SIZE", "64")),
+)
@@ -1,28 +1,72 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from contextlib import asynccontextmanager
 import uvicorn
-import json
+import math
+import os
+import uuid
 from datetime import datetime
 
-from database import get_db, engine
-from models import Base, User, Robot, Simulation, TrainingLog
+from database import get_db, engine, async_engine, upgrade_schema
+from models import Base, User, Robot, Simulation
 from schemas import (
     UserCreate, UserResponse, RobotCreate, RobotResponse, 
     SimulationCreate, SimulationResponse, TrainingLogResponse,
-    LoginRequest
+    LoginRequest, SimulationBatchCreate, SweepResponse, SweepStatusResponse,
+    MetricSeries, SimulationMetricsResponse, AnalyticsResponse,
+    ROBOT_ADAPTER, SIMULATION_ADAPTER, SWEEP_STATUS_ADAPTER
+)
+from auth import (
+    get_current_active_user, create_access_token, verify_password_async,
+    get_password_hash_async, ensure_hashing_capacity, auth_cache_stats, token_cache, user_cache
+)
+import instrumentation
+from hashing import password_executor
+from notifications import notifier
+from log_stream import hub as log_stream_hub
+import archived_logs
+from archived_logs import archive_cache
+from sweeps import expand_batch
+from etags import (
+    response_cache, bump_version, conditional_response, make_etag, version_statement, versioned_body, versioned_response
+)
+from analytics import analytics_cache, DEFAULT_FIELDS, DEFAULT_PERCENTILES, aggregate_results, valid_field
+from deletions import Deleter
+from metrics_store import DOWNSAMPLE_METHODS, MetricsStore, downsample, valid_name
+from async_routes import router as async_router
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_statement
+from projections import (
+    EXPORT_BATCH_SIZE, LOG_PROJECTION, NDJSON_MEDIA_TYPE, ROBOT_PROJECTION, SIMULATION_PROJECTION,
+    dumps, query_pages, stream_ndjson
+)
+from queries import (
+    ROBOT_PAGE_KEYS, SIMULATION_PAGE_KEYS, LOG_PAGE_KEYS,
+    robot_filters, simulation_filters, log_filters
 )
-from auth import get_current_user, create_access_token, verify_password, get_password_hash
 
 # Crear tablas
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Cerrar los pools al apagar: las conexiones de aiosqlite viven en hilos
+    # propios que, abiertos, impiden que el intérprete termine
+    await async_engine.dispose()
+    engine.dispose()
 
 app = FastAPI(
     title="Robot Training Platform API",
     description="API para plataforma SaaS de entrenamiento de robots",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -32,64 +76,128 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 security = HTTPBearer()
 
+# Métricas Prometheus en /metrics (PROMETHEUS_ENABLED=1)
+if instrumentation.ENABLED:
+    app.add_middleware(
+        instrumentation.RequestMetricsMiddleware,
+        histogram=instrumentation.histogram(
+            "http_request_duration_seconds", "Latencia de las peticiones HTTP", ["method", "route", "status"]
+        ),
+    )
+
+# Series de métricas que escribe el runner (volumen de datos compartido)
+metrics_store = MetricsStore(os.getenv("METRICS_DIR", "/app/data/metrics"))
+DEFAULT_METRIC_POINTS = 1000
+MAX_METRIC_POINTS = 10000
+
+# Borrados en bloque de robots y simulaciones
+deleter = Deleter(
+    engine,
+    metrics_store,
+    batch_size=int(os.getenv("DELETE_BATCH_SIZE", "5000")),
+    batch_pause=float(os.getenv("DELETE_BATCH_PAUSE", "0.05")),
+    job_ttl=float(os.getenv("DELETE_JOB_TTL", "3600")),
+)
+
+def _backend_samples():
+    caches = {
+        "auth_tokens": token_cache, "auth_users": user_cache, "analytics": analytics_cache,
+        "responses": response_cache, "log_archives": archive_cache,
+    }
+    for name, cache in caches.items():
+        yield from instrumentation.cache_samples(name, cache.stats())
+    hashing = password_executor.stats()
+    yield "gauge", "password_hashing_pending", "Hashes bcrypt en curso o en cola", {}, hashing["pending"]
+    yield "counter", "password_hashing_rejected", "Hashes rechazados por cola llena", {}, hashing["rejected"]
+    yield "gauge", "log_stream_channels", "Simulaciones con streaming de logs activo", {}, len(log_stream_hub.channels)
+    deletions = deleter.stats()
+    yield "gauge", "deletion_jobs_pending", "Borrados en segundo plano en cola", {}, deletions["pending"]
+    yield "gauge", "deletion_jobs_running", "Borrados en segundo plano en curso", {}, deletions["running"]
+    yield "counter", "deletion_jobs_failed", "Borrados en segundo plano fallidos", {}, deletions["failed"]
+
+instrumentation.register_callback(_backend_samples)
+
+# Variantes async (AsyncSession) bajo /async
+app.include_router(async_router)
+
 # Endpoints de autenticación
+# Son async: el hashing bcrypt corre en su propio executor acotado y las
+# consultas en el threadpool, para no bloquear el event loop ni acaparar hilos.
+# Las consultas terminan su transacción antes de hashear para no retener una
+# conexión del pool mientras la petición espera turno en el executor.
+def _find_password_hash(db: Session, email: str) -> Optional[str]:
+    row = db.query(User.password_hash).filter(User.email == email).first()
+    db.rollback()
+    return row[0] if row else None
+
+def _update_password_hash(db: Session, email: str, password_hash: str):
+    user = db.query(User).filter(User.email == email).first()
+    user.password_hash = password_hash
+    db.commit()
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
 @app.post("/auth/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """Registrar un nuevo usuario"""
+    ensure_hashing_capacity()
+    
     # Verificar si el usuario ya existe
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
+    if await run_in_threadpool(_find_password_hash, db, user.email) is not None:
         raise HTTPException(
             status_code=400,
             detail="Email ya registrado"
         )
     
     # Crear nuevo usuario con hash bcrypt
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
         password_hash=hashed_password
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
-    return db_user
+    return await run_in_threadpool(_save_user, db, db_user)
 
 @app.post("/auth/login")
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """Iniciar sesión de usuario"""
-    user = db.query(User).filter(User.email == credentials.email).first()
-    if not user:
+    ensure_hashing_capacity()
+    
+    password_hash = await run_in_threadpool(_find_password_hash, db, credentials.email)
+    if password_hash is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas"
         )
     
     # Verificar contraseña
-    if not verify_password(credentials.password, user.password_hash):
+    if not await verify_password_async(credentials.password, password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas"
         )
     
     # Si la contraseña está en texto plano, convertirla a hash bcrypt
-    if not user.password_hash.startswith('$2b$'):
-        user.password_hash = get_password_hash(credentials.password)
-        db.commit()
+    if not password_hash.startswith('$2b$'):
+        new_hash = await get_password_hash_async(credentials.password)
+        await run_in_threadpool(_update_password_hash, db, credentials.email, new_hash)
     
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(data={"sub": credentials.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
 # Endpoints de usuarios
 @app.get("/users/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: User = Depends(get_current_active_user)):
     """Obtener información del usuario actual"""
     return current_user
 
@@ -98,7 +206,7 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
 def create_robot(
     robot: RobotCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Crear un nuevo robot"""
     db_robot = Robot(
@@ -106,26 +214,50 @@ def create_robot(
         user_id=current_user.id
     )
     db.add(db_robot)
+    db.execute(bump_version(current_user.id))
     db.commit()
     db.refresh(db_robot)
     return db_robot
 
 @app.get("/robots/", response_model=List[RobotResponse])
 def get_robots(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    robot_status: Optional[str] = Query(None, alias="status"),
+    robot_type: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener lista de robots del usuario"""
-    robots = db.query(Robot).filter(Robot.user_id == current_user.id).all()
-    return robots
+    """
+    Obtener lista de robots del usuario, en orden de creación.
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    Admite If-None-Match (ETag por versión de datos del usuario).
+    """
+    etag = make_etag(request, current_user.id, db.scalar(version_statement(current_user.id)))
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    
+    # Camino ligero: solo las columnas del esquema, dicts y orjson (ver projections.py)
+    stmt = ROBOT_PROJECTION.select().where(*robot_filters(current_user.id, robot_status, robot_type))
+    rows = db.execute(keyset_statement(stmt, ROBOT_PAGE_KEYS, cursor, limit, descending=False)).all()
+    robots, next_cursor = ROBOT_PROJECTION.page(rows, limit)
+    return versioned_body(etag, dumps(robots), {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 @app.get("/robots/{robot_id}", response_model=RobotResponse)
 def get_robot(
     robot_id: int,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Obtener un robot específico"""
+    etag = make_etag(request, current_user.id, db.scalar(version_statement(current_user.id)))
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    
     robot = db.query(Robot).filter(
         Robot.id == robot_id,
         Robot.user_id == current_user.id
@@ -134,14 +266,14 @@ def get_robot(
     if not robot:
         raise HTTPException(status_code=404, detail="Robot no encontrado")
     
-    return robot
+    return versioned_response(etag, ROBOT_ADAPTER, robot)
 
 @app.put("/robots/{robot_id}", response_model=RobotResponse)
 def update_robot(
     robot_id: int,
     robot_update: RobotCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Actualizar un robot"""
     db_robot = db.query(Robot).filter(
@@ -156,6 +288,7 @@ def update_robot(
         setattr(db_robot, field, value)
     
     db_robot.updated_at = datetime.utcnow()
+    db.execute(bump_version(current_user.id))
     db.commit()
     db.refresh(db_robot)
     return db_robot
@@ -163,10 +296,16 @@ def update_robot(
 @app.delete("/robots/{robot_id}")
 def delete_robot(
     robot_id: int,
+    response: Response,
+    background: bool = False,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Eliminar un robot"""
+    """
+    Eliminar un robot con sus simulaciones, logs y ficheros mediante borrados
+    SQL por lotes (ver deletions.py). Con `background=true` responde 202 al
+    instante y el progreso se consulta en `GET /deletions/{job_id}`.
+    """
     robot = db.query(Robot).filter(
         Robot.id == robot_id,
         Robot.user_id == current_user.id
@@ -175,16 +314,26 @@ def delete_robot(
     if not robot:
         raise HTTPException(status_code=404, detail="Robot no encontrado")
     
-    db.delete(robot)
+    if background:
+        robot.status = "deleting"
+        db.execute(bump_version(current_user.id))
+        db.commit()
+        job = deleter.submit("robot", robot_id, current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"/deletions/{job.id}"
+        return {"message": "Borrado del robot en curso", "job": job.to_dict()}
+    
+    # Cerrar la transacción de lectura antes de que el borrado tome el lock de escritura
     db.commit()
-    return {"message": "Robot eliminado"}
+    deleted = deleter.delete("robot", robot_id, current_user.id)
+    return {"message": "Robot eliminado", "deleted": deleted}
 
 # Endpoints de simulaciones
 @app.post("/simulations/", response_model=SimulationResponse)
 def create_simulation(
     simulation: SimulationCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Crear una nueva simulación"""
     # Verificar que el robot pertenece al usuario
@@ -201,28 +350,144 @@ def create_simulation(
         user_id=current_user.id
     )
     db.add(db_simulation)
+    db.execute(bump_version(current_user.id))
     db.commit()
     db.refresh(db_simulation)
+    
+    # Despertar a los runners para que reclamen la simulación sin esperar al poll
+    notifier.notify("simulation_created", simulation_id=db_simulation.id)
     return db_simulation
 
+@app.post("/simulations/batch", response_model=SweepResponse)
+def create_simulations_batch(
+    batch: SimulationBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Crear muchas simulaciones de una vez: una lista explícita o un barrido
+    (grid/random) sobre `parameters`. La propiedad de los robots se valida con
+    una sola consulta y todas las filas se insertan en una transacción.
+    """
+    simulations = expand_batch(batch)
+    
+    robot_ids = {robot_id for _, robot_id, *_ in simulations}
+    owned = {row[0] for row in db.query(Robot.id).filter(
+        Robot.id.in_(robot_ids),
+        Robot.user_id == current_user.id
+    )}
+    if owned != robot_ids:
+        raise HTTPException(status_code=404, detail="Robot no encontrado")
+    
+    sweep_id = uuid.uuid4().hex
+    rows = [
+        {"name": name, "robot_id": robot_id, "parameters": parameters, "priority": priority,
+         "use_result_cache": use_result_cache, "user_id": current_user.id, "status": "pending",
+         "sweep_id": sweep_id}
+        for name, robot_id, parameters, priority, use_result_cache in simulations
+    ]
+    simulation_ids = list(db.scalars(
+        insert(Simulation).returning(Simulation.id, sort_by_parameter_order=True),
+        rows
+    ))
+    db.execute(bump_version(current_user.id))
+    db.commit()
+    
+    notifier.notify("simulation_created", sweep_id=sweep_id, count=len(simulation_ids))
+    return SweepResponse(sweep_id=sweep_id, created=len(simulation_ids), simulation_ids=simulation_ids)
+
+@app.get("/sweeps/{sweep_id}", response_model=SweepStatusResponse)
+def get_sweep(
+    sweep_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Estado agregado de un barrido: número de simulaciones por estado"""
+    etag = make_etag(request, current_user.id, db.scalar(version_statement(current_user.id)))
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    
+    counts = dict(db.query(Simulation.status, func.count()).filter(
+        Simulation.sweep_id == sweep_id,
+        Simulation.user_id == current_user.id
+    ).group_by(Simulation.status).all())
+    
+    if not counts:
+        raise HTTPException(status_code=404, detail="Barrido no encontrado")
+    
+    total = sum(counts.values())
+    finished = counts.get("completed", 0) + counts.get("failed", 0)
+    return versioned_response(etag, SWEEP_STATUS_ADAPTER, SweepStatusResponse(
+        sweep_id=sweep_id, total=total, status_counts=counts, finished=finished == total
+    ))
+
 @app.get("/simulations/", response_model=List[SimulationResponse])
 def get_simulations(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    simulation_status: Optional[str] = Query(None, alias="status"),
+    robot_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sweep_id: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener lista de simulaciones del usuario"""
-    simulations = db.query(Simulation).filter(
-        Simulation.user_id == current_user.id
-    ).all()
-    return simulations
+    """
+    Obtener lista de simulaciones del usuario, de la más reciente a la más antigua.
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    Admite If-None-Match (ETag por versión de datos del usuario).
+    """
+    etag = make_etag(request, current_user.id, db.scalar(version_statement(current_user.id)))
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    
+    stmt = SIMULATION_PROJECTION.select().where(*simulation_filters(
+        current_user.id, simulation_status, robot_id, created_after, created_before, sweep_id
+    ))
+    rows = db.execute(keyset_statement(stmt, SIMULATION_PAGE_KEYS, cursor, limit)).all()
+    simulations, next_cursor = SIMULATION_PROJECTION.page(rows, limit)
+    return versioned_body(etag, dumps(simulations), {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+@app.get("/simulations/export")
+def export_simulations(
+    simulation_status: Optional[str] = Query(None, alias="status"),
+    robot_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sweep_id: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Todas las simulaciones del usuario que cumplen los filtros, sin límite de
+    página, como NDJSON (una simulación por línea, de la más reciente a la
+    más antigua). Se leen por lotes y se envían a medida que se leen.
+    """
+    stmt = SIMULATION_PROJECTION.select().where(*simulation_filters(
+        current_user.id, simulation_status, robot_id, created_after, created_before, sweep_id
+    ))
+    return StreamingResponse(
+        stream_ndjson(query_pages(engine, SIMULATION_PROJECTION, stmt, SIMULATION_PAGE_KEYS)),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
 
 @app.get("/simulations/{simulation_id}", response_model=SimulationResponse)
 def get_simulation(
     simulation_id: int,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Obtener una simulación específica"""
+    etag = make_etag(request, current_user.id, db.scalar(version_statement(current_user.id)))
+    cached = conditional_response(request, etag)
+    if cached is not None:
+        return cached
+    
     simulation = db.query(Simulation).filter(
         Simulation.id == simulation_id,
         Simulation.user_id == current_user.id
@@ -231,15 +496,58 @@ def get_simulation(
     if not simulation:
         raise HTTPException(status_code=404, detail="Simulación no encontrada")
     
-    return simulation
+    return versioned_response(etag, SIMULATION_ADAPTER, simulation)
+
+@app.delete("/simulations/{simulation_id}")
+def delete_simulation(
+    simulation_id: int,
+    response: Response,
+    background: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Eliminar una simulación con sus logs y ficheros (ver delete_robot)"""
+    exists = db.query(Simulation.id).filter(
+        Simulation.id == simulation_id,
+        Simulation.user_id == current_user.id
+    ).first()
+    db.commit()
+    
+    if not exists:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    if background:
+        job = deleter.submit("simulation", simulation_id, current_user.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"/deletions/{job.id}"
+        return {"message": "Borrado de la simulación en curso", "job": job.to_dict()}
+    
+    deleted = deleter.delete("simulation", simulation_id, current_user.id)
+    return {"message": "Simulación eliminada", "deleted": deleted}
+
+@app.get("/deletions/{job_id}")
+def get_deletion(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Estado de un borrado en segundo plano"""
+    job = deleter.job(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Borrado no encontrado")
+    return job.to_dict()
 
 @app.put("/simulations/{simulation_id}/start")
 def start_simulation(
     simulation_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Iniciar una simulación"""
+    """
+    Adelantar una simulación pendiente a la cabeza de la cola del usuario.
+    Sigue en `pending`: solo un runner la pasa a `running`, al reclamarla con
+    un lease (ver claim_user_simulation), así nunca queda en `running` sin
+    nadie que la ejecute.
+    """
     simulation = db.query(Simulation).filter(
         Simulation.id == simulation_id,
         Simulation.user_id == current_user.id
@@ -251,19 +559,26 @@ def start_simulation(
     if simulation.status != "pending":
         raise HTTPException(status_code=400, detail="La simulación no está pendiente")
     
-    simulation.status = "running"
-    simulation.started_at = datetime.utcnow()
+    top_priority = db.query(func.max(Simulation.priority)).filter(
+        Simulation.user_id == current_user.id,
+        Simulation.status == "pending",
+        Simulation.id != simulation_id
+    ).scalar()
+    if top_priority is not None and top_priority >= (simulation.priority or 0):
+        simulation.priority = top_priority + 1
     simulation.updated_at = datetime.utcnow()
+    db.execute(bump_version(current_user.id))
     db.commit()
     
-    return {"message": "Simulación iniciada", "simulation_id": simulation_id}
+    notifier.notify("simulation_started", simulation_id=simulation_id)
+    return {"message": "Simulación encolada", "simulation_id": simulation_id, "priority": simulation.priority}
 
 @app.put("/simulations/{simulation_id}/complete")
 def complete_simulation(
     simulation_id: int,
     results: dict,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
     """Completar una simulación con resultados"""
     simulation = db.query(Simulation).filter(
@@ -275,9 +590,11 @@ def complete_simulation(
         raise HTTPException(status_code=404, detail="Simulación no encontrada")
     
     simulation.status = "completed"
-    simulation.results = json.dumps(results)
+    # Columna JSON: el dict se serializa una sola vez (json.dumps lo guardaría como string)
+    simulation.results = results
     simulation.completed_at = datetime.utcnow()
     simulation.updated_at = datetime.utcnow()
+    db.execute(bump_version(current_user.id))
     db.commit()
     
     return {"message": "Simulación completada", "simulation_id": simulation_id}
@@ -286,10 +603,18 @@ def complete_simulation(
 @app.get("/simulations/{simulation_id}/logs", response_model=List[TrainingLogResponse])
 def get_simulation_logs(
     simulation_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    level: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Obtener logs de una simulación"""
+    """
+    Obtener logs de una simulación, del más reciente al más antiguo.
+    El cursor de la página siguiente se devuelve en la cabecera X-Next-Cursor.
+    """
     # Verificar que la simulación pertenece al usuario
     simulation = db.query(Simulation).filter(
         Simulation.id == simulation_id,
@@ -299,17 +624,180 @@ def get_simulation_logs(
     if not simulation:
         raise HTTPException(status_code=404, detail="Simulación no encontrada")
     
-    logs = db.query(TrainingLog).filter(
-        TrainingLog.simulation_id == simulation_id
-    ).order_by(TrainingLog.timestamp.desc()).all()
+    if simulation.logs_archive_path:
+        # Logs compactados por el runner: se sirven desde el archivo
+        rows, next_cursor = archived_logs.load(simulation.logs_archive_path).page(cursor, limit, level, since, until)
+        logs = [LOG_PROJECTION.from_mapping(row) for row in rows]
+    else:
+        stmt = LOG_PROJECTION.select().where(*log_filters(simulation_id, level, since, until))
+        logs, next_cursor = LOG_PROJECTION.page(db.execute(keyset_statement(stmt, LOG_PAGE_KEYS, cursor, limit)).all(), limit)
+    return Response(
+        content=dumps(logs),
+        media_type="application/json",
+        headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None,
+    )
+
+@app.get("/simulations/{simulation_id}/logs/export")
+def export_simulation_logs(
+    simulation_id: int,
+    level: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Todos los logs de una simulación que cumplen los filtros como NDJSON
+    (uno por línea, del más reciente al más antiguo), desde la base o desde
+    su archivo, leídos por lotes.
+    """
+    simulation = db.query(Simulation).filter(
+        Simulation.id == simulation_id,
+        Simulation.user_id == current_user.id
+    ).first()
+    
+    if not simulation:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
     
-    return logs
+    if simulation.logs_archive_path:
+        archived = archived_logs.load(simulation.logs_archive_path)
+        
+        def fetch(cursor):
+            rows, next_cursor = archived.page(cursor, EXPORT_BATCH_SIZE, level, since, until)
+            return [LOG_PROJECTION.from_mapping(row) for row in rows], next_cursor
+    else:
+        stmt = LOG_PROJECTION.select().where(*log_filters(simulation_id, level, since, until))
+        fetch = query_pages(engine, LOG_PROJECTION, stmt, LOG_PAGE_KEYS)
+    
+    # Liberar la conexión: cada lote usa la suya
+    db.close()
+    
+    return StreamingResponse(stream_ndjson(fetch), media_type=NDJSON_MEDIA_TYPE)
+
+@app.get("/simulations/{simulation_id}/logs/stream")
+def stream_simulation_logs(
+    simulation_id: int,
+    request: Request,
+    cursor: int = 0,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream (Server-Sent Events) de logs nuevos de una simulación a partir de
+    `cursor` (id del último log recibido, o cabecera `Last-Event-ID`).
+    """
+    simulation = db.query(Simulation).filter(
+        Simulation.id == simulation_id,
+        Simulation.user_id == current_user.id
+    ).first()
+    
+    if not simulation:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        cursor = max(cursor, int(last_event_id))
+    
+    # Liberar la conexión: la sesión seguiría abierta mientras dure el stream
+    db.close()
+    
+    return StreamingResponse(
+        log_stream_hub.stream(simulation_id, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/simulations/{simulation_id}/metrics", response_model=SimulationMetricsResponse)
+def get_simulation_metrics(
+    simulation_id: int,
+    names: Optional[List[str]] = Query(None),
+    start_step: Optional[int] = None,
+    end_step: Optional[int] = None,
+    max_points: int = Query(DEFAULT_METRIC_POINTS, ge=3, le=MAX_METRIC_POINTS),
+    method: str = Query("lttb", pattern=f"^({'|'.join(DOWNSAMPLE_METHODS)})$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Series de métricas de una simulación (todas o las de `names`), en el
+    rango de steps pedido y reducidas a `max_points` puntos por serie con
+    LTTB (forma de la curva) o min/max por buckets (conserva los picos).
+    """
+    simulation = db.query(Simulation).filter(
+        Simulation.id == simulation_id,
+        Simulation.user_id == current_user.id
+    ).first()
+    
+    if not simulation:
+        raise HTTPException(status_code=404, detail="Simulación no encontrada")
+    
+    if names and not all(valid_name(name) for name in names):
+        raise HTTPException(status_code=400, detail="Nombre de métrica inválido")
+    
+    series = []
+    for name in names or metrics_store.names(simulation_id):
+        steps, values = metrics_store.read(simulation_id, name, start_step, end_step)
+        total_points = len(steps)
+        steps, values = downsample(steps, values, max_points, method)
+        series.append(MetricSeries(
+            name=name,
+            total_points=total_points,
+            steps=steps.tolist(),
+            # JSON no admite NaN/inf
+            values=[value if math.isfinite(value) else None for value in values.tolist()],
+        ))
+    
+    return SimulationMetricsResponse(simulation_id=simulation_id, method=method, series=series)
+
+# Endpoint de agregados de resultados
+@app.get("/analytics/results", response_model=AnalyticsResponse)
+def get_results_analytics(
+    fields: Optional[List[str]] = Query(None),
+    group_by: str = "robot",
+    percentiles: Optional[List[int]] = Query(None),
+    best: str = Query("max", pattern="^(max|min)$"),
+    robot_id: Optional[int] = None,
+    sweep_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Media, mínimo, máximo, percentiles y mejor valor de campos de `results`
+    (`accuracy`, `metrics.f1_score`, ...) sobre las simulaciones completadas
+    del usuario, agrupados por robot, barrido o valor de un parámetro
+    (`group_by=robot|sweep|param:<nombre>`). `best=min` para campos como `loss`.
+    """
+    fields = fields or DEFAULT_FIELDS
+    percentiles = sorted(set(percentiles or DEFAULT_PERCENTILES))
+    if not all(valid_field(field) for field in fields):
+        raise HTTPException(status_code=400, detail="Campo de resultados inválido")
+    if not all(1 <= p <= 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="Los percentiles deben estar entre 1 y 100")
+    try:
+        return aggregate_results(
+            db, current_user.id, fields, group_by, percentiles, best, robot_id, sweep_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # Endpoint de health check
 @app.get("/health")
 def health_check():
     """Verificar estado del servicio"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "auth_cache": auth_cache_stats(),
+        "password_hashing": password_executor.stats()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métricas en formato de exposición de Prometheus"""
+    if not instrumentation.ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas desactivadas (PROMETHEUS_ENABLED)")
+    body, content_type = instrumentation.render()
+    return Response(content=body, headers={"Content-Type": content_type})
 
 # Endpoint raíz
 @app.get("/")
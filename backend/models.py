@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, true, false
 from database import Base
 
 class User(Base):
@@ -14,6 +14,9 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Se incrementa con cada cambio de sus robots o simulaciones (ver etags.py)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Relaciones
     robots = relationship("Robot", back_populates="user", cascade="all, delete-orphan")
     simulations = relationship("Simulation", back_populates="user", cascade="all, delete-orphan")
@@ -51,11 +54,67 @@ class Simulation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Lease del runner que está ejecutando la simulación
+    worker_id = Column(String(100))
+    lease_expires_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+
+    # Barrido de parámetros al que pertenece (creación en lote)
+    sweep_id = Column(String(36))
+
+    # Mayor primero; ordena la cola de cada usuario (ver scheduler del runner)
+    priority = Column(Integer, default=0, server_default="0")
+
+    # Último checkpoint del motor (ver checkpoints.py del runner) e intentos de ejecución
+    checkpoint_path = Column(String(255))
+    checkpointed_at = Column(DateTime(timezone=True))
+    attempts = Column(Integer, default=0, server_default="0")
+
+    # Logs movidos a un archivo comprimido (ver log_retention.py del runner)
+    logs_archive_path = Column(String(255))
+    logs_archived_at = Column(DateTime(timezone=True))
+
+    # Memoización de resultados (ver result_cache.py del runner): opt-out por
+    # simulación y si los resultados se tomaron de la cache
+    use_result_cache = Column(Boolean, default=True, server_default=true(), nullable=False)
+    result_cache_hit = Column(Boolean, default=False, server_default=false(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_simulations_status_created_at", "status", "created_at"),
+        Index("idx_simulations_status_lease", "status", "lease_expires_at"),
+        Index("idx_simulations_user_status_created_at", "user_id", "status", "created_at"),
+        Index("idx_simulations_user_created_at", "user_id", "created_at"),
+        Index("idx_simulations_sweep_status", "sweep_id", "status"),
+    )
+
     # Relaciones
     robot = relationship("Robot", back_populates="simulations")
     user = relationship("User", back_populates="simulations")
     training_logs = relationship("TrainingLog", back_populates="simulation", cascade="all, delete-orphan")
 
+# Cola del scheduler: siguiente usuario con trabajo pendiente y la cabeza de su
+# cola (prioridad descendente, más antigua primero) en un lookup de índice
+Index(
+    "idx_simulations_queue",
+    Simulation.status, Simulation.user_id, Simulation.priority.desc(), Simulation.created_at, Simulation.id,
+)
+
+class SimulationResultCache(Base):
+    """Resultados de simulaciones reproducibles por hash de sus entradas (lo escribe el runner)"""
+    __tablename__ = "simulation_result_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 hex
+    engine = Column(String(50), nullable=False)
+    results = Column(JSON, nullable=False)
+    simulation_id = Column(Integer)  # simulación que calculó los resultados
+    hits = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_simulation_result_cache_last_used_at", "last_used_at"),
+    )
+
 class TrainingLog(Base):
     __tablename__ = "training_logs"
 
@@ -67,6 +126,11 @@ class TrainingLog(Base):
     message = Column(Text, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("idx_training_logs_simulation_timestamp", "simulation_id", "timestamp"),
+        Index("idx_training_logs_level_timestamp", "log_level", "timestamp"),
+    )
+
     # Relaciones
     simulation = relationship("Simulation", back_populates="training_logs")
     robot = relationship("Robot", back_populates="training_logs")
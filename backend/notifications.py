@@ -0,0 +1,90 @@
+"""
+Notificaciones de wake-up hacia los simulation runners.
+Cuando se crea o inicia una simulación el backend avisa a los runners para que
+reclamen trabajo de inmediato en lugar de esperar al siguiente poll.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier:
+    """Interfaz de un broker de notificaciones"""
+
+    def notify(self, event: str, **payload):
+        raise NotImplementedError
+
+
+class NullNotifier(Notifier):
+    """No envía nada; los runners dependen solo del polling"""
+
+    def notify(self, event: str, **payload):
+        pass
+
+
+class InMemoryNotifier(Notifier):
+    """Broker en proceso, útil para tests, benchmarks o despliegues de un solo proceso"""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def notify(self, event: str, **payload):
+        message = {"event": event, **payload}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.warning(f"Error entregando notificación {event}: {e}")
+
+
+class UDPNotifier(Notifier):
+    """
+    Envía un datagrama JSON a cada dirección `host:port` configurada. Si el
+    host resuelve a varias IPs (varias réplicas del runner en docker-compose),
+    se avisa a todas. Es fire-and-forget: un datagrama perdido solo retrasa el
+    trabajo hasta el siguiente poll del runner.
+    """
+
+    def __init__(self, addresses: List[str]):
+        self.addresses = []
+        for address in addresses:
+            host, _, port = address.strip().rpartition(":")
+            self.addresses.append((host, int(port)))
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def notify(self, event: str, **payload):
+        data = json.dumps({"event": event, **payload}).encode()
+        for host, port in self.addresses:
+            try:
+                targets = {info[4] for info in socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)}
+                for target in targets:
+                    self._socket.sendto(data, target)
+            except OSError as e:
+                logger.debug(f"No se pudo notificar a {host}:{port}: {e}")
+
+
+def create_notifier(backend: Optional[str] = None) -> Notifier:
+    """Construir el notifier según `NOTIFY_BACKEND` (udp, memory, none)"""
+    backend = backend or os.getenv("NOTIFY_BACKEND", "udp")
+    if backend == "udp":
+        addresses = [a for a in os.getenv("RUNNER_NOTIFY_ADDRS", "").split(",") if a.strip()]
+        return UDPNotifier(addresses) if addresses else NullNotifier()
+    if backend == "memory":
+        return InMemoryNotifier()
+    return NullNotifier()
+
+
+notifier = create_notifier()
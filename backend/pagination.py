@@ -0,0 +1,64 @@
+"""
+Paginación por cursor (keyset) para los endpoints de listado.
+El cursor es opaco para el cliente: codifica los valores de las columnas de
+orden de la última fila entregada, y la página siguiente se obtiene con una
+comparación de tuplas que aprovecha los índices compuestos.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import String, tuple_, type_coerce
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def raw_column(column):
+    """
+    Columna de fecha tratada como texto: el cursor guarda el valor tal como
+    está almacenado, así la comparación no depende del formato del bind.
+    """
+    return type_coerce(column, String)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps(list(values), default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return values
+
+
+def keyset_statement(
+    query,
+    keys: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+):
+    """
+    Aplicar orden, cursor y límite a un select() (p. ej. de una proyección).
+    Pide una fila extra para saber si existe una página siguiente.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        bound = tuple_(*keys)
+        query = query.filter(bound < tuple(values) if descending else bound > tuple(values))
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    # Etiquetas propias: select() deduplica columnas con el mismo nombre que la entidad
+    cursor_columns = [key.label(f"cursor_{i}") for i, key in enumerate(keys)]
+    return query.add_columns(*cursor_columns).order_by(*order).limit(limit + 1)
+
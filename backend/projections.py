@@ -0,0 +1,135 @@
+"""
+Camino de lectura ligero para los listados.
+Hidratar entidades del ORM, validarlas con los esquemas Pydantic
+(`from_attributes`) y serializarlas domina el costo de CPU de una página
+grande. Aquí la consulta pide solo las columnas del esquema de respuesta con
+SQLAlchemy Core, cada fila se convierte directamente en un dict con las
+claves en el orden del esquema y el cuerpo se serializa con orjson.
+
+Las columnas JSON (configuration, parameters, results) se leen como texto y
+se incrustan tal cual con `orjson.Fragment`, sin decodificarlas y volver a
+codificarlas. El JSON resultante es equivalente al de Pydantic: mismos
+campos, mismo orden y mismas fechas ISO 8601 (UTC como `Z`).
+
+Para resultados muy grandes, `stream_ndjson` recorre la consulta por páginas
+keyset en conexiones cortas y emite una fila JSON por línea (NDJSON) sin
+acumular el resultado en memoria.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import JSON, String, select, type_coerce
+from sqlalchemy.engine import Engine
+
+from models import Robot, Simulation, TrainingLog
+from pagination import encode_cursor, keyset_statement
+from schemas import RobotResponse, SimulationResponse, TrainingLogResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EXPORT_BATCH_SIZE = 1000
+
+_OPTIONS = orjson.OPT_UTC_Z
+
+# cursor -> (filas de la página, cursor de la siguiente o None)
+PageFetcher = Callable[[Optional[str]], Tuple[List[Dict[str, Any]], Optional[str]]]
+
+
+def _raw_json(value: Any) -> Any:
+    """Valor de una columna JSON leída como texto, listo para orjson"""
+    if not isinstance(value, str):
+        # psycopg2 ya entrega las columnas JSON decodificadas
+        return value
+    if "NaN" in value or "Infinity" in value:
+        # json.dumps escribe NaN/Infinity, que no son JSON válido; orjson
+        # serializa los floats no finitos como null, igual que Pydantic
+        return json.loads(value)
+    return orjson.Fragment(value)
+
+
+class Projection:
+    """Columnas de `model` que expone `schema`, y conversión de filas a dicts"""
+
+    def __init__(self, model, schema: Type[BaseModel]):
+        self.names = list(schema.model_fields)
+        self.columns = []
+        self.json_indexes = []
+        for index, name in enumerate(self.names):
+            column = getattr(model, name)
+            if isinstance(column.type, JSON):
+                self.json_indexes.append(index)
+                column = type_coerce(column, String).label(name)
+            self.columns.append(column)
+        self.width = len(self.names)
+
+    def select(self):
+        return select(*self.columns)
+
+    def item(self, row: Sequence[Any]) -> Dict[str, Any]:
+        values = list(row[:self.width])
+        for index in self.json_indexes:
+            if values[index] is not None:
+                values[index] = _raw_json(values[index])
+        return dict(zip(self.names, values))
+
+    def page(self, rows: Sequence[Sequence[Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Filas de `keyset_statement` a dicts y cursor de la página siguiente"""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][self.width:])
+        return [self.item(row) for row in rows], next_cursor
+
+    def from_mapping(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Dict ya construido (p. ej. un log archivado) recortado a los campos del esquema"""
+        return {name: row.get(name) for name in self.names}
+
+
+ROBOT_PROJECTION = Projection(Robot, RobotResponse)
+SIMULATION_PROJECTION = Projection(Simulation, SimulationResponse)
+LOG_PROJECTION = Projection(TrainingLog, TrainingLogResponse)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=_OPTIONS)
+
+
+def ndjson_lines(items: Iterable[Dict[str, Any]]) -> bytes:
+    return b"".join(orjson.dumps(item, option=_OPTIONS | orjson.OPT_APPEND_NEWLINE) for item in items)
+
+
+def query_pages(
+    engine: Engine,
+    projection: Projection,
+    stmt,
+    keys: Sequence,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    descending: bool = True,
+) -> PageFetcher:
+    """
+    Páginas keyset de `batch_size` filas de `stmt` (un select de la
+    proyección), cada una en su propia conexión: un export largo no retiene
+    una conexión del pool ni una transacción de lectura abierta.
+    """
+    def fetch(cursor: Optional[str]):
+        with engine.connect() as conn:
+            rows = conn.execute(keyset_statement(stmt, keys, cursor, batch_size, descending)).all()
+        return projection.page(rows, batch_size)
+
+    return fetch
+
+
+def stream_ndjson(fetch: PageFetcher) -> Iterator[bytes]:
+    """
+    NDJSON a partir de una función de páginas, un bloque por página. Es un iterador síncrono:
+    StreamingResponse lo consume desde el threadpool.
+    """
+    cursor = None
+    while True:
+        items, cursor = fetch(cursor)
+        if items:
+            yield ndjson_lines(items)
+        if cursor is None:
+            return
@@ -0,0 +1,65 @@
+"""
+Filtros y claves de orden de los listados, compartidos por los endpoints
+síncronos (main.py) y async (async_routes.py).
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from models import Robot, Simulation, TrainingLog
+from pagination import raw_column
+
+ROBOT_PAGE_KEYS = [Robot.id]
+SIMULATION_PAGE_KEYS = [raw_column(Simulation.created_at), Simulation.id]
+LOG_PAGE_KEYS = [raw_column(TrainingLog.timestamp), TrainingLog.id]
+
+
+def robot_filters(
+    user_id: int,
+    status: Optional[str] = None,
+    robot_type: Optional[str] = None,
+) -> List:
+    conditions = [Robot.user_id == user_id]
+    if status:
+        conditions.append(Robot.status == status)
+    if robot_type:
+        conditions.append(Robot.robot_type == robot_type)
+    return conditions
+
+
+def simulation_filters(
+    user_id: int,
+    status: Optional[str] = None,
+    robot_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sweep_id: Optional[str] = None,
+) -> List:
+    conditions = [Simulation.user_id == user_id]
+    if status:
+        conditions.append(Simulation.status == status)
+    if robot_id is not None:
+        conditions.append(Simulation.robot_id == robot_id)
+    if created_after:
+        conditions.append(Simulation.created_at >= created_after)
+    if created_before:
+        conditions.append(Simulation.created_at < created_before)
+    if sweep_id:
+        conditions.append(Simulation.sweep_id == sweep_id)
+    return conditions
+
+
+def log_filters(
+    simulation_id: int,
+    level: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List:
+    conditions = [TrainingLog.simulation_id == simulation_id]
+    if level:
+        conditions.append(TrainingLog.log_level == level.upper())
+    if since:
+        conditions.append(TrainingLog.timestamp >= since)
+    if until:
+        conditions.append(TrainingLog.timestamp < until)
+    return conditions
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, TypeAdapter
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 # Schemas de Usuario
@@ -43,6 +43,9 @@ class SimulationBase(BaseModel):
     name: str
     robot_id: int
     parameters: Optional[Dict[str, Any]] = None
+    priority: int = 0
+    # False fuerza a calcular aunque haya resultados memoizados para las mismas entradas
+    use_result_cache: bool = True
 
 class SimulationCreate(SimulationBase):
     pass
@@ -51,7 +54,12 @@ class SimulationResponse(SimulationBase):
     id: int
     user_id: int
     status: str
+    sweep_id: Optional[str] = None
     results: Optional[Dict[str, Any]] = None
+    attempts: Optional[int] = 0
+    result_cache_hit: bool = False
+    checkpointed_at: Optional[datetime] = None
+    logs_archived_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     created_at: datetime
@@ -60,6 +68,69 @@ class SimulationResponse(SimulationBase):
     class Config:
         from_attributes = True
 
+# Schemas de creación en lote y barridos de parámetros
+class RandomSweep(BaseModel):
+    # Por parámetro: lista de valores o {"min", "max", "log"?, "type"?: "int"}
+    space: Dict[str, Any]
+    count: int
+    seed: Optional[int] = None
+
+class SimulationBatchCreate(BaseModel):
+    # Lista explícita de simulaciones...
+    simulations: Optional[List[SimulationCreate]] = None
+    # ...o un barrido sobre `parameters` para un robot
+    robot_id: Optional[int] = None
+    name: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    priority: int = 0
+    use_result_cache: bool = True
+    grid: Optional[Dict[str, List[Any]]] = None
+    random: Optional[RandomSweep] = None
+
+class SweepResponse(BaseModel):
+    sweep_id: str
+    created: int
+    simulation_ids: List[int]
+
+class SweepStatusResponse(BaseModel):
+    sweep_id: str
+    total: int
+    status_counts: Dict[str, int]
+    finished: bool
+
+# Schemas de métricas de entrenamiento
+class MetricSeries(BaseModel):
+    name: str
+    total_points: int  # puntos en el rango pedido, antes de reducir
+    steps: List[int]
+    values: List[Optional[float]]
+
+class SimulationMetricsResponse(BaseModel):
+    simulation_id: int
+    method: str
+    series: List[MetricSeries]
+
+# Schemas de agregados de resultados
+class FieldStats(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+    best: Optional[float] = None
+    best_simulation_id: Optional[int] = None
+
+class AnalyticsGroup(BaseModel):
+    key: Optional[str] = None  # robot_id, sweep_id o valor del parámetro
+    fields: Dict[str, FieldStats]
+
+class AnalyticsResponse(BaseModel):
+    group_by: str
+    fields: List[str]
+    percentiles: List[int]
+    best: str
+    groups: List[AnalyticsGroup]
+
 # Schemas de Log de Entrenamiento
 class TrainingLogBase(BaseModel):
     log_level: str = "INFO"
@@ -105,3 +176,8 @@ class HealthResponse(BaseModel):
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+
+# Serializadores de las respuestas con ETag (ver etags.py)
+ROBOT_ADAPTER = TypeAdapter(RobotResponse)
+SIMULATION_ADAPTER = TypeAdapter(SimulationResponse)
+SWEEP_STATUS_ADAPTER = TypeAdapter(SweepStatusResponse)
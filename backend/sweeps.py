@@ -0,0 +1,91 @@
+"""
+Expansión de peticiones de creación en lote: una lista explícita de
+simulaciones, un grid (producto cartesiano) o un muestreo aleatorio sobre
+`parameters`. El resultado se inserta en una sola transacción con un
+`sweep_id` común para consultar el estado agregado.
+"""
+
+import itertools
+import math
+import os
+import random
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException
+
+from schemas import RandomSweep, SimulationBatchCreate
+
+SWEEP_MAX_SIMULATIONS = int(os.getenv("SWEEP_MAX_SIMULATIONS", "10000"))
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=detail)
+
+
+def _check_size(count: int):
+    if count < 1:
+        raise _bad_request("El lote no genera ninguna simulación")
+    if count > SWEEP_MAX_SIMULATIONS:
+        raise _bad_request(f"El lote supera el máximo de {SWEEP_MAX_SIMULATIONS} simulaciones")
+
+
+def expand_grid(base: Dict[str, Any], grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Una combinación de parámetros por cada elemento del producto cartesiano"""
+    _check_size(math.prod(len(values) for values in grid.values()))
+    names = list(grid)
+    return [{**base, **dict(zip(names, combo))} for combo in itertools.product(*grid.values())]
+
+
+def _sample(rng: random.Random, name: str, spec: Any) -> Any:
+    if isinstance(spec, list):
+        if not spec:
+            raise _bad_request(f"Parámetro '{name}' sin valores")
+        return rng.choice(spec)
+    if isinstance(spec, dict) and "min" in spec and "max" in spec:
+        low, high = spec["min"], spec["max"]
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in (low, high)):
+            raise _bad_request(f"Parámetro '{name}': min y max deben ser números")
+        if low > high:
+            raise _bad_request(f"Parámetro '{name}': min debe ser menor o igual que max")
+        if spec.get("type") == "int":
+            return rng.randint(int(low), int(high))
+        if spec.get("log"):
+            if low <= 0 or high <= 0:
+                raise _bad_request(f"Parámetro '{name}': la escala logarítmica requiere min y max > 0")
+            return math.exp(rng.uniform(math.log(low), math.log(high)))
+        return rng.uniform(low, high)
+    raise _bad_request(f"Parámetro '{name}': se espera una lista de valores o {{min, max}}")
+
+
+def sample_random(base: Dict[str, Any], sweep: RandomSweep) -> List[Dict[str, Any]]:
+    """`count` combinaciones muestreadas del espacio (reproducibles con `seed`)"""
+    _check_size(sweep.count)
+    rng = random.Random(sweep.seed)
+    return [
+        {**base, **{name: _sample(rng, name, spec) for name, spec in sweep.space.items()}}
+        for _ in range(sweep.count)
+    ]
+
+
+def expand_batch(batch: SimulationBatchCreate) -> List[Tuple[str, int, Dict[str, Any], int, bool]]:
+    """Traducir la petición a una lista de (name, robot_id, parameters, priority, use_result_cache)"""
+    modes = [mode for mode in (batch.simulations, batch.grid, batch.random) if mode is not None]
+    if len(modes) != 1:
+        raise _bad_request("Indicar exactamente uno de: simulations, grid, random")
+
+    if batch.simulations is not None:
+        _check_size(len(batch.simulations))
+        return [(s.name, s.robot_id, s.parameters, s.priority, s.use_result_cache) for s in batch.simulations]
+
+    if batch.robot_id is None or not batch.name:
+        raise _bad_request("Los barridos requieren robot_id y name")
+    base = batch.parameters or {}
+    if batch.grid is not None:
+        combos = expand_grid(base, batch.grid)
+    else:
+        combos = sample_random(base, batch.random)
+    width = len(str(len(combos)))
+    return [
+        (f"{batch.name} #{i + 1:0{width}d}", batch.robot_id, parameters, batch.priority, batch.use_result_cache)
+        for i, parameters in enumerate(combos)
+    ]
@@ -0,0 +1,124 @@
+"""
+Benchmark de comparación de resultados: descargar todas las simulaciones
+completadas (GET /simulations/ paginado) y agregar `results` en el cliente,
+frente a GET /analytics/results (JSON y funciones de ventana en la base),
+sin cache y con la cache de respuestas.
+
+    python benchmarks/bench_analytics.py --simulations 20000 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import httpx
+
+import common
+
+FIELDS = ["accuracy", "loss", "metrics.f1_score"]
+
+
+def seed(client, headers, url: str, simulations: int, robots: int):
+    robot_ids = [
+        client.post("/robots/", json={"name": f"bench #{i}", "robot_type": "mobile_robot"}, headers=headers).json()["id"]
+        for i in range(robots)
+    ]
+    per_robot = simulations // robots
+    for robot_id in robot_ids:
+        client.post("/simulations/batch", headers=headers, json={
+            "robot_id": robot_id, "name": "sweep", "grid": {"lr": [0.001 * (i + 1) for i in range(per_robot)]},
+        }).raise_for_status()
+
+    rng = random.Random(1)
+    ids = [row[0] for row in common.execute_sql(url, "SELECT id FROM simulations")]
+    updates = []
+    for simulation_id in ids:
+        accuracy = rng.uniform(0.7, 0.99)
+        updates.append({"id": simulation_id, "results": (
+            f'{{"accuracy": {accuracy}, "loss": {1 - accuracy}, "metrics": {{"f1_score": {accuracy * 0.95}}}}}'
+        )})
+    common.execute_sql(url, "UPDATE simulations SET status = 'completed', results = :results WHERE id = :id", updates)
+    return len(ids)
+
+
+def nearest_rank(values, p):
+    return values[max(0, -(-len(values) * p // 100) - 1)]
+
+
+def client_side(client, headers):
+    """Lo que hace hoy un cliente: bajar todas las páginas y agregar en Python"""
+    by_robot = {}
+    cursor = None
+    while True:
+        params = {"status": "completed", "limit": 500}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/simulations/", params=params, headers=headers)
+        for simulation in response.json():
+            results = simulation["results"]
+            values = by_robot.setdefault(simulation["robot_id"], {field: [] for field in FIELDS})
+            values["accuracy"].append(results["accuracy"])
+            values["loss"].append(results["loss"])
+            values["metrics.f1_score"].append(results["metrics"]["f1_score"])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    return {
+        robot_id: {
+            field: {"mean": statistics.fmean(v), "p50": nearest_rank(sorted(v), 50), "p90": nearest_rank(sorted(v), 90), "best": max(v)}
+            for field, v in values.items()
+        }
+        for robot_id, values in by_robot.items()
+    }
+
+
+def in_database(client, headers):
+    response = client.get("/analytics/results", params={"fields": FIELDS, "group_by": "robot", "percentiles": [50, 90]}, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def measure(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--simulations", type=int, default=20000)
+    parser.add_argument("--robots", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = common.create_database()
+    url = f"sqlite:///{db_path}"
+    results = []
+    for mode, env in (("no_cache", {"ANALYTICS_CACHE_TTL": "0"}), ("cached", {})):
+        with common.BackendServer(db_path, env={"BCRYPT_ROUNDS": "4", **env}) as server:
+            with httpx.Client(base_url=server.url, timeout=300) as client:
+                headers = common.register_and_login(client)
+                if not results:
+                    seeded = seed(client, headers, url, args.simulations, args.robots)
+                    results.append({
+                        "mode": "client_side",
+                        "simulations": seeded,
+                        "ms": round(measure(lambda: client_side(client, headers), args.repeat) * 1000, 1),
+                    })
+                results.append({
+                    "mode": f"analytics_{mode}",
+                    "simulations": seeded,
+                    "ms": round(measure(lambda: in_database(client, headers), args.repeat) * 1000, 1),
+                })
+    baseline = results[0]["ms"]
+    for r in results:
+        r["speedup"] = round(baseline / r["ms"], 1)
+    common.report("results_analytics", results)
+
+
+if __name__ == "__main__":
+    main()
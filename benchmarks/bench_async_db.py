@@ -0,0 +1,87 @@
+"""
+Benchmark de los endpoints síncronos frente a sus variantes async (/async).
+Con N clientes concurrentes pidiendo páginas de GET /simulations/ mide
+peticiones/segundo y latencias p50/p99 de cada variante.
+
+    python benchmarks/bench_async_db.py --clients 64 --seconds 10
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+
+import httpx
+
+import common
+
+
+def client_loop(url, path, headers, limit, stop, latencies, errors):
+    with httpx.Client(base_url=url, headers=headers, timeout=60) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = client.get(path, params={"limit": limit})
+            except httpx.HTTPError as e:
+                errors.append(type(e).__name__)
+                continue
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+            latencies.append(time.perf_counter() - started)
+
+
+def phase(url, path, headers, clients, limit, seconds):
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=client_loop, args=(url, path, headers, limit, stop, latencies, errors))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "path": path,
+        "requests_per_second": round(len(latencies) / seconds, 1),
+        "latency_seconds": common.percentiles(latencies),
+        "errors": len(errors),
+    }
+
+
+def seed(db_path, email, robot_id, count):
+    conn = sqlite3.connect(db_path)
+    user_id = conn.execute("SELECT id FROM users WHERE email = ?", (email,)).fetchone()[0]
+    conn.close()
+    common.insert_pending_simulations(db_path, count, user_id=user_id, robot_id=robot_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--simulations", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--pool-size", default="5")
+    parser.add_argument("--max-overflow", default="10")
+    args = parser.parse_args()
+
+    env = {"DB_POOL_SIZE": args.pool_size, "DB_MAX_OVERFLOW": args.max_overflow, "BCRYPT_ROUNDS": "4"}
+    with common.BackendServer(env=env) as server:
+        with httpx.Client(base_url=server.url, timeout=60) as client:
+            headers = common.register_and_login(client)
+            robot = client.post("/robots/", json={"name": "bench", "robot_type": "mobile_robot"}, headers=headers).json()
+        seed(server.db_path, "bench@example.com", robot["id"], args.simulations)
+
+        results = [
+            phase(server.url, path, headers, args.clients, args.limit, args.seconds)
+            for path in ("/simulations/", "/async/simulations/")
+        ]
+    common.report("async_db", {"settings": vars(args), "phases": results})
+
+
+if __name__ == "__main__":
+    main()
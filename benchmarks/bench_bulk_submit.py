@@ -0,0 +1,68 @@
+"""
+Benchmark de envío de un barrido de N simulaciones: N peticiones a
+POST /simulations/ (una consulta de propiedad y un commit por fila) frente a
+una sola petición a POST /simulations/batch con la lista o con un grid.
+
+    python benchmarks/bench_bulk_submit.py --simulations 1000
+"""
+
+import argparse
+import time
+
+import httpx
+
+import common
+
+
+def one_by_one(client, headers, robot_id, count):
+    started = time.perf_counter()
+    for i in range(count):
+        client.post("/simulations/", headers=headers, json={
+            "name": f"single #{i}", "robot_id": robot_id, "parameters": {"lr": 0.001 * (i + 1)},
+        }).raise_for_status()
+    return time.perf_counter() - started
+
+
+def batch_list(client, headers, robot_id, count):
+    started = time.perf_counter()
+    client.post("/simulations/batch", headers=headers, json={"simulations": [
+        {"name": f"batch #{i}", "robot_id": robot_id, "parameters": {"lr": 0.001 * (i + 1)}}
+        for i in range(count)
+    ]}).raise_for_status()
+    return time.perf_counter() - started
+
+
+def batch_grid(client, headers, robot_id, count):
+    started = time.perf_counter()
+    client.post("/simulations/batch", headers=headers, json={
+        "robot_id": robot_id, "name": "grid", "grid": {"lr": [0.001 * (i + 1) for i in range(count)]},
+    }).raise_for_status()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--simulations", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = []
+    with common.BackendServer(env={"BCRYPT_ROUNDS": "4"}) as server:
+        with httpx.Client(base_url=server.url, timeout=300) as client:
+            headers = common.register_and_login(client)
+            robot = client.post("/robots/", json={"name": "bench", "robot_type": "mobile_robot"}, headers=headers).json()
+            for name, submit in (("one_by_one", one_by_one), ("batch_list", batch_list), ("batch_grid", batch_grid)):
+                elapsed = submit(client, headers, robot["id"], args.simulations)
+                results.append({
+                    "mode": name,
+                    "simulations": args.simulations,
+                    "seconds": round(elapsed, 3),
+                    "simulations_per_second": round(args.simulations / elapsed, 1),
+                })
+    baseline = results[0]["simulations_per_second"]
+    for r in results:
+        r["speedup"] = round(r["simulations_per_second"] / baseline, 1)
+    common.report("bulk_submit", results)
+
+
+if __name__ == "__main__":
+    main()
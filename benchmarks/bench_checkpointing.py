@@ -0,0 +1,100 @@
+"""
+Benchmark de checkpoints del motor diff_drive: costo de E/S frente a trabajo
+recalculado. Para cada intervalo (en iteraciones de CEM) se entrena con
+checkpoints, se simula una caída tras `--crash-at` iteraciones, se reanuda
+desde el último checkpoint en un motor nuevo y se termina. Reporta el tiempo
+de escritura, el tamaño de los checkpoints, las iteraciones repetidas y si el
+resultado es idéntico al de un entrenamiento sin interrupciones.
+
+    python benchmarks/bench_checkpointing.py --intervals 0 1 2 5 10
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import common
+
+common.use_runner()
+
+from checkpoints import CheckpointStore
+from engines import build_engine
+
+
+def make_engine(args):
+    return build_engine("diff_drive", {}, {
+        "num_envs": args.num_envs, "iterations": args.iterations,
+        "max_steps": args.max_steps, "seed": 1,
+    })
+
+
+def train(engine, until: int, store=None, interval: int = 0):
+    """Avanzar hasta `until` iteraciones; devuelve (último checkpoint, segundos escribiendo)"""
+    path, write_seconds = None, 0.0
+    events = engine.run()
+    for _ in events:
+        if engine.iteration >= until:
+            break
+        if store and interval and engine.iteration and engine.iteration % interval == 0:
+            started = time.perf_counter()
+            path = store.save(1, engine.state_dict())
+            store.prune(1, keep=path)
+            write_seconds += time.perf_counter() - started
+    events.close()
+    return path, write_seconds
+
+
+def run(args, interval: int, reference: np.ndarray) -> dict:
+    root = tempfile.mkdtemp()
+    store = CheckpointStore(root)
+    started = time.perf_counter()
+
+    engine = make_engine(args)
+    path, write_seconds = train(engine, args.crash_at, store, interval)
+
+    # Caída: el motor se pierde y otro retoma desde el último checkpoint
+    resumed = make_engine(args)
+    if path:
+        resumed.load_state_dict(store.load(path))
+    resumed_from = resumed.iteration
+    for _ in resumed.run():
+        pass
+    elapsed = time.perf_counter() - started
+    shutil.rmtree(root)
+    return {
+        "interval": interval,
+        "checkpoints": store.saved,
+        "checkpoint_bytes": store.bytes_written // max(store.saved, 1),
+        "write_ms": round(write_seconds * 1000, 2),
+        "recomputed_iterations": args.crash_at - resumed_from,
+        "seconds": round(elapsed, 3),
+        "identical": bool(np.array_equal(resumed.mean, reference)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--intervals", type=int, nargs="+", default=[0, 1, 2, 5, 10])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--crash-at", type=int, default=14)
+    parser.add_argument("--num-envs", type=int, default=2048)
+    parser.add_argument("--max-steps", type=int, default=100)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    reference = make_engine(args)
+    for _ in reference.run():
+        pass
+    baseline = time.perf_counter() - started
+
+    results = [run(args, interval, reference.mean) for interval in args.intervals]
+    for r in results:
+        r["overhead"] = round(r["seconds"] / baseline - 1, 3)
+    common.report("checkpointing", {"uninterrupted_seconds": round(baseline, 3), "runs": results})
+
+
+if __name__ == "__main__":
+    main()
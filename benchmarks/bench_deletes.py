@@ -0,0 +1,135 @@
+"""
+Benchmark del borrado de un robot con historial: la cascada del ORM
+(`db.delete(robot)`, que carga cada simulación y cada log en la sesión)
+frente a los borrados SQL por lotes de deletions.py. Mide duración, pico de
+memoria de Python (tracemalloc) y latencia de un escritor de logs
+concurrente en otro robot, que espera mientras el borrado tiene el lock.
+
+    python benchmarks/bench_deletes.py --simulations 20 --logs 10000
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import common
+
+common.use_runner()
+common.use_backend()
+
+from storage import Storage, db_timestamp
+
+ROBOT_ID = 2
+
+
+def seed(db_path: str, simulations: int, logs: int) -> int:
+    """Robot ROBOT_ID con `simulations` x `logs` logs; devuelve la simulación viva del robot 1"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO robots (id, user_id, name, robot_type) VALUES (?, 1, 'old', 'mobile_robot')", (ROBOT_ID,))
+        live_id = conn.execute(
+            "INSERT INTO simulations (robot_id, user_id, name, status) VALUES (1, 1, 'live', 'running')"
+        ).lastrowid
+        for s in range(simulations):
+            simulation_id = conn.execute(
+                "INSERT INTO simulations (robot_id, user_id, name, status) VALUES (?, 1, ?, 'completed')",
+                (ROBOT_ID, f"sim-{s}"),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+                "VALUES (?, ?, 1, 'INFO', ?, ?)",
+                ((simulation_id, ROBOT_ID, f"Iteración {i}: loss {1 / (i + 1):.6f}", db_timestamp()) for i in range(logs)),
+            )
+    return live_id
+
+
+def concurrent_writer(db_path: str, simulation_id: int, stop: threading.Event, samples: list, errors: list):
+    """Un log por commit en otro robot; cuenta los que agotan el busy timeout esperando al borrado"""
+    storage = Storage(f"sqlite:///{db_path}", pool_size=1)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            storage.execute(
+                "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+                "VALUES (:id, 1, 1, 'INFO', 'live', :now)",
+                {"id": simulation_id, "now": db_timestamp()},
+            )
+        except Exception:
+            errors.append(time.perf_counter() - started)
+        else:
+            samples.append(time.perf_counter() - started)
+        time.sleep(0.002)
+    storage.dispose()
+
+
+def run(mode: str, simulations: int, logs: int, batch_size: int) -> dict:
+    db_path = common.create_database()
+    live_id = seed(db_path, simulations, logs)
+    metrics_dir = tempfile.mkdtemp(prefix="bench_deletes_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from deletions import Deleter
+    from metrics_store import MetricsStore
+    from models import Robot
+    from sqlite_profile import profile
+
+    # Mismo engine que el backend: pragmas de sqlite_profile en cada conexión
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": profile.timeout})
+    event.listen(engine, "connect", lambda dbapi_connection, record: profile.apply(dbapi_connection))
+    stop = threading.Event()
+    samples, errors = [], []
+    writer = threading.Thread(target=concurrent_writer, args=(db_path, live_id, stop, samples, errors), daemon=True)
+    writer.start()
+    time.sleep(0.2)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    if mode == "orm_cascade":
+        with sessionmaker(bind=engine)() as db:
+            db.delete(db.get(Robot, ROBOT_ID))
+            db.commit()
+    else:
+        Deleter(engine, MetricsStore(metrics_dir), batch_size=batch_size).delete("robot", ROBOT_ID, 1)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stop.set()
+    writer.join()
+
+    with sqlite3.connect(db_path) as conn:
+        remaining = conn.execute("SELECT COUNT(*) FROM training_logs WHERE robot_id = ?", (ROBOT_ID,)).fetchone()[0]
+    engine.dispose()
+    shutil.rmtree(metrics_dir)
+    os.unlink(db_path)
+    writer_ms = common.percentiles(samples)
+    return {
+        "mode": mode,
+        "rows": simulations * logs,
+        "seconds": round(elapsed, 2),
+        "peak_memory_mb": round(peak / 2**20, 1),
+        "writer_p50_ms": round(writer_ms["p50"] * 1000, 2),
+        "writer_max_ms": round(writer_ms["max"] * 1000, 2),
+        "writer_timeouts": len(errors),
+        "remaining_logs": remaining,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--simulations", type=int, default=20)
+    parser.add_argument("--logs", type=int, default=10000, help="Logs por simulación")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    results = [run(mode, args.simulations, args.logs, args.batch_size) for mode in ("orm_cascade", "bulk")]
+    common.report("deletes", results)
+
+
+if __name__ == "__main__":
+    main()
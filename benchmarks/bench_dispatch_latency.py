@@ -0,0 +1,99 @@
+"""
+Benchmark de latencia submit-to-start del runner.
+Compara el polling puro con las notificaciones UDP y en memoria del backend:
+se inserta una simulación, se notifica y se mide el tiempo hasta que el
+runner la reclama (`started_at`).
+
+    python benchmarks/bench_dispatch_latency.py --submissions 20 --poll-interval 2
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import common
+
+common.use_runner()
+common.use_backend()
+
+
+def submit(db_path: str) -> (int, datetime):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.execute(
+        "INSERT INTO simulations (robot_id, user_id, name, status) VALUES (1, 1, 'latency', 'pending')"
+    )
+    conn.commit()
+    conn.close()
+    return cursor.lastrowid, datetime.utcnow()
+
+
+def started_at(db_path: str, simulation_id: int):
+    conn = sqlite3.connect(db_path)
+    row = conn.execute("SELECT started_at FROM simulations WHERE id = ?", (simulation_id,)).fetchone()
+    conn.close()
+    return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+
+def run_mode(mode: str, submissions: int, poll_interval: float) -> dict:
+    from notifications import InMemoryNotifier, NullNotifier, UDPNotifier
+    from simulation_runner import SimulationRunner
+
+    db_path = common.create_database()
+    port = random.randint(20000, 40000)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUNNER_WORKERS"] = "4"
+    os.environ["RUNNER_POLL_INTERVAL"] = str(poll_interval)
+    os.environ["SIMULATION_TIME_SCALE"] = "0.001"
+    # Motor dummy: el benchmark mide el runner, no el entrenamiento
+    os.environ["RUNNER_ENGINE"] = "dummy"
+    os.environ["RUNNER_NOTIFY_PORT"] = str(port) if mode == "udp" else "0"
+    os.environ["RUNNER_NOTIFY_HOST"] = "127.0.0.1"
+
+    runner = SimulationRunner()
+    if mode == "udp":
+        notifier = UDPNotifier([f"127.0.0.1:{port}"])
+    elif mode == "memory":
+        notifier = InMemoryNotifier()
+        notifier.subscribe(runner.wakeup)
+    else:
+        notifier = NullNotifier()
+
+    thread = threading.Thread(target=runner.run, daemon=True)
+    thread.start()
+    time.sleep(0.5)
+
+    latencies = []
+    for _ in range(submissions):
+        simulation_id, submitted = submit(db_path)
+        notifier.notify("simulation_created", simulation_id=simulation_id)
+        while (start := started_at(db_path, simulation_id)) is None:
+            time.sleep(0.005)
+        latencies.append((start - submitted).total_seconds())
+        # Espaciar los envíos para no alinearse con el ciclo de polling
+        time.sleep(random.uniform(0, poll_interval / 2))
+
+    runner.stop()
+    thread.join()
+    os.unlink(db_path)
+    return {"mode": mode, "submit_to_start_seconds": common.percentiles(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--submissions", type=int, default=20)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--modes", nargs="+", default=["polling", "udp", "memory"])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = [run_mode(mode, args.submissions, args.poll_interval) for mode in args.modes]
+    common.report("dispatch_latency", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark del motor vectorizado diff_drive: pasos de entorno por segundo
+según cuántos robots se simulan en paralelo (num_envs). Con num_envs
+pequeño domina el costo por operación de Python/NumPy; con miles de
+entornos el mismo número de operaciones avanza muchos más pasos.
+
+    python benchmarks/bench_engine.py --num-envs 1 32 256 2048 16384
+"""
+
+import argparse
+
+import common
+
+common.use_runner()
+
+from engines import build_engine
+
+
+def run(num_envs: int, iterations: int, max_steps: int) -> dict:
+    population = min(32, num_envs)
+    engine = build_engine("diff_drive", {}, {
+        "num_envs": num_envs, "population": population, "iterations": iterations,
+        "max_steps": max_steps, "seed": 1,
+    })
+    for _ in engine.run():
+        pass
+    results = engine.results()
+    return {
+        "num_envs": results["metrics"]["num_envs"],
+        "env_steps": results["env_steps"],
+        "seconds": round(results["training_duration"], 3),
+        "env_steps_per_second": round(results["env_steps_per_second"]),
+        "success_rate": round(results["success_rate"], 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 32, 256, 2048, 16384])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--max-steps", type=int, default=100)
+    args = parser.parse_args()
+
+    results = [run(n, args.iterations, args.max_steps) for n in args.num_envs]
+    baseline = results[0]["env_steps_per_second"]
+    for r in results:
+        r["speedup"] = round(r["env_steps_per_second"] / baseline, 1)
+    common.report("diff_drive_engine", results)
+
+
+if __name__ == "__main__":
+    main()
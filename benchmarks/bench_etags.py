@@ -0,0 +1,85 @@
+"""
+Benchmark de GET condicionales: el refresco del dashboard (GET /robots/ y
+GET /simulations/ tras cada acción) pidiendo siempre la lista completa,
+revalidando con If-None-Match (304 sin consulta ni serialización) y con la
+cache de respuestas en memoria para clientes sin ETag.
+
+    python benchmarks/bench_etags.py --simulations 2000 --requests 200
+"""
+
+import argparse
+import time
+
+import httpx
+
+import common
+
+DASHBOARD = ["/robots/", "/simulations/?limit=100"]
+
+
+def seed(client, headers, simulations: int):
+    robot_id = client.post("/robots/", json={"name": "bench", "robot_type": "mobile_robot"}, headers=headers).json()["id"]
+    client.post("/simulations/batch", headers=headers, json={
+        "robot_id": robot_id, "name": "sweep", "grid": {"lr": [0.001 * (i + 1) for i in range(simulations)]},
+    }).raise_for_status()
+
+
+def refresh(client, headers, etags=None) -> int:
+    """Un refresco del dashboard; devuelve los bytes recibidos"""
+    received = 0
+    for path in DASHBOARD:
+        request_headers = dict(headers)
+        if etags is not None and path in etags:
+            request_headers["If-None-Match"] = etags[path]
+        response = client.get(path, headers=request_headers)
+        assert response.status_code in (200, 304), response.status_code
+        received += len(response.content)
+        if etags is not None and "etag" in response.headers:
+            etags[path] = response.headers["etag"]
+    return received
+
+
+def measure(fn, requests: int):
+    samples = []
+    received = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        received += fn()
+        samples.append(time.perf_counter() - started)
+    stats = common.percentiles(samples)
+    return {
+        "p50_ms": round(stats["p50"] * 1000, 2),
+        "p95_ms": round(stats["p95"] * 1000, 2),
+        "bytes_per_refresh": received // requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--simulations", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    db_path = common.create_database()
+    results = []
+    for cache_size in ("0", "1024"):
+        with common.BackendServer(db_path, env={"BCRYPT_ROUNDS": "4", "RESPONSE_CACHE_SIZE": cache_size}) as server:
+            with httpx.Client(base_url=server.url, timeout=60) as client:
+                headers = common.register_and_login(client)
+                if not results:
+                    seed(client, headers, args.simulations)
+                    results.append({"mode": "full_refetch", **measure(lambda: refresh(client, headers), args.requests)})
+                    etags = {}
+                    refresh(client, headers, etags)
+                    results.append({"mode": "if_none_match", **measure(lambda: refresh(client, headers, etags), args.requests)})
+                else:
+                    refresh(client, headers)
+                    results.append({"mode": "response_cache", **measure(lambda: refresh(client, headers), args.requests)})
+    baseline = results[0]["p50_ms"]
+    for r in results:
+        r["speedup_p50"] = round(baseline / r["p50_ms"], 1)
+    common.report("etags", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark del costo de la instrumentación: latencia de endpoints de lectura
+con PROMETHEUS_ENABLED=0 (métricas nulas, sin hooks) frente a =1 (middleware
+HTTP y eventos de SQLAlchemy activos), y duración de un scrape de /metrics.
+
+    python benchmarks/bench_instrumentation.py --simulations 500 --requests 500
+"""
+
+import argparse
+import time
+
+import httpx
+
+import common
+
+ENDPOINTS = ["/robots/{robot_id}", "/simulations/?limit=20", "/async/simulations/?limit=20"]
+
+
+def seed(client, headers, simulations: int) -> int:
+    robot_id = client.post("/robots/", json={"name": "bench", "robot_type": "mobile_robot"}, headers=headers).json()["id"]
+    client.post("/simulations/batch", headers=headers, json={
+        "robot_id": robot_id, "name": "sweep", "grid": {"lr": [0.001 * (i + 1) for i in range(simulations)]},
+    }).raise_for_status()
+    return robot_id
+
+
+def measure(client, headers, path: str, requests: int) -> dict:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+    stats = common.percentiles(samples)
+    return {"p50_ms": round(stats["p50"] * 1000, 3), "p99_ms": round(stats["p99"] * 1000, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--simulations", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    db_path = common.create_database()
+    results = {}
+    robot_id = None
+    for enabled in ("0", "1"):
+        with common.BackendServer(db_path, env={"BCRYPT_ROUNDS": "4", "PROMETHEUS_ENABLED": enabled}) as server:
+            with httpx.Client(base_url=server.url, timeout=60) as client:
+                headers = common.register_and_login(client)
+                if robot_id is None:
+                    robot_id = seed(client, headers, args.simulations)
+                for template in ENDPOINTS:
+                    path = template.format(robot_id=robot_id)
+                    # Calentar la cache de autenticación y el pool
+                    measure(client, headers, path, 10)
+                    results.setdefault(template, {})[f"metrics_{'on' if enabled == '1' else 'off'}"] = measure(
+                        client, headers, path, args.requests
+                    )
+                if enabled == "1":
+                    scrape = measure(client, {}, "/metrics", 50)
+                    size = len(client.get("/metrics").content)
+
+    rows = []
+    for template, modes in results.items():
+        off, on = modes["metrics_off"], modes["metrics_on"]
+        rows.append({
+            "endpoint": template,
+            **{f"{mode}_{k}": v for mode, stats in modes.items() for k, v in stats.items()},
+            "overhead_p50_ms": round(on["p50_ms"] - off["p50_ms"], 3),
+        })
+    rows.append({"endpoint": "/metrics", "scrape_p50_ms": scrape["p50_ms"], "scrape_bytes": size})
+    common.report("instrumentation", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark de retención de logs: espacio en disco de `training_logs` antes y
+después de archivar las simulaciones terminadas (log_retention.py), latencia
+de un escritor de logs concurrente mientras se compacta (un único DELETE
+frente a lotes de `--chunk-rows`) y latencia de leer una página de logs desde
+la base frente al archivo comprimido.
+
+    python benchmarks/bench_log_retention.py --simulations 50 --logs 20000
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import common
+
+common.use_runner()
+common.use_backend()
+
+from log_archive import LogArchive
+from log_retention import LogRetention
+from storage import Storage, db_timestamp
+
+
+def seed(db_path: str, simulations: int, logs: int):
+    old = datetime.utcnow() - timedelta(days=30)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO simulations (robot_id, user_id, name, status, completed_at) VALUES (1, 1, ?, 'completed', ?)",
+            ((f"sim-{i}", db_timestamp(old)) for i in range(simulations)),
+        )
+        conn.execute("INSERT INTO simulations (robot_id, user_id, name, status) VALUES (1, 1, 'live', 'running')")
+        for simulation_id in range(1, simulations + 1):
+            conn.executemany(
+                "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+                "VALUES (?, 1, 1, ?, ?, ?)",
+                (
+                    (simulation_id, "DEBUG" if i % 4 == 0 else "INFO",
+                     f"[{i * 100 // logs}%] Iteración {i}: loss {1 / (i + 1):.6f}",
+                     db_timestamp(old + timedelta(seconds=i)))
+                    for i in range(logs)
+                ),
+            )
+    return simulations + 1
+
+
+def db_size(db_path: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return sum(os.path.getsize(path) for path in (db_path, db_path + "-wal") if os.path.exists(path))
+
+
+def concurrent_writer(db_path: str, simulation_id: int, stop: threading.Event, samples: list):
+    """Un log por commit, como un worker sin buffer: mide cuánto espera al compactador"""
+    storage = Storage(f"sqlite:///{db_path}", pool_size=1)
+    while not stop.is_set():
+        started = time.perf_counter()
+        storage.execute(
+            "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+            "VALUES (:id, 1, 1, 'INFO', 'live', :now)",
+            {"id": simulation_id, "now": db_timestamp()},
+        )
+        samples.append(time.perf_counter() - started)
+        time.sleep(0.002)
+    storage.dispose()
+
+
+def run(mode: str, simulations: int, logs: int, chunk_rows: int, codec: str) -> dict:
+    db_path = common.create_database()
+    live_id = seed(db_path, simulations, logs)
+    size_before = db_size(db_path)
+    archive_root = tempfile.mkdtemp()
+    storage = Storage(f"sqlite:///{db_path}")
+
+    stop = threading.Event()
+    samples = []
+    writer = threading.Thread(target=concurrent_writer, args=(db_path, live_id, stop, samples), daemon=True)
+    writer.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    if mode == "single_delete":
+        # Lo que haría un job ingenuo: un DELETE de todo en una transacción
+        storage.execute("DELETE FROM training_logs WHERE simulation_id <= :last", {"last": simulations})
+        raw = storage.engine.raw_connection()
+        raw.driver_connection.executescript("PRAGMA incremental_vacuum")
+        raw.close()
+        stats = {"archived_rows": 0}
+    else:
+        retention = LogRetention(
+            storage, LogArchive(archive_root, codec), ttls={}, archive_after=0,
+            chunk_rows=chunk_rows, chunk_pause=0.005, batch_simulations=simulations,
+        )
+        stats = retention.run_once()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    writer.join()
+
+    result = {
+        "mode": mode,
+        "rows": simulations * logs,
+        "compaction_s": round(elapsed, 2),
+        "db_bytes_before": size_before,
+        "db_bytes_after": db_size(db_path),
+        "archive_bytes": sum(os.path.getsize(os.path.join(archive_root, name)) for name in os.listdir(archive_root)),
+        "archived_rows": stats["archived_rows"],
+        "writer_ms": {k: round(v * 1000, 2) if k != "count" else v for k, v in common.percentiles(samples).items()},
+    }
+    storage.dispose()
+    shutil.rmtree(archive_root)
+    os.unlink(db_path)
+    return result
+
+
+def read_latency(logs: int, codec: str, limit: int = 100, repeat: int = 20) -> dict:
+    """Primera página de logs: consulta keyset a la base frente al archivo (frío y en cache)"""
+    from sqlalchemy import create_engine
+
+    import archived_logs
+    from pagination import keyset_statement
+    from projections import LOG_PROJECTION
+    from queries import LOG_PAGE_KEYS, log_filters
+
+    db_path = common.create_database()
+    seed(db_path, 1, logs)
+    engine = create_engine(f"sqlite:///{db_path}")
+    stmt = keyset_statement(LOG_PROJECTION.select().where(*log_filters(1)), LOG_PAGE_KEYS, None, limit)
+    with engine.connect() as conn:
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            LOG_PROJECTION.page(conn.execute(stmt).all(), limit)
+            samples.append(time.perf_counter() - started)
+    engine.dispose()
+
+    archive_root = tempfile.mkdtemp()
+    storage = Storage(f"sqlite:///{db_path}")
+    LogRetention(storage, LogArchive(archive_root, codec), ttls={}, archive_after=0).run_once()
+    path = storage.fetch_one("SELECT logs_archive_path FROM simulations WHERE id = 1")["logs_archive_path"]
+    storage.dispose()
+
+    started = time.perf_counter()
+    archived_logs.load(path).page(None, limit)
+    cold = time.perf_counter() - started
+    cached = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        archived_logs.load(path).page(None, limit)
+        cached.append(time.perf_counter() - started)
+    shutil.rmtree(archive_root)
+    os.unlink(db_path)
+    return {
+        "logs": logs,
+        "db_page_ms": round(common.percentiles(samples)["p50"] * 1000, 2),
+        "archive_cold_ms": round(cold * 1000, 2),
+        "archive_cached_ms": round(common.percentiles(cached)["p50"] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--simulations", type=int, default=50)
+    parser.add_argument("--logs", type=int, default=20000)
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    parser.add_argument("--codec", default="gzip", choices=["gzip", "zstd"])
+    args = parser.parse_args()
+    results = [
+        run(mode, args.simulations, args.logs, args.chunk_rows, args.codec)
+        for mode in ("single_delete", "chunked_archive")
+    ]
+    results.append(read_latency(args.logs, args.codec))
+    common.report("log_retention", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark de escritura de logs de entrenamiento: filas/segundo con el
+esquema anterior (una conexión + INSERT + COMMIT por log) frente al
+TrainingLogSink con buffer y `executemany`.
+
+    python benchmarks/bench_log_writes.py --threads 8 --rows 500
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import common
+
+common.use_runner()
+
+from log_sink import TrainingLogSink
+from storage import Storage
+
+
+def legacy_add_training_log(db_file: str, simulation_id: int, message: str):
+    """Comportamiento anterior de SimulationRunner.add_training_log"""
+    conn = sqlite3.connect(db_file)
+    try:
+        conn.execute("""
+            INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (simulation_id, 1, 1, "INFO", message, datetime.utcnow().isoformat()))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def run_threads(threads: int, target) -> float:
+    workers = [threading.Thread(target=target, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def bench_legacy(threads: int, rows: int) -> dict:
+    db_path = common.create_database()
+
+    def write(index):
+        for i in range(rows):
+            legacy_add_training_log(db_path, index + 1, f"[{i}] legacy")
+
+    elapsed = run_threads(threads, write)
+    return {"writer": "legacy", "rows": threads * rows, "seconds": round(elapsed, 3),
+            "rows_per_second": round(threads * rows / elapsed, 1)}
+
+
+def bench_sink(threads: int, rows: int, flush_rows: int) -> dict:
+    db_path = common.create_database()
+    storage = Storage(f"sqlite:///{db_path}")
+    sink = TrainingLogSink(
+        storage.connect,
+        flush_rows=flush_rows,
+        flush_interval=0.5,
+    )
+    sink.start()
+
+    def write(index):
+        for i in range(rows):
+            sink.add(index + 1, 1, 1, "INFO", f"[{i}] sink", datetime.utcnow().isoformat())
+
+    started = time.perf_counter()
+    run_threads(threads, write)
+    sink.close()
+    elapsed = time.perf_counter() - started
+    storage.dispose()
+    return {"writer": "sink", "flush_rows": flush_rows, "rows": threads * rows, "flushes": sink.flushes,
+            "seconds": round(elapsed, 3), "rows_per_second": round(threads * rows / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--flush-rows", type=int, default=500)
+    args = parser.parse_args()
+
+    legacy = bench_legacy(args.threads, args.rows)
+    sink = bench_sink(args.threads, args.rows, args.flush_rows)
+    sink["speedup"] = round(sink["rows_per_second"] / legacy["rows_per_second"], 1)
+    common.report("training_log_writes", [legacy, sink])
+
+
+if __name__ == "__main__":
+    main()
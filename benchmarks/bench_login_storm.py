@@ -0,0 +1,83 @@
+"""
+Benchmark de latencia de endpoints CRUD durante una ráfaga de logins.
+Mide GET /robots/ sin carga y mientras varios clientes hacen login en bucle;
+con el executor de hashing dedicado la latencia CRUD debe mantenerse plana y
+los logins que exceden la cola reciben 503.
+
+    python benchmarks/bench_login_storm.py --login-clients 64 --seconds 10
+"""
+
+import argparse
+import threading
+import time
+
+import httpx
+
+import common
+
+
+def crud_loop(url, headers, stop, latencies):
+    with httpx.Client(base_url=url, headers=headers, timeout=60) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/robots/")
+            latencies.append(time.perf_counter() - started)
+
+
+def login_loop(url, stop, counts, lock):
+    with httpx.Client(base_url=url, timeout=60) as client:
+        while not stop.is_set():
+            response = client.post("/auth/login", json={"email": "bench@example.com", "password": "bench-password"})
+            with lock:
+                counts[response.status_code] = counts.get(response.status_code, 0) + 1
+            # Un cliente bien educado respeta Retry-After al recibir 503
+            if response.status_code == 503:
+                stop.wait(float(response.headers.get("retry-after", "1")))
+
+
+def phase(url, headers, crud_clients, login_clients, seconds):
+    stop = threading.Event()
+    latencies, counts, lock = [], {}, threading.Lock()
+    threads = [threading.Thread(target=crud_loop, args=(url, headers, stop, latencies)) for _ in range(crud_clients)]
+    threads += [threading.Thread(target=login_loop, args=(url, stop, counts, lock)) for _ in range(login_clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "login_clients": login_clients,
+        "crud_latency_seconds": common.percentiles(latencies),
+        "crud_requests_per_second": round(len(latencies) / seconds, 1),
+        "login_responses": {str(k): v for k, v in counts.items()},
+        "logins_per_second": round(counts.get(200, 0) / seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--crud-clients", type=int, default=4)
+    parser.add_argument("--login-clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--bcrypt-rounds", default="12")
+    parser.add_argument("--hash-workers", default="2")
+    parser.add_argument("--hash-queue-limit", default="16")
+    args = parser.parse_args()
+
+    env = {
+        "BCRYPT_ROUNDS": args.bcrypt_rounds,
+        "HASH_WORKERS": args.hash_workers,
+        "HASH_QUEUE_LIMIT": args.hash_queue_limit,
+    }
+    with common.BackendServer(env=env) as server:
+        with httpx.Client(base_url=server.url, timeout=60) as client:
+            headers = common.register_and_login(client)
+            client.post("/robots/", json={"name": "bench", "robot_type": "mobile_robot"}, headers=headers)
+        quiet = phase(server.url, headers, args.crud_clients, 0, args.seconds)
+        storm = phase(server.url, headers, args.crud_clients, args.login_clients, args.seconds)
+    common.report("login_storm", {"settings": env, "quiet": quiet, "storm": storm})
+
+
+if __name__ == "__main__":
+    main()
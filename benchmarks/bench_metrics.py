@@ -0,0 +1,97 @@
+"""
+Benchmark de series de métricas: curva de loss reconstruida parseando logs
+de texto (`training_logs`, como hasta ahora) frente al almacén columnar
+(`metrics_store.py`) reducido con LTTB y min/max. Reporta el tiempo de
+lectura de la serie completa, el de la serie reducida a `--max-points` y el
+espacio ocupado.
+
+    python benchmarks/bench_metrics.py --points 10000 100000 1000000
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+import common
+
+common.use_runner()
+
+from metrics_store import MetricsStore, downsample
+
+LOSS_PATTERN = re.compile(r"Iteración (\d+): loss (-?[0-9.]+)")
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(points: int, max_points: int) -> dict:
+    rng = np.random.default_rng(1)
+    loss = np.exp(-np.arange(points) / (points / 5)) + rng.normal(0, 0.01, points)
+
+    # Logs de texto: una fila por punto y regex al leer
+    db_path = common.create_database()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message) VALUES (1, 1, 1, 'INFO', ?)",
+            ((f"[50%] Iteración {i}: loss {value:.6f}",) for i, value in enumerate(loss)),
+        )
+    db_size = sum(os.path.getsize(path) for path in (db_path, db_path + "-wal") if os.path.exists(path))
+
+    def parse_logs():
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute("SELECT message FROM training_logs WHERE simulation_id = 1 ORDER BY id").fetchall()
+        matches = [LOSS_PATTERN.search(message) for (message,) in rows]
+        return [(int(m.group(1)), float(m.group(2))) for m in matches if m]
+
+    parsed, logs_seconds = timed(parse_logs)
+    for path in (db_path, db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(path):
+            os.unlink(path)
+
+    # Almacén columnar
+    root = tempfile.mkdtemp()
+    store = MetricsStore(root)
+    batch = 1000
+    _, write_seconds = timed(lambda: [
+        store.append(1, [(i, "loss", value) for i, value in zip(range(start, start + batch), loss[start:start + batch].tolist())])
+        for start in range(0, points, batch)
+    ])
+    store_size = sum(os.path.getsize(os.path.join(root, "1", name)) for name in os.listdir(os.path.join(root, "1")))
+    (steps, values), read_seconds = timed(lambda: tuple(np.array(column) for column in store.read(1, "loss")))
+    _, lttb_seconds = timed(lambda: downsample(*store.read(1, "loss"), max_points, "lttb"))
+    _, minmax_seconds = timed(lambda: downsample(*store.read(1, "loss"), max_points, "minmax"))
+    shutil.rmtree(root)
+
+    assert len(parsed) == len(steps) == points
+    return {
+        "points": points,
+        "logs_parse_ms": round(logs_seconds * 1000, 1),
+        "columnar_write_ms": round(write_seconds * 1000, 1),
+        "columnar_read_ms": round(read_seconds * 1000, 2),
+        "lttb_ms": round(lttb_seconds * 1000, 2),
+        "minmax_ms": round(minmax_seconds * 1000, 2),
+        "speedup_lttb": round(logs_seconds / lttb_seconds, 1),
+        "logs_db_bytes": db_size,
+        "columnar_bytes": store_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--max-points", type=int, default=1000)
+    args = parser.parse_args()
+    common.report("metrics_store", [run(points, args.max_points) for points in args.points])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark de rollouts de una misma simulación repartidos en procesos con
+memoria compartida: pasos de entorno por segundo y speedup frente a un solo
+proceso según el número de procesos. El speedup está acotado por los núcleos
+disponibles (se reporta `cpu_count`).
+
+    python benchmarks/bench_parallel_rollouts.py --workers 1 2 4 8 --num-envs 65536
+"""
+
+import argparse
+import os
+
+import common
+
+common.use_runner()
+
+from engines import build_engine
+
+
+def run(workers: int, num_envs: int, iterations: int, max_steps: int) -> dict:
+    engine = build_engine("diff_drive", {}, {
+        "num_envs": num_envs, "iterations": iterations, "max_steps": max_steps,
+        "rollout_workers": workers, "seed": 1,
+    })
+    for _ in engine.run():
+        pass
+    results = engine.results()
+    return {
+        "workers": workers,
+        # Acotados a los núcleos y a RUNNER_MAX_ROLLOUT_WORKERS
+        "effective_workers": results["metrics"]["rollout_workers"],
+        "env_steps": results["env_steps"],
+        "seconds": round(results["training_duration"], 3),
+        "startup_seconds": round(results["metrics"]["rollout_startup_seconds"], 3),
+        "env_steps_per_second": round(results["env_steps_per_second"]),
+        "success_rate": round(results["success_rate"], 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--num-envs", type=int, default=65536)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--max-steps", type=int, default=100)
+    args = parser.parse_args()
+
+    results = [run(w, args.num_envs, args.iterations, args.max_steps) for w in sorted(set(args.workers))]
+    baseline = results[0]["env_steps_per_second"]
+    for r in results:
+        r["speedup"] = round(r["env_steps_per_second"] / baseline, 2)
+    common.report("parallel_rollouts", {"cpu_count": os.cpu_count(), "num_envs": args.num_envs, "runs": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark del camino de lectura de los listados tal como lo ejecutan los
+endpoints: proyección de columnas con SQLAlchemy Core, dicts y orjson
+(projections.py). Mide una página de simulaciones y de logs de `--limit`
+filas, y exportar todas las simulaciones del usuario como NDJSON por lotes
+con su pico de memoria de Python. Verifica que cada cuerpo valida contra el
+esquema de respuesta (mismo JSON que generaría Pydantic).
+
+La comparación con otro commit se hace con bench_suite.py (`--baseline`).
+
+    python benchmarks/bench_read_path.py --simulations 5000 --limit 1000 --repeat 20
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+import common
+import synthetic_data
+
+common.use_backend()
+
+
+def timed(fn, repeat: int) -> float:
+    """p50 en milisegundos"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return round(common.percentiles(samples)["p50"] * 1000, 2)
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, round(peak / 2**20, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--simulations", type=int, default=5000, help="Simulaciones del usuario medido")
+    parser.add_argument("--logs", type=int, default=5000, help="Logs de la simulación medida")
+    parser.add_argument("--limit", type=int, default=1000, help="Filas por página")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_read_path_"), "bench.db")
+    # Un usuario y un robot; los logs se siembran en una sola simulación
+    synthetic_data.seed_database(db_path, users=1, robots_per_user=1, simulations_per_robot=args.simulations,
+                                 logs_per_simulation=0)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+            "VALUES (1, 2, 2, 'INFO', ?, ?)",
+            ((f"Iteración {i}: loss {1 / (i + 1):.6f}", f"2024-01-01 00:00:{i % 60:02d}.{i:06d}") for i in range(args.logs)),
+        )
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    import orjson
+    from pydantic import TypeAdapter
+    from sqlalchemy import create_engine
+
+    from pagination import keyset_statement
+    from projections import LOG_PROJECTION, SIMULATION_PROJECTION, dumps, query_pages, stream_ndjson
+    from queries import LOG_PAGE_KEYS, SIMULATION_PAGE_KEYS, log_filters, simulation_filters
+    from schemas import SimulationResponse, TrainingLogResponse
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    user_id = 2
+
+    cases = {
+        "simulations_page": (SimulationResponse, SIMULATION_PROJECTION, simulation_filters(user_id), SIMULATION_PAGE_KEYS),
+        "logs_page": (TrainingLogResponse, LOG_PROJECTION, log_filters(1), LOG_PAGE_KEYS),
+    }
+    results = []
+    with engine.connect() as conn:
+        for name, (schema, projection, filters, keys) in cases.items():
+            adapter = TypeAdapter(List[schema])
+
+            def page():
+                stmt = projection.select().where(*filters)
+                items, _ = projection.page(conn.execute(keyset_statement(stmt, keys, None, args.limit)).all(), args.limit)
+                return dumps(items)
+
+            page_ms = timed(page, args.repeat)
+            body = page()
+            # Validar y volver a serializar con el esquema no debe cambiar el JSON
+            validated = adapter.dump_python(adapter.validate_json(body), mode="json")
+            results.append({
+                "case": name,
+                "rows": args.limit,
+                "page_ms": page_ms,
+                "rows_per_second": round(args.limit / page_ms * 1000),
+                "matches_schema": validated == orjson.loads(body),
+            })
+
+    def export_ndjson():
+        stmt = SIMULATION_PROJECTION.select().where(*simulation_filters(user_id))
+        return sum(len(chunk) for chunk in stream_ndjson(
+            query_pages(engine, SIMULATION_PROJECTION, stmt, SIMULATION_PAGE_KEYS)
+        ))
+
+    ndjson_ms = timed(export_ndjson, max(1, args.repeat // 5))
+    ndjson_bytes, ndjson_peak = peak_memory(export_ndjson)
+    results.append({
+        "case": "export_all_simulations",
+        "rows": args.simulations,
+        "ndjson_ms": ndjson_ms,
+        "ndjson_peak_mb": ndjson_peak,
+        "ndjson_bytes": ndjson_bytes,
+    })
+
+    engine.dispose()
+    os.unlink(db_path)
+    common.report("read_path", results)
+
+
+if __name__ == "__main__":
+    main()
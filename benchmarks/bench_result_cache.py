@@ -0,0 +1,101 @@
+"""
+Benchmark de la memoización de resultados: una cola donde cada combinación
+de parámetros (con seed) se envía `--repeats` veces, como un usuario que
+reenvía el mismo experimento. Compara el tiempo en vaciar la cola con la
+cache desactivada (RESULT_CACHE_SIZE=0) y activada, y verifica que los
+resultados memoizados coinciden con los calculados.
+
+    python benchmarks/bench_result_cache.py --unique 4 --repeats 8 --iterations 10
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+import common
+
+common.use_runner()
+
+
+def run(cache_size: int, unique: int, repeats: int, iterations: int, workers: int) -> dict:
+    db_path = common.create_database()
+    conn = sqlite3.connect(db_path)
+    jobs = 0
+    for repeat in range(repeats):
+        for seed in range(unique):
+            parameters = {"engine": "diff_drive", "seed": seed, "iterations": iterations, "num_envs": 1024}
+            conn.execute(
+                "INSERT INTO simulations (robot_id, user_id, name, status, parameters) VALUES (1, 1, ?, 'pending', ?)",
+                (f"dup-{seed}-{repeat}", json.dumps(parameters)),
+            )
+            jobs += 1
+    conn.commit()
+
+    data_dir = tempfile.mkdtemp(prefix="bench_result_cache_")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "RUNNER_WORKERS": str(workers),
+        "RUNNER_POLL_INTERVAL": "0.1",
+        "RUNNER_NOTIFY_PORT": "0",
+        "RUNNER_CHECKPOINT_INTERVAL": "0",
+        "LOG_RETENTION_INTERVAL": "0",
+        "RESULT_CACHE_SIZE": str(cache_size),
+        "METRICS_DIR": os.path.join(data_dir, "metrics"),
+    })
+    from simulation_runner import SimulationRunner
+
+    runner = SimulationRunner()
+    thread = threading.Thread(target=runner.run, daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    while common.count_by_status(db_path).get("completed", 0) < jobs:
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    stats = runner.result_cache.stats()
+    runner.stop()
+    thread.join()
+
+    # Todas las repeticiones de una seed deben dar el mismo entrenamiento
+    # (los tiempos medidos, como training_duration, varían entre ejecuciones)
+    distinct = conn.execute("""
+        SELECT COUNT(DISTINCT json_extract(parameters, '$.seed') || ':' || json_extract(results, '$.accuracy')
+                              || ':' || json_extract(results, '$.metrics.best_gains')) FROM simulations
+    """).fetchone()[0]
+    cached = conn.execute("SELECT COUNT(*) FROM simulations WHERE result_cache_hit").fetchone()[0]
+    conn.close()
+    os.unlink(db_path)
+    shutil.rmtree(data_dir)
+    return {
+        "result_cache": "on" if cache_size else "off",
+        "jobs": jobs,
+        "seconds": round(elapsed, 2),
+        "jobs_per_minute": round(jobs / elapsed * 60, 1),
+        "completed_from_cache": cached,
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "consistent_results": distinct == unique,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--unique", type=int, default=4, help="Combinaciones distintas de parámetros")
+    parser.add_argument("--repeats", type=int, default=8, help="Envíos de cada combinación")
+    parser.add_argument("--iterations", type=int, default=10, help="Iteraciones del motor diff_drive")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = [run(size, args.unique, args.repeats, args.iterations, args.workers) for size in (0, 10000)]
+    results[1]["speedup"] = round(results[0]["seconds"] / results[1]["seconds"], 1)
+    common.report("result_cache", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Simulación de eventos discretos de la cola de simulaciones: tiempo de espera
+(submit -> start) por usuario con FIFO por `created_at` frente al
+FairShareScheduler del runner. El usuario 1 encola un barrido grande de
+golpe; el resto envía simulaciones sueltas a lo largo del tiempo.
+
+    python benchmarks/bench_scheduler.py --sweep 5000 --workers 8
+"""
+
+import argparse
+import heapq
+import random
+from collections import defaultdict, deque
+
+import common
+
+common.use_runner()
+
+from scheduler import FairShareScheduler
+
+
+def workload(sweep: int, users: int, interactive: int, horizon: float, seed: int):
+    """Lista de (submit_time, user_id, duration) ordenada por tiempo"""
+    rng = random.Random(seed)
+    jobs = [(0.0, 1, rng.uniform(2, 8)) for _ in range(sweep)]
+    for user_id in range(2, users + 1):
+        for _ in range(interactive):
+            jobs.append((rng.uniform(0, horizon), user_id, rng.uniform(2, 8)))
+    return sorted(jobs, key=lambda job: job[0])
+
+
+def simulate(jobs, workers: int, scheduler=None):
+    """Devuelve las esperas por usuario; sin scheduler, FIFO global"""
+    queues = defaultdict(deque)
+    fifo = deque()
+    running = defaultdict(int)
+    waits = defaultdict(list)
+    finish_events = []
+    free = workers
+    now = 0.0
+    index = 0
+
+    def dispatch():
+        nonlocal free
+        while free:
+            if scheduler is None:
+                if not fifo:
+                    return
+                submitted, user_id, duration = fifo.popleft()
+            else:
+                order = scheduler.order_users([u for u, q in queues.items() if q], running)
+                if not order:
+                    return
+                user_id = order[0]
+                submitted, _, duration = queues[user_id].popleft()
+                scheduler.record_claim(user_id)
+            free -= 1
+            running[user_id] += 1
+            waits[user_id].append(now - submitted)
+            heapq.heappush(finish_events, (now + duration, user_id))
+
+    while index < len(jobs) or finish_events:
+        next_submit = jobs[index][0] if index < len(jobs) else float("inf")
+        if finish_events and finish_events[0][0] <= next_submit:
+            now, user_id = heapq.heappop(finish_events)
+            running[user_id] -= 1
+            free += 1
+        else:
+            now = next_submit
+            job = jobs[index]
+            index += 1
+            (fifo if scheduler is None else queues[job[1]]).append(job)
+        dispatch()
+    return waits, now
+
+
+def summarize(name, waits, makespan):
+    return {
+        "policy": name,
+        "makespan_seconds": round(makespan, 1),
+        "wait_seconds": {
+            f"user_{user_id}": {k: round(v, 2) for k, v in common.percentiles(samples).items()}
+            for user_id, samples in sorted(waits.items())
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sweep", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--interactive", type=int, default=50, help="simulaciones sueltas por usuario")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-running-per-user", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # Las simulaciones sueltas llegan mientras el barrido ocupa la cola
+    horizon = args.sweep * 5 / args.workers / 2
+    jobs = workload(args.sweep, args.users, args.interactive, horizon, args.seed)
+    policies = [
+        ("fifo", None),
+        ("fair_share", FairShareScheduler(max_running_per_user=args.max_running_per_user)),
+        ("fair_share_weighted", FairShareScheduler(
+            weights={2: 2.0}, max_running_per_user=args.max_running_per_user
+        )),
+    ]
+    results = [summarize(name, *simulate(jobs, args.workers, scheduler)) for name, scheduler in policies]
+    common.report("scheduler_wait_times", {"settings": vars(args), "policies": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark de lectura/escritura concurrente sobre SQLite con el perfil por
+defecto (journal rollback, synchronous=FULL) frente al perfil de
+sqlite_profile.py (WAL, synchronous=NORMAL, busy timeout, mmap y cache).
+Los escritores imitan al runner (lote de logs + cambio de estado por
+transacción) y los lectores al backend (listado de simulaciones y logs);
+cada uno es un proceso, como los servicios reales.
+
+    python benchmarks/bench_sqlite_profile.py --writers 2 --readers 4 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import sqlite3
+import time
+
+import common
+
+common.use_runner()
+
+from sqlite_profile import SQLiteProfile
+
+PROFILES = {
+    "default": SQLiteProfile(journal_mode="delete", synchronous="full", busy_timeout_ms=5000,
+                             mmap_size=0, cache_size=-2000),
+    "tuned": SQLiteProfile(),
+}
+
+LIST_SIMULATIONS = """
+    SELECT * FROM simulations WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT 50
+"""
+LIST_LOGS = """
+    SELECT * FROM training_logs WHERE simulation_id = ? ORDER BY timestamp DESC, id DESC LIMIT 100
+"""
+
+
+def connect(db_path, profile):
+    conn = sqlite3.connect(db_path, timeout=profile.timeout)
+    profile.apply(conn)
+    return conn
+
+
+def timestamp():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def writer(db_path, profile, simulation_ids, batch, seconds, results):
+    conn = connect(db_path, profile)
+    commits = errors = 0
+    latencies = []
+    deadline = time.time() + seconds
+    i = 0
+    while time.time() < deadline:
+        simulation_id = simulation_ids[i % len(simulation_ids)]
+        rows = [(simulation_id, 1, 1, "INFO", f"epoch {i}.{n}", timestamp()) for n in range(batch)]
+        started = time.perf_counter()
+        try:
+            conn.executemany(
+                "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows,
+            )
+            conn.execute("UPDATE simulations SET status = 'running' WHERE id = ?", (simulation_id,))
+            conn.commit()
+            commits += 1
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            conn.rollback()
+            errors += 1
+        i += 1
+    conn.close()
+    results.put(("write", commits, errors, latencies))
+
+
+def reader(db_path, profile, simulation_ids, seconds, results):
+    conn = connect(db_path, profile)
+    queries = errors = 0
+    latencies = []
+    deadline = time.time() + seconds
+    i = 0
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.execute(LIST_SIMULATIONS, (1,)).fetchall()
+            conn.execute(LIST_LOGS, (simulation_ids[i % len(simulation_ids)],)).fetchall()
+            queries += 1
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            errors += 1
+        i += 1
+    conn.close()
+    results.put(("read", queries, errors, latencies))
+
+
+def run(name, writers, readers, batch, seconds, simulations):
+    profile = PROFILES[name]
+    db_path = common.create_database()
+    simulation_ids = common.insert_pending_simulations(db_path, simulations)
+    # El cambio de journal se guarda en el archivo: aplicarlo antes de lanzar procesos
+    connect(db_path, profile).close()
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=writer, args=(db_path, profile, simulation_ids, batch, seconds, results))
+        for _ in range(writers)
+    ] + [
+        multiprocessing.Process(target=reader, args=(db_path, profile, simulation_ids, seconds, results))
+        for _ in range(readers)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {"profile": name, "pragmas": profile.pragmas()}
+    for kind in ("write", "read"):
+        parts = [c for c in collected if c[0] == kind]
+        latencies = [l for c in parts for l in c[3]]
+        summary[kind] = {
+            "per_second": round(sum(c[1] for c in parts) / seconds, 1),
+            "errors": sum(c[2] for c in parts),
+            "latency_seconds": common.percentiles(latencies),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--simulations", type=int, default=200)
+    args = parser.parse_args()
+
+    results = [
+        run(name, args.writers, args.readers, args.batch, args.seconds, args.simulations)
+        for name in ("default", "tuned")
+    ]
+    common.report("sqlite_profile", {"settings": vars(args), "runs": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Suite de carga reproducible: siembra una base sintética (synthetic_data.py),
+ejecuta escenarios de la API con clientes concurrentes dentro del proceso
+(TestClient sobre la app ASGI, sin red) y por HTTP (uvicorn en un
+subproceso), y procesa una cola sintética con el runner. El reporte JSON
+incluye commit, parámetros y semilla, y con `--baseline` se compara contra
+el reporte de otro commit marcando las regresiones.
+
+    python benchmarks/bench_suite.py --output before.json
+    git checkout otra-rama
+    python benchmarks/bench_suite.py --baseline before.json --output after.json
+
+Cada escenario mide peticiones/segundo, p50/p95/p99 y errores durante
+`--seconds` con `--clients` clientes (un usuario sembrado por cliente).
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import common
+import synthetic_data
+
+DRIVERS = ["inprocess", "http"]
+
+
+class Context:
+    """Datos de un usuario sembrado que usa un cliente"""
+
+    def __init__(self, user_index: int, robot_ids: List[int], simulation_ids: List[int], rng: random.Random):
+        self.email = synthetic_data.email(user_index)
+        self.robot_ids = robot_ids
+        self.simulation_ids = simulation_ids
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+
+    def login(self, client):
+        response = client.post("/auth/login", json={"email": self.email, "password": synthetic_data.PASSWORD})
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _login(client, ctx: Context):
+    return client.post("/auth/login", json={"email": ctx.email, "password": synthetic_data.PASSWORD})
+
+
+def _list_robots(client, ctx: Context):
+    return client.get("/robots/", headers=ctx.headers)
+
+
+def _get_robot(client, ctx: Context):
+    return client.get(f"/robots/{ctx.rng.choice(ctx.robot_ids)}", headers=ctx.headers)
+
+
+def _create_robot(client, ctx: Context):
+    return client.post("/robots/", headers=ctx.headers, json={
+        "name": f"load-{ctx.rng.getrandbits(32):x}", "robot_type": "mobile_robot",
+    })
+
+
+def _list_simulations(client, ctx: Context):
+    return client.get("/simulations/", params={"limit": 50}, headers=ctx.headers)
+
+
+def _list_simulations_async(client, ctx: Context):
+    return client.get("/async/simulations/", params={"limit": 50}, headers=ctx.headers)
+
+
+def _get_simulation(client, ctx: Context):
+    return client.get(f"/simulations/{ctx.rng.choice(ctx.simulation_ids)}", headers=ctx.headers)
+
+
+def _simulation_logs(client, ctx: Context):
+    return client.get(
+        f"/simulations/{ctx.rng.choice(ctx.simulation_ids)}/logs", params={"limit": 100}, headers=ctx.headers
+    )
+
+
+def _create_simulation(client, ctx: Context):
+    return client.post("/simulations/", headers=ctx.headers, json={
+        "robot_id": ctx.rng.choice(ctx.robot_ids), "name": "load", "parameters": {"episodes": 10},
+    })
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": _login,
+    "list_robots": _list_robots,
+    "get_robot": _get_robot,
+    "create_robot": _create_robot,
+    "list_simulations": _list_simulations,
+    "list_simulations_async": _list_simulations_async,
+    "get_simulation": _get_simulation,
+    "simulation_logs": _simulation_logs,
+    "create_simulation": _create_simulation,
+}
+
+# Tráfico de un dashboard: mayoría de lecturas, algunas escrituras
+MIXED_WEIGHTS = {
+    "list_simulations": 30, "get_simulation": 25, "simulation_logs": 20, "list_robots": 10,
+    "get_robot": 10, "create_simulation": 4, "login": 1,
+}
+
+
+def _mixed(client, ctx: Context):
+    name = ctx.rng.choices(list(MIXED_WEIGHTS), list(MIXED_WEIGHTS.values()))[0]
+    return SCENARIOS[name](client, ctx)
+
+
+SCENARIOS["mixed"] = _mixed
+
+
+def load_contexts(db_path: str, clients: int, users: int, seed: int) -> List[Context]:
+    conn = sqlite3.connect(db_path)
+    contexts = []
+    for i in range(clients):
+        user_index = i % users
+        user_id = conn.execute(
+            "SELECT id FROM users WHERE email = ?", (synthetic_data.email(user_index),)
+        ).fetchone()[0]
+        robot_ids = [row[0] for row in conn.execute("SELECT id FROM robots WHERE user_id = ?", (user_id,))]
+        simulation_ids = [row[0] for row in conn.execute("SELECT id FROM simulations WHERE user_id = ?", (user_id,))]
+        contexts.append(Context(user_index, robot_ids, simulation_ids, random.Random(seed + i)))
+    conn.close()
+    return contexts
+
+
+def run_scenario(make_client: Callable, contexts: List[Context], scenario: Callable, seconds: float) -> Dict[str, Any]:
+    stop = threading.Event()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def client_loop(ctx: Context):
+        with make_client() as client:
+            own = []
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    status = str(scenario(client, ctx).status_code)
+                except Exception as e:
+                    status = type(e).__name__
+                elapsed = time.perf_counter() - started
+                with lock:
+                    statuses[status] = statuses.get(status, 0) + 1
+                if status.startswith("2"):
+                    own.append(elapsed)
+            with lock:
+                latencies.extend(own)
+
+    threads = [threading.Thread(target=client_loop, args=(ctx,)) for ctx in contexts]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = common.percentiles(latencies)
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        **{f"{p}_ms": round(stats[p] * 1000, 3) for p in ("p50", "p95", "p99") if p in stats},
+        "errors": errors,
+        "statuses": statuses,
+    }
+
+
+def run_api(driver: str, db_path: str, args) -> List[Dict[str, Any]]:
+    env = {"BCRYPT_ROUNDS": str(args.bcrypt_rounds), "NOTIFY_BACKEND": "none"}
+    contexts = load_contexts(db_path, args.clients, args.users, args.seed)
+    results = []
+
+    def run_all(make_client):
+        with make_client() as client:
+            for ctx in contexts:
+                ctx.login(client)
+        for name in args.scenarios:
+            result = run_scenario(make_client, contexts, SCENARIOS[name], args.seconds)
+            results.append({"driver": driver, "scenario": name, "clients": args.clients, **result})
+
+    if driver == "http":
+        import httpx
+
+        with common.BackendServer(db_path, env=env) as server:
+            run_all(lambda: httpx.Client(base_url=server.url, timeout=60))
+    else:
+        # La app lee su configuración del entorno al importarse
+        os.environ.update({"DATABASE_URL": f"sqlite:///{db_path}", **env})
+        common.use_backend()
+        from fastapi.testclient import TestClient
+
+        import main
+
+        # Un solo TestClient (un event loop) para todos los hilos: las
+        # conexiones del motor async quedan ligadas al loop que las abrió
+        with TestClient(main.app) as client:
+            run_all(lambda: contextlib.nullcontext(client))
+    return results
+
+
+def run_runner(args) -> Dict[str, Any]:
+    """Vaciar una cola sintética de `--queue` simulaciones repartidas entre los usuarios"""
+    db_path = common.create_database()
+    synthetic_data.seed_database(
+        db_path, users=args.users, robots_per_user=1, simulations_per_robot=0, seed=args.seed,
+        bcrypt_rounds=args.bcrypt_rounds,
+    )
+    conn = sqlite3.connect(db_path)
+    robots = conn.execute("SELECT id, user_id FROM robots WHERE user_id > 1").fetchall()
+    rng = random.Random(args.seed)
+    conn.executemany(
+        "INSERT INTO simulations (robot_id, user_id, name, status, parameters, priority, created_at) "
+        "VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+        (
+            (*rng.choice(robots), f"queue-{i}", json.dumps({"episodes": 10, "engine": "dummy"}), rng.randint(0, 2),
+             datetime.utcnow().strftime(synthetic_data.TIMESTAMP_FORMAT))
+            for i in range(args.queue)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+    data_dir = tempfile.mkdtemp(prefix="bench_runner_")
+    os.environ.update({
+        "METRICS_DIR": os.path.join(data_dir, "metrics"),
+        "RUNNER_CHECKPOINT_DIR": os.path.join(data_dir, "checkpoints"),
+        "LOG_ARCHIVE_DIR": os.path.join(data_dir, "log_archives"),
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "RUNNER_WORKERS": str(args.runner_workers),
+        "RUNNER_POLL_INTERVAL": "0.2",
+        "RUNNER_NOTIFY_PORT": "0",
+        "RUNNER_ENGINE": "dummy",
+        "SIMULATION_TIME_SCALE": str(args.time_scale),
+        "RUNNER_CHECKPOINT_INTERVAL": "0",
+        "LOG_RETENTION_INTERVAL": "0",
+    })
+    common.use_runner()
+    from simulation_runner import SimulationRunner
+
+    runner = SimulationRunner()
+    thread = threading.Thread(target=runner.run, daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    deadline = started + args.runner_timeout
+    while time.perf_counter() < deadline:
+        counts = common.count_by_status(db_path)
+        if counts.get("completed", 0) + counts.get("failed", 0) >= args.queue:
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    runner.stop()
+    thread.join()
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT (julianday(started_at) - julianday(created_at)) * 86400, "
+        "(julianday(completed_at) - julianday(started_at)) * 86400 "
+        "FROM simulations WHERE status = 'completed'"
+    ).fetchall()
+    conn.close()
+    counts = common.count_by_status(db_path)
+    os.unlink(db_path)
+    shutil.rmtree(data_dir)
+    # La espera incluye el arranque del runner: toda la cola se encola antes
+    wait = common.percentiles([max(0.0, row[0]) for row in rows])
+    run = common.percentiles([row[1] for row in rows])
+    return {
+        "driver": "runner",
+        "scenario": "drain_queue",
+        "clients": args.runner_workers,
+        "requests": counts.get("completed", 0),
+        "requests_per_second": round(counts.get("completed", 0) / elapsed, 2),
+        **{f"{p}_ms": round(run[p] * 1000, 1) for p in ("p50", "p95", "p99") if p in run},
+        "queue_wait_p50_ms": round(wait.get("p50", 0) * 1000, 1),
+        "queue_wait_p99_ms": round(wait.get("p99", 0) * 1000, 1),
+        "errors": args.queue - counts.get("completed", 0),
+        "statuses": counts,
+    }
+
+
+def metadata(args) -> Dict[str, Any]:
+    def git(*command) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *command], cwd=common.ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "date": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("baseline", "output")},
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Diferencia relativa por (driver, escenario): throughput y percentiles.
+    Es regresión si el throughput baja o el p95 sube más de `threshold`.
+    """
+    previous = {(r["driver"], r["scenario"]): r for r in baseline}
+    rows = []
+    for current in results:
+        base = previous.get((current["driver"], current["scenario"]))
+        if base is None:
+            continue
+        row = {"driver": current["driver"], "scenario": current["scenario"]}
+        for key in ("requests_per_second", "p50_ms", "p95_ms", "p99_ms"):
+            if base.get(key) and key in current:
+                row[f"{key}_change"] = round(current[key] / base[key] - 1, 3)
+        row["regression"] = (
+            row.get("requests_per_second_change", 0) < -threshold or row.get("p95_ms_change", 0) > threshold
+        )
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--robots", type=int, default=3, help="Robots por usuario")
+    parser.add_argument("--simulations", type=int, default=20, help="Simulaciones por robot")
+    parser.add_argument("--logs", type=int, default=200, help="Logs por simulación iniciada")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--drivers", nargs="+", default=DRIVERS, choices=DRIVERS)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--queue", type=int, default=200, help="Simulaciones de la cola del runner; 0 omite el runner")
+    parser.add_argument("--runner-workers", type=int, default=4)
+    parser.add_argument("--time-scale", type=float, default=0.002)
+    parser.add_argument("--runner-timeout", type=float, default=300)
+    parser.add_argument("--baseline", help="Reporte anterior contra el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Cambio relativo que cuenta como regresión")
+    parser.add_argument("--output", help="Guardar además el reporte en este archivo")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = []
+    for driver in args.drivers:
+        # Base nueva por driver: los escenarios de escritura no se acumulan entre drivers
+        db_path = common.create_database()
+        synthetic_data.seed_database(
+            db_path, args.users, args.robots, args.simulations, args.logs, args.seed, args.bcrypt_rounds
+        )
+        results.extend(run_api(driver, db_path, args))
+    if args.queue:
+        results.append(run_runner(args))
+
+    summary = {"meta": metadata(args), "results": results}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        summary["baseline"] = baseline["meta"]
+        # Solo tiene sentido comparar reportes con los mismos datos y carga
+        ignored = ("threshold", "runner_timeout")
+        summary["comparable"] = all(
+            baseline["meta"]["parameters"].get(k) == v
+            for k, v in summary["meta"]["parameters"].items() if k not in ignored
+        )
+        summary["comparison"] = compare(results, baseline["results"], args.threshold)
+    common.report("suite", summary, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de throughput del runner en función del número de workers.
+Ejecuta el mismo lote de simulaciones con 1, 2, 4 y 8 workers y reporta
+simulaciones/minuto.
+
+    python benchmarks/bench_worker_pool.py --jobs 32 --time-scale 0.02
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+
+import common
+
+common.use_runner()
+
+
+def run_once(workers: int, jobs: int, time_scale: float) -> dict:
+    db_path = common.create_database()
+    common.insert_pending_simulations(db_path, jobs)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["RUNNER_WORKERS"] = str(workers)
+    os.environ["RUNNER_POLL_INTERVAL"] = "0.2"
+    os.environ["SIMULATION_TIME_SCALE"] = str(time_scale)
+    # Motor dummy: el benchmark mide el runner, no el entrenamiento
+    os.environ["RUNNER_ENGINE"] = "dummy"
+
+    from simulation_runner import SimulationRunner
+
+    runner = SimulationRunner()
+    thread = threading.Thread(target=runner.run, daemon=True)
+    started = time.perf_counter()
+    thread.start()
+    while common.count_by_status(db_path).get("completed", 0) < jobs:
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    runner.stop()
+    thread.join()
+    os.unlink(db_path)
+    return {
+        "workers": workers,
+        "jobs": jobs,
+        "seconds": round(elapsed, 3),
+        "jobs_per_minute": round(jobs / elapsed * 60, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--time-scale", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = [run_once(w, args.jobs, args.time_scale) for w in args.workers]
+    baseline = results[0]["jobs_per_minute"]
+    for r in results:
+        r["speedup"] = round(r["jobs_per_minute"] / baseline, 2)
+    common.report("worker_pool_throughput", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Utilidades compartidas por los benchmarks.
+Los benchmarks se ejecutan desde la raíz del repositorio, p. ej.:
+    python benchmarks/bench_worker_pool.py
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, "backend")
+RUNNER_DIR = os.path.join(ROOT, "simulation-runner")
+SHARED_DIR = os.path.join(ROOT, "shared")
+
+
+def _use_shared():
+    # En las imágenes los módulos de shared/ se copian junto a los del servicio
+    if SHARED_DIR not in sys.path:
+        sys.path.append(SHARED_DIR)
+
+
+def use_runner():
+    """Hacer importables los módulos del simulation-runner"""
+    if RUNNER_DIR not in sys.path:
+        sys.path.insert(0, RUNNER_DIR)
+    _use_shared()
+
+
+def use_backend():
+    """Hacer importables los módulos del backend"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    _use_shared()
+
+
+def schema_sql() -> str:
+    """SQL de creación de tablas tomado de init_db.sh (fuente única del esquema)"""
+    with open(os.path.join(ROOT, "init_db.sh")) as f:
+        script = f.read()
+    start = script.index("<< 'EOF'") + len("<< 'EOF'")
+    end = script.index("\nEOF", start)
+    return script[start:end]
+
+
+def create_database(path: str = None) -> str:
+    """Crear una base SQLite temporal con el esquema y datos demo"""
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="bench_")
+        os.close(fd)
+        os.unlink(path)
+    conn = sqlite3.connect(path)
+    conn.executescript(schema_sql())
+    conn.commit()
+    conn.close()
+    return path
+
+
+def insert_pending_simulations(path: str, count: int, user_id: int = 1, robot_id: int = 1) -> List[int]:
+    """Insertar `count` simulaciones pendientes y devolver sus ids"""
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    ids = []
+    for i in range(count):
+        cursor.execute(
+            "INSERT INTO simulations (robot_id, user_id, name, status, parameters) VALUES (?, ?, ?, 'pending', ?)",
+            (robot_id, user_id, f"bench-{i}", json.dumps({"episodes": 10})),
+        )
+        ids.append(cursor.lastrowid)
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def create_database_url(url: Optional[str] = None) -> str:
+    """
+    URL de una base lista para benchmarks: SQLite temporal si no se indica,
+    o el esquema del backend recreado desde cero en `url` (p. ej. PostgreSQL).
+    """
+    if url is None:
+        return f"sqlite:///{create_database()}"
+
+    from sqlalchemy import create_engine, text
+
+    use_backend()
+    from models import Base
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (username, email, password_hash, is_active) "
+            "VALUES ('demo_user', 'demo@example.com', 'demo_password_hash', true)"
+        ))
+        conn.execute(text(
+            "INSERT INTO robots (name, robot_type, user_id, status) VALUES ('Demo Robot', 'mobile_robot', 1, 'idle')"
+        ))
+    engine.dispose()
+    return url
+
+
+def execute_sql(url: str, query: str, params: Optional[List[Dict[str, Any]]] = None) -> List[tuple]:
+    """Ejecutar SQL con parámetros con nombre en cualquier motor y devolver las filas"""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(url)
+    try:
+        with engine.begin() as conn:
+            result = conn.execute(text(query), params or {})
+            return [tuple(row) for row in result] if result.returns_rows else []
+    finally:
+        engine.dispose()
+
+
+def count_by_status(path: str) -> Dict[str, int]:
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT status, COUNT(*) FROM simulations GROUP BY status").fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 y media de una lista de muestras (segundos)"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def report(name: str, results: Any, output: Optional[str] = None):
+    """Emitir el resultado del benchmark como JSON en stdout (y en `output` si se indica)"""
+    text = json.dumps({"benchmark": name, "results": results}, indent=2, default=str)
+    print(text)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+
+
+class BackendServer:
+    """
+    Levanta el backend FastAPI con uvicorn en un subproceso sobre una base
+    temporal, para que los clientes del benchmark no compitan por el GIL con
+    el servidor. `env` se suma al entorno del subproceso.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, env: Optional[Dict[str, str]] = None):
+        self.db_path = db_path or create_database()
+        self.env = env or {}
+        self.process = None
+        self.url = None
+
+    def __enter__(self) -> "BackendServer":
+        import urllib.request
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        env = dict(os.environ)
+        env.update({"DATABASE_URL": f"sqlite:///{self.db_path}", "NOTIFY_BACKEND": "none", "PYTHONPATH": SHARED_DIR})
+        env.update(self.env)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        self.url = f"http://127.0.0.1:{port}"
+        deadline = time.time() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f"{self.url}/health", timeout=1)
+                break
+            except OSError:
+                if time.time() > deadline or self.process.poll() is not None:
+                    self.process.kill()
+                    raise RuntimeError("El backend no arrancó")
+                time.sleep(0.1)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait(10)
+
+
+def register_and_login(client, email: str = "bench@example.com", password: str = "bench-password") -> Dict[str, str]:
+    """Registrar un usuario (si no existe) y devolver cabeceras con su token"""
+    client.post("/auth/register", json={"username": email.split("@")[0], "email": email, "password": password})
+    token = client.post("/auth/login", json={"email": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,167 @@
+"""
+Generador de datos sintéticos para los benchmarks.
+Crea una base SQLite con el esquema de init_db.sh y la llena con usuarios,
+robots, simulaciones (en todos los estados) y logs de entrenamiento de forma
+determinista: la misma semilla produce la misma base, así los reportes de
+dos commits se comparan sobre los mismos datos.
+
+Todos los usuarios comparten la contraseña PASSWORD para que los escenarios
+de login puedan autenticarse; su hash usa `--bcrypt-rounds` (4 por defecto,
+el costo del login se mide aparte en bench_login_storm.py).
+
+    python benchmarks/synthetic_data.py --db /tmp/bench.db --users 50 --simulations 20 --logs 200
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import common
+
+PASSWORD = "bench-password"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+ROBOT_TYPES = ["mobile_robot", "manipulator", "drone"]
+LOG_LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARNING"]
+# Reparto de estados de las simulaciones sembradas
+STATUS_WEIGHTS = {"completed": 0.7, "failed": 0.1, "running": 0.05, "pending": 0.15}
+
+
+def email(user_index: int) -> str:
+    return f"user{user_index}@bench.example.com"
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def _password_hash(rounds: int) -> str:
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(PASSWORD)
+
+
+def _results(rng: random.Random) -> Dict[str, Any]:
+    """Resultados con la forma de los del motor dummy"""
+    return {
+        "training_duration": rng.uniform(30, 120),
+        "accuracy": rng.uniform(0.75, 0.98),
+        "loss": rng.uniform(0.01, 0.25),
+        "iterations": rng.randint(100, 1000),
+        "success_rate": rng.uniform(0.85, 0.99),
+        "metrics": {
+            "precision": rng.uniform(0.80, 0.95),
+            "recall": rng.uniform(0.75, 0.90),
+            "f1_score": rng.uniform(0.80, 0.92),
+        },
+    }
+
+
+def seed_database(
+    path: str,
+    users: int = 10,
+    robots_per_user: int = 3,
+    simulations_per_robot: int = 10,
+    logs_per_simulation: int = 100,
+    seed: int = 42,
+    bcrypt_rounds: int = 4,
+) -> Dict[str, int]:
+    """
+    Crear `path` (si no existe) y sembrarlo. Los usuarios sembrados se
+    numeran desde 0 con `email(i)`; el usuario demo de init_db.sh queda con
+    id 1. Devuelve el número de filas de cada tabla.
+    """
+    rng = random.Random(seed)
+    common.create_database(path)
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    start = datetime(2024, 1, 1)
+    password_hash = _password_hash(bcrypt_rounds)
+
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            user_ids = []
+            for i in range(users):
+                cursor = conn.execute(
+                    "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                    (f"user{i}", email(i), password_hash),
+                )
+                user_ids.append(cursor.lastrowid)
+
+            robots = []
+            for user_id in user_ids:
+                for r in range(robots_per_user):
+                    cursor = conn.execute(
+                        "INSERT INTO robots (user_id, name, robot_type, configuration) VALUES (?, ?, ?, ?)",
+                        (user_id, f"robot-{user_id}-{r}", rng.choice(ROBOT_TYPES),
+                         json.dumps({"sensors": ["camera", "lidar"], "max_speed": rng.uniform(0.5, 2.0)})),
+                    )
+                    robots.append((cursor.lastrowid, user_id))
+
+            logs = 0
+            simulations = 0
+            for robot_id, user_id in robots:
+                for s in range(simulations_per_robot):
+                    status = rng.choices(statuses, weights)[0]
+                    created = start + timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+                    started = created + timedelta(seconds=rng.randint(1, 600)) if status != "pending" else None
+                    completed = (
+                        started + timedelta(seconds=rng.randint(30, 3600))
+                        if status in ("completed", "failed") else None
+                    )
+                    cursor = conn.execute(
+                        "INSERT INTO simulations (robot_id, user_id, name, status, parameters, results, "
+                        "started_at, completed_at, created_at, updated_at, priority) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            robot_id, user_id, f"sim-{robot_id}-{s}", status,
+                            json.dumps({"episodes": rng.randint(5, 50), "lr": rng.choice([1e-4, 3e-4, 1e-3])}),
+                            json.dumps(_results(rng)) if status == "completed" else None,
+                            _timestamp(started) if started else None,
+                            _timestamp(completed) if completed else None,
+                            _timestamp(created),
+                            _timestamp(completed or started or created),
+                            rng.randint(0, 2),
+                        ),
+                    )
+                    simulations += 1
+                    if started is None:
+                        continue
+                    simulation_id = cursor.lastrowid
+                    conn.executemany(
+                        "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            (simulation_id, robot_id, user_id, rng.choice(LOG_LEVELS),
+                             f"[{i * 100 // logs_per_simulation}%] Iteración {i}: loss {rng.uniform(0.01, 1):.6f}",
+                             _timestamp(started + timedelta(seconds=i)))
+                            for i in range(logs_per_simulation)
+                        ),
+                    )
+                    logs += logs_per_simulation
+    finally:
+        conn.close()
+    return {"users": users, "robots": len(robots), "simulations": simulations, "training_logs": logs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="Ruta de la base SQLite a crear")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--robots", type=int, default=3, help="Robots por usuario")
+    parser.add_argument("--simulations", type=int, default=10, help="Simulaciones por robot")
+    parser.add_argument("--logs", type=int, default=100, help="Logs por simulación iniciada")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4)
+    args = parser.parse_args()
+    counts = seed_database(
+        args.db, args.users, args.robots, args.simulations, args.logs, args.seed, args.bcrypt_rounds
+    )
+    common.report("synthetic_data", {"db": args.db, "seed": args.seed, **counts})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
@@ -16,6 +16,10 @@ export default function Home() {
   const [robotForm, setRobotForm] = useState({ name: '', robot_type: '', configuration: '' });
   const [simulationForm, setSimulationForm] = useState({ name: '', robot_id: '', parameters: '' });
 
+  // Logs en vivo de la simulación seleccionada
+  const [logView, setLogView] = useState({ simulationId: null, logs: [] });
+  const logStreamRef = useRef(null);
+
   // Configurar axios con interceptor para token
   useEffect(() => {
     if (token) {
@@ -41,8 +45,65 @@ export default function Home() {
     }
   };
 
+  // Dejar de recibir logs en vivo
+  const stopLogStream = () => {
+    if (logStreamRef.current) {
+      logStreamRef.current.abort();
+      logStreamRef.current = null;
+    }
+  };
+
+  // Recibir logs nuevos por Server-Sent Events; reconecta desde el último id recibido
+  const streamLogs = async (simulationId) => {
+    stopLogStream();
+    const controller = new AbortController();
+    logStreamRef.current = controller;
+    setLogView({ simulationId, logs: [] });
+
+    let cursor = 0;
+    let finished = false;
+    while (!finished && !controller.signal.aborted) {
+      try {
+        const response = await fetch(
+          `${API_BASE_URL}/simulations/${simulationId}/logs/stream?cursor=${cursor}`,
+          { headers: { Authorization: `Bearer ${token}` }, signal: controller.signal }
+        );
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const events = buffer.split('\n\n');
+          buffer = events.pop();
+          for (const event of events) {
+            const lines = event.split('\n');
+            const type = lines.find((l) => l.startsWith('event: '))?.slice(7);
+            const data = lines.find((l) => l.startsWith('data: '))?.slice(6);
+            if (type === 'log') {
+              const log = JSON.parse(data);
+              cursor = log.id;
+              setLogView((view) => ({ ...view, logs: [...view.logs, log] }));
+            } else if (type === 'end') {
+              finished = true;
+            }
+          }
+        }
+      } catch (err) {
+        if (controller.signal.aborted) return;
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+      }
+    }
+    if (finished) {
+      await fetchUserData();
+    }
+  };
+
   // Función de logout
   const handleLogout = () => {
+    stopLogStream();
+    setLogView({ simulationId: null, logs: [] });
     setToken('');
     setUser(null);
     setRobots([]);
@@ -314,6 +375,17 @@ export default function Home() {
                         <p>Accuracy: {(JSON.parse(simulation.results).accuracy * 100).toFixed(1)}%</p>
                       </div>
                     )}
+                    <button
+                      onClick={() => streamLogs(simulation.id)}
+                      className="mt-2 ml-2 bg-gray-600 text-white px-3 py-1 rounded text-sm hover:bg-gray-700"
+                    >
+                      Ver logs
+                    </button>
+                    {logView.simulationId === simulation.id && (
+                      <pre className="mt-2 max-h-48 overflow-y-auto bg-gray-900 text-green-200 text-xs p-2 rounded">
+                        {logView.logs.map((log) => `[${log.log_level}] ${log.message}`).join('\n')}
+                      </pre>
+                    )}
                   </div>
                 ))}
               </div>
@@ -7,6 +7,13 @@ mkdir -p /data
 
 # Crear base de datos SQLite
 sqlite3 /data/robot_training.db << 'EOF'
+-- auto_vacuum solo se puede fijar antes de crear tablas: permite devolver al
+-- sistema el espacio de los logs borrados con PRAGMA incremental_vacuum
+PRAGMA auto_vacuum = INCREMENTAL;
+
+-- WAL queda guardado en el archivo: lectores y escritores no se bloquean entre sí
+PRAGMA journal_mode = WAL;
+
 -- Tabla de usuarios
 CREATE TABLE IF NOT EXISTS users (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -14,6 +21,7 @@ CREATE TABLE IF NOT EXISTS users (
     email VARCHAR(100) UNIQUE NOT NULL,
     password_hash VARCHAR(255) NOT NULL,
     is_active BOOLEAN DEFAULT TRUE,
+    data_version INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -44,6 +52,18 @@ CREATE TABLE IF NOT EXISTS simulations (
     completed_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    worker_id VARCHAR(100),
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    sweep_id VARCHAR(36),
+    priority INTEGER DEFAULT 0,
+    checkpoint_path VARCHAR(255),
+    checkpointed_at TIMESTAMP,
+    attempts INTEGER DEFAULT 0,
+    logs_archive_path VARCHAR(255),
+    logs_archived_at TIMESTAMP,
+    use_result_cache BOOLEAN NOT NULL DEFAULT TRUE,
+    result_cache_hit BOOLEAN NOT NULL DEFAULT FALSE,
     FOREIGN KEY (robot_id) REFERENCES robots (id),
     FOREIGN KEY (user_id) REFERENCES users (id)
 );
@@ -62,6 +82,17 @@ CREATE TABLE IF NOT EXISTS training_logs (
     FOREIGN KEY (user_id) REFERENCES users (id)
 );
 
+-- Resultados memoizados de simulaciones reproducibles (ver result_cache.py)
+CREATE TABLE IF NOT EXISTS simulation_result_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    engine VARCHAR(50) NOT NULL,
+    results JSON NOT NULL,
+    simulation_id INTEGER,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Insertar usuario demo (password: demo123)
 INSERT OR IGNORE INTO users (username, email, password_hash) 
 VALUES ('demo_user', 'demo@example.com', 'demo123');
@@ -75,6 +106,15 @@ CREATE INDEX IF NOT EXISTS idx_robots_user_id ON robots(user_id);
 CREATE INDEX IF NOT EXISTS idx_simulations_robot_id ON simulations(robot_id);
 CREATE INDEX IF NOT EXISTS idx_simulations_user_id ON simulations(user_id);
 CREATE INDEX IF NOT EXISTS idx_training_logs_simulation_id ON training_logs(simulation_id);
+CREATE INDEX IF NOT EXISTS idx_simulations_status_created_at ON simulations(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_simulations_status_lease ON simulations(status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_simulations_user_status_created_at ON simulations(user_id, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_simulations_user_created_at ON simulations(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_simulations_sweep_status ON simulations(sweep_id, status);
+CREATE INDEX IF NOT EXISTS idx_simulations_queue ON simulations(status, user_id, priority DESC, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_training_logs_simulation_timestamp ON training_logs(simulation_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_training_logs_level_timestamp ON training_logs(log_level, timestamp);
+CREATE INDEX IF NOT EXISTS idx_simulation_result_cache_last_used_at ON simulation_result_cache(last_used_at);
 
 EOF
 
@@ -0,0 +1,151 @@
+"""
+Métricas en formato Prometheus para el backend y el runner.
+Se activan con PROMETHEUS_ENABLED=1 (requiere `prometheus_client`). Sin
+activar, cada métrica es un objeto nulo cuyos métodos no hacen nada y los
+hooks (eventos de SQLAlchemy, middleware HTTP) ni siquiera se registran,
+así el costo en los caminos calientes es una llamada vacía.
+
+Los valores que ya existen en otra parte (tamaño de la cola, estadísticas de
+las caches, conexiones del pool) no se mantienen en cada operación: se leen
+al momento del scrape con `register_callback`.
+
+Con varios workers de uvicorn cada proceso tiene su propio registro.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Sequence, Tuple
+
+try:
+    import prometheus_client
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # pragma: no cover - dependencia opcional
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("PROMETHEUS_ENABLED", "0").lower() in ("1", "true", "yes")
+if ENABLED and prometheus_client is None:
+    logger.warning("PROMETHEUS_ENABLED requiere el paquete `prometheus_client`; métricas desactivadas")
+    ENABLED = False
+
+# Segundos: de consultas por índice (~100 µs) a simulaciones largas
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+# (tipo, nombre, descripción, etiquetas, valor); tipo "counter" o "gauge"
+Sample = Tuple[str, str, str, Dict[str, Any], float]
+
+
+class _NullMetric:
+    def labels(self, *args, **kwargs) -> "_NullMetric":
+        return self
+
+    def observe(self, value: float):
+        pass
+
+    def inc(self, value: float = 1):
+        pass
+
+    def dec(self, value: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+
+NULL_METRIC = _NullMetric()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    return prometheus_client.Counter(name, documentation, labelnames) if ENABLED else NULL_METRIC
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()):
+    return prometheus_client.Gauge(name, documentation, labelnames) if ENABLED else NULL_METRIC
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+    if not ENABLED:
+        return NULL_METRIC
+    return prometheus_client.Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+class _CallbackCollector:
+    def __init__(self, callback: Callable[[], Iterable[Sample]]):
+        self.callback = callback
+
+    def collect(self):
+        families = {}
+        try:
+            samples = list(self.callback())
+        except Exception as e:
+            logger.warning(f"Error leyendo métricas de {self.callback.__name__}: {e}")
+            return []
+        for kind, name, documentation, labels, value in samples:
+            family = families.get(name)
+            if family is None:
+                family_class = CounterMetricFamily if kind == "counter" else GaugeMetricFamily
+                family = families[name] = family_class(name, documentation, labels=list(labels))
+            family.add_metric([str(label) for label in labels.values()], value)
+        return list(families.values())
+
+
+def register_callback(callback: Callable[[], Iterable[Sample]]):
+    """Registrar una función que produce muestras al momento del scrape"""
+    if ENABLED:
+        prometheus_client.REGISTRY.register(_CallbackCollector(callback))
+
+
+def cache_samples(name: str, stats: Dict[str, Any]) -> Iterable[Sample]:
+    """Muestras de una cache a partir de su `stats()` (hits, misses, evictions, size)"""
+    labels = {"cache": name}
+    yield "counter", "cache_hits", "Lecturas servidas desde la cache", labels, stats["hits"]
+    yield "counter", "cache_misses", "Lecturas que no encontraron la entrada en la cache", labels, stats["misses"]
+    yield "counter", "cache_evictions", "Entradas descartadas por tamaño", labels, stats.get("evictions", 0)
+    yield "gauge", "cache_entries", "Entradas en la cache", labels, stats["size"]
+
+
+def render() -> Tuple[bytes, str]:
+    """Exposición de texto del registro y su content type"""
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def start_http_server(port: int, addr: str = "0.0.0.0"):
+    """Servir /metrics en un hilo propio (para procesos sin servidor HTTP, como el runner)"""
+    prometheus_client.start_http_server(port, addr)
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI: latencia de cada petición HTTP por método, plantilla de
+    ruta (p. ej. /simulations/{simulation_id}, no la URL, para acotar las
+    series) y código de estado. En respuestas en streaming mide hasta el
+    final del stream.
+    """
+
+    def __init__(self, app, histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.histogram.labels(scope["method"], route, str(status[0])).observe(time.perf_counter() - started)
@@ -0,0 +1,85 @@
+"""
+Archivos de logs de simulaciones terminadas.
+El runner mueve los `training_logs` de cada simulación completada a un
+archivo JSONL comprimido (una fila por línea, en orden de id) y el backend
+los sirve desde ahí de forma transparente. El códec se elige por extensión:
+`.jsonl.gz` (gzip, biblioteca estándar) o `.jsonl.zst` (zstd, requiere el
+paquete opcional `zstandard`).
+
+Cada archivo se escribe con un nombre temporal y se publica con un rename,
+así nunca se lee uno a medio escribir.
+"""
+
+import gzip
+import io
+import json
+import os
+import uuid
+from typing import Any, Dict, Iterable, Iterator, Mapping, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("El códec zstd requiere el paquete `zstandard`")
+
+
+class LogArchive:
+    def __init__(self, root: str, codec: str = "gzip"):
+        if codec not in EXTENSIONS:
+            raise ValueError(f"Códec de archivo de logs desconocido: {codec}")
+        if codec == "zstd":
+            _require_zstandard()
+        self.root = root
+        self.codec = codec
+
+    def write(self, simulation_id: int, rows: Iterable[Mapping[str, Any]]) -> Tuple[str, int]:
+        """Escribir `rows` en un archivo nuevo; devuelve (ruta, filas escritas)"""
+        os.makedirs(self.root, exist_ok=True)
+        name = f"{simulation_id}-{uuid.uuid4().hex[:8]}{EXTENSIONS[self.codec]}"
+        path = os.path.join(self.root, name)
+        tmp = os.path.join(self.root, f".tmp-{name}")
+        count = 0
+        try:
+            with open(tmp, "wb") as raw:
+                if self.codec == "zstd":
+                    compressed = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+                else:
+                    compressed = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+                with io.TextIOWrapper(compressed, encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(dict(row), default=str, separators=(",", ":")))
+                        f.write("\n")
+                        count += 1
+            os.rename(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path, count
+
+    @staticmethod
+    def read(path: str) -> Iterator[Dict[str, Any]]:
+        """Filas de un archivo en orden de id"""
+        if path.endswith(EXTENSIONS["zstd"]):
+            _require_zstandard()
+            raw = open(path, "rb")
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = gzip.open(path, "rb")
+        with io.TextIOWrapper(stream, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    @staticmethod
+    def delete(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
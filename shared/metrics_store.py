@@ -0,0 +1,210 @@
+"""
+Almacén columnar de métricas de entrenamiento (step, nombre, valor).
+Cada serie vive en el volumen de datos como dos columnas append-only:
+
+    <root>/<simulation_id>/<nombre>.step    int64 little-endian
+    <root>/<simulation_id>/<nombre>.value   float64 little-endian
+
+El runner añade los puntos por lotes (una escritura por columna y métrica);
+el backend abre las columnas memory-mapped, sin parsear texto, y las reduce
+con LTTB o min/max por buckets antes de serializarlas. Los steps de una
+serie son crecientes. Un lector que coincide con una escritura a medias usa
+la longitud común de ambas columnas.
+"""
+
+import os
+import re
+import shutil
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+STEP_DTYPE = np.dtype("<i8")
+VALUE_DTYPE = np.dtype("<f8")
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}$")
+
+# (step, nombre, valor)
+MetricPoint = Tuple[int, str, float]
+Series = Tuple[np.ndarray, np.ndarray]
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def valid_name(name: str) -> bool:
+    return bool(NAME_PATTERN.match(name))
+
+
+class MetricsStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def _simulation_dir(self, simulation_id: int) -> str:
+        return os.path.join(self.root, str(simulation_id))
+
+    def _paths(self, simulation_id: int, name: str) -> Tuple[str, str]:
+        base = os.path.join(self._simulation_dir(simulation_id), name)
+        return base + ".step", base + ".value"
+
+    def append(self, simulation_id: int, points: Iterable[MetricPoint]) -> int:
+        """Añadir un lote de puntos; devuelve cuántos se escribieron"""
+        series: Dict[str, Tuple[List[int], List[float]]] = {}
+        for step, name, value in points:
+            if not valid_name(name):
+                raise ValueError(f"Nombre de métrica inválido: {name!r}")
+            steps, values = series.setdefault(name, ([], []))
+            steps.append(step)
+            values.append(value)
+        if not series:
+            return 0
+
+        os.makedirs(self._simulation_dir(simulation_id), exist_ok=True)
+        for name, (steps, values) in series.items():
+            step_path, value_path = self._paths(simulation_id, name)
+            # Valores primero: un lector nunca ve un step sin su valor
+            with open(value_path, "ab") as f:
+                f.write(np.asarray(values, dtype=VALUE_DTYPE).tobytes())
+            with open(step_path, "ab") as f:
+                f.write(np.asarray(steps, dtype=STEP_DTYPE).tobytes())
+        return sum(len(steps) for steps, _ in series.values())
+
+    def names(self, simulation_id: int) -> List[str]:
+        directory = self._simulation_dir(simulation_id)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-len(".step")] for name in os.listdir(directory) if name.endswith(".step"))
+
+    def length(self, simulation_id: int, name: str) -> int:
+        """Puntos completos de una serie (0 si no existe)"""
+        try:
+            step_path, value_path = self._paths(simulation_id, name)
+            return min(
+                os.path.getsize(step_path) // STEP_DTYPE.itemsize,
+                os.path.getsize(value_path) // VALUE_DTYPE.itemsize,
+            )
+        except OSError:
+            return 0
+
+    def lengths(self, simulation_id: int) -> Dict[str, int]:
+        return {name: self.length(simulation_id, name) for name in self.names(simulation_id)}
+
+    def truncate(self, simulation_id: int, lengths: Dict[str, int]):
+        """Recortar las series a `lengths` (p. ej. al reanudar desde un checkpoint)"""
+        for name in self.names(simulation_id):
+            step_path, value_path = self._paths(simulation_id, name)
+            keep = lengths.get(name, 0)
+            if keep == 0:
+                os.remove(step_path)
+                os.remove(value_path)
+                continue
+            os.truncate(step_path, keep * STEP_DTYPE.itemsize)
+            os.truncate(value_path, keep * VALUE_DTYPE.itemsize)
+
+    def read(
+        self,
+        simulation_id: int,
+        name: str,
+        start_step: Optional[int] = None,
+        end_step: Optional[int] = None,
+    ) -> Series:
+        """Serie completa o el rango [start_step, end_step], memory-mapped"""
+        n = self.length(simulation_id, name)
+        if n == 0:
+            return np.empty(0, dtype=STEP_DTYPE), np.empty(0, dtype=VALUE_DTYPE)
+        step_path, value_path = self._paths(simulation_id, name)
+        steps = np.memmap(step_path, dtype=STEP_DTYPE, mode="r", shape=(n,))
+        values = np.memmap(value_path, dtype=VALUE_DTYPE, mode="r", shape=(n,))
+        lo = 0 if start_step is None else int(np.searchsorted(steps, start_step, side="left"))
+        hi = n if end_step is None else int(np.searchsorted(steps, end_step, side="right"))
+        return steps[lo:hi], values[lo:hi]
+
+    def delete(self, simulation_id: int):
+        shutil.rmtree(self._simulation_dir(simulation_id), ignore_errors=True)
+
+    def copy(self, source_id: int, target_id: int) -> bool:
+        """Reemplazar las series de `target_id` por una copia de las de `source_id`"""
+        source = self._simulation_dir(source_id)
+        if not os.path.isdir(source):
+            return False
+        self.delete(target_id)
+        shutil.copytree(source, self._simulation_dir(target_id))
+        return True
+
+
+class MetricsBuffer:
+    """Puntos pendientes de una simulación; se escriben por lotes por tamaño o por tiempo"""
+
+    def __init__(self, store: MetricsStore, simulation_id: int, flush_points: int = 1000, flush_interval: float = 1.0):
+        self.store = store
+        self.simulation_id = simulation_id
+        self.flush_points = flush_points
+        self.flush_interval = flush_interval
+        self.points: List[MetricPoint] = []
+        self.written = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, points: Iterable[MetricPoint]):
+        self.points.extend(points)
+        if len(self.points) >= self.flush_points or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.points:
+            self.written += self.store.append(self.simulation_id, self.points)
+            self.points = []
+        self._last_flush = time.monotonic()
+
+
+def lttb(steps: np.ndarray, values: np.ndarray, threshold: int) -> Series:
+    """
+    Largest-Triangle-Three-Buckets: conserva la forma visual de la serie con
+    `threshold` puntos. Siempre incluye el primero y el último.
+    """
+    n = len(steps)
+    if threshold >= n or threshold < 3:
+        return steps, values
+    x = np.asarray(steps, dtype=np.float64)
+    y = np.asarray(values, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(area)) if not np.isnan(area).all() else start
+        selected[i + 1] = a
+    return steps[selected], values[selected]
+
+
+def minmax(steps: np.ndarray, values: np.ndarray, buckets: int) -> Series:
+    """Mínimo y máximo de cada bucket, en orden: conserva los picos de la serie"""
+    n = len(steps)
+    if buckets < 1 or n <= 2 * buckets:
+        return steps, values
+    starts = (np.arange(buckets, dtype=np.int64) * n + buckets - 1) // buckets
+    bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+    values = np.asarray(values)
+    selected = []
+    for reduce, fill in ((np.minimum, np.inf), (np.maximum, -np.inf)):
+        # NaN no es ni mínimo ni máximo de nada
+        clean = np.where(np.isnan(values), fill, values)
+        extreme = reduce.reduceat(clean, starts)
+        hits = np.flatnonzero(clean == extreme[bucket])
+        # Primer punto de cada bucket que alcanza su extremo
+        selected.append(hits[np.searchsorted(hits, starts)])
+    selected = np.unique(np.concatenate(selected))
+    return steps[selected], values[selected]
+
+
+def downsample(steps: np.ndarray, values: np.ndarray, max_points: int, method: str = "lttb") -> Series:
+    """Reducir la serie a como mucho `max_points` puntos"""
+    if method == "minmax":
+        return minmax(steps, values, max_points // 2)
+    if method == "lttb":
+        return lttb(steps, values, max_points)
+    raise ValueError(f"Método de reducción desconocido: {method}")
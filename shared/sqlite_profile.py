@@ -0,0 +1,94 @@
+"""
+Perfil de conexión SQLite compartido por el backend y el runner.
+Ambos servicios escriben en el mismo archivo del volumen de datos; con el
+journal por defecto (rollback) un escritor bloquea a todos los lectores y las
+colisiones entre escritores fallan al instante con "database is locked".
+El perfil aplica en cada conexión nueva:
+- journal_mode=WAL: los lectores no bloquean al escritor ni viceversa
+- synchronous=NORMAL: fsync solo en checkpoints (seguro con WAL)
+- busy_timeout: esperar al otro escritor en lugar de fallar
+- mmap_size / cache_size: lecturas desde memoria mapeada y cache de páginas mayor
+- auto_vacuum=INCREMENTAL: las páginas liberadas por los borrados de logs se
+  devuelven con `PRAGMA incremental_vacuum` (log_retention.py). Solo surte
+  efecto en bases nuevas; una existente necesita un VACUUM una vez
+
+Una variable vacía omite su pragma (p. ej. SQLITE_JOURNAL_MODE= deja el
+journal por defecto).
+"""
+
+import os
+from typing import List, Optional
+
+
+def _env(name: str, default: str) -> Optional[str]:
+    value = os.getenv(name, default).strip()
+    return value or None
+
+
+class SQLiteProfile:
+    def __init__(
+        self,
+        journal_mode: Optional[str] = "wal",
+        synchronous: Optional[str] = "normal",
+        busy_timeout_ms: Optional[int] = 5000,
+        mmap_size: Optional[int] = 268435456,
+        cache_size: Optional[int] = -65536,
+        auto_vacuum: Optional[str] = "incremental",
+    ):
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        # Negativo = KiB (-65536 son 64 MiB por conexión); positivo = páginas
+        self.cache_size = cache_size
+        self.auto_vacuum = auto_vacuum
+
+    @classmethod
+    def from_env(cls) -> "SQLiteProfile":
+        def integer(name, default):
+            value = _env(name, default)
+            return int(value) if value is not None else None
+
+        return cls(
+            journal_mode=_env("SQLITE_JOURNAL_MODE", "wal"),
+            synchronous=_env("SQLITE_SYNCHRONOUS", "normal"),
+            busy_timeout_ms=integer("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+            mmap_size=integer("SQLITE_MMAP_SIZE", "268435456"),
+            cache_size=integer("SQLITE_CACHE_SIZE", "-65536"),
+            auto_vacuum=_env("SQLITE_AUTO_VACUUM", "incremental"),
+        )
+
+    @property
+    def timeout(self) -> float:
+        """Timeout en segundos para `sqlite3.connect` (5 s si no se configura)"""
+        return self.busy_timeout_ms / 1000 if self.busy_timeout_ms is not None else 5.0
+
+    def pragmas(self) -> List[str]:
+        # busy_timeout primero: el cambio a WAL necesita un lock exclusivo
+        statements = []
+        if self.busy_timeout_ms is not None:
+            statements.append(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        # auto_vacuum antes de WAL: en una base vacía solo se fija antes de crear tablas
+        if self.auto_vacuum:
+            statements.append(f"PRAGMA auto_vacuum = {self.auto_vacuum}")
+        if self.journal_mode:
+            statements.append(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous:
+            statements.append(f"PRAGMA synchronous = {self.synchronous}")
+        if self.mmap_size is not None:
+            statements.append(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.cache_size is not None:
+            statements.append(f"PRAGMA cache_size = {int(self.cache_size)}")
+        return statements
+
+    def apply(self, dbapi_connection):
+        """Aplicar los pragmas a una conexión DB-API (sqlite3 o aiosqlite adaptada)"""
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in self.pragmas():
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+profile = SQLiteProfile.from_env()
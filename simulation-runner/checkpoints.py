@@ -0,0 +1,82 @@
+"""
+Checkpoints del estado de los motores de entrenamiento.
+Cada checkpoint es un directorio con un `.npy` por array (formato binario
+compacto de NumPy) y un `meta.json` con el resto del estado. Se escribe en un
+directorio temporal y se publica con un rename atómico, así un runner que
+muere a mitad de escritura nunca deja un checkpoint corrupto. Los arrays
+grandes se cargan memory-mapped en lugar de leerse enteros.
+
+Estructura: <root>/<simulation_id>/ckpt-<n>/{meta.json, <array>.npy}
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class CheckpointStore:
+    def __init__(self, root: str, mmap_threshold: int = 1 << 20):
+        self.root = root
+        self.mmap_threshold = mmap_threshold
+        self.saved = 0
+        self.bytes_written = 0
+
+    def _simulation_dir(self, simulation_id: int) -> str:
+        return os.path.join(self.root, str(simulation_id))
+
+    def save(self, simulation_id: int, state: Dict[str, Any]) -> str:
+        """Guardar `state` y devolver la ruta del checkpoint publicado"""
+        directory = self._simulation_dir(simulation_id)
+        os.makedirs(directory, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=directory)
+        try:
+            meta = {"arrays": []}
+            for key, value in state.items():
+                if isinstance(value, np.ndarray):
+                    np.save(os.path.join(tmp, f"{key}.npy"), value, allow_pickle=False)
+                    meta["arrays"].append(key)
+                else:
+                    meta[key] = value
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+            path = os.path.join(directory, f"ckpt-{time.time_ns()}")
+            os.rename(tmp, path)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.saved += 1
+        self.bytes_written += size
+        return path
+
+    def load(self, path: str) -> Dict[str, Any]:
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        state = {key: value for key, value in meta.items() if key != "arrays"}
+        for key in meta["arrays"]:
+            file = os.path.join(path, f"{key}.npy")
+            mmap_mode = "r" if os.path.getsize(file) >= self.mmap_threshold else None
+            state[key] = np.load(file, mmap_mode=mmap_mode, allow_pickle=False)
+        return state
+
+    def prune(self, simulation_id: int, keep: Optional[str] = None):
+        """Borrar los checkpoints de la simulación salvo `keep`"""
+        directory = self._simulation_dir(simulation_id)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if keep is None or os.path.abspath(path) != os.path.abspath(keep):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def delete(self, simulation_id: int):
+        """Borrar todos los checkpoints de la simulación"""
+        shutil.rmtree(self._simulation_dir(simulation_id), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"saved": self.saved, "bytes_written": self.bytes_written}
@@ -0,0 +1,335 @@
+"""
+Motor de referencia: navegación punto a punto de un robot diferencial.
+Miles de entornos se simulan a la vez con NumPy (un paso de cinemática para
+todos los robots en cada operación vectorizada). El entrenamiento ajusta las
+ganancias de un controlador de navegación polar con el método de entropía
+cruzada (CEM): en cada iteración se evalúa una población de ganancias, cada
+candidato sobre su propio grupo de entornos, y la distribución se mueve hacia
+los mejores.
+
+Configuración del robot (`configuration`): wheel_base, wheel_radius,
+max_wheel_speed, sensor_noise.
+Parámetros de la simulación (`parameters`): num_envs, population, iterations,
+max_steps, dt, goal_tolerance, arena_size, elite_fraction, seed y
+rollout_workers (procesos entre los que se reparten los entornos, acotados a los
+núcleos y a RUNNER_MAX_ROLLOUT_WORKERS; ver rollouts.py).
+Métricas por iteración: best_cost, mean_cost, loss, success_rate y las
+ganancias medias; al final final_success_rate, final_accuracy y final_loss.
+Los resultados tienen las mismas claves que los del motor dummy; en
+`metrics`, precision, recall y f1_score miden el detector de llegada del
+robot (distancia observada con ruido por debajo de goal_tolerance) frente a
+la llegada real en la evaluación final.
+"""
+
+import os
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from engines import ProgressEvent, TrainingEngine, int_parameter, register_engine
+
+# Columnas del array de estado (un entorno por fila)
+X, Y, THETA, GOAL_X, GOAL_Y, START_DIST, DONE_STEP = range(7)
+STATE_COLUMNS = 7
+
+# Ganancias del controlador: k_rho (avance), k_alpha (giro hacia la meta), k_beta (orientación)
+GAIN_NAMES = ("k_rho", "k_alpha", "k_beta")
+INITIAL_GAINS = np.array([0.3, 0.5, 0.0])
+INITIAL_SIGMA = np.array([1.0, 2.0, 0.5])
+
+# Peso del tiempo empleado en el coste: llegar antes es mejor
+TIME_PENALTY = 0.5
+
+# Límites de los parámetros de tamaño: el array de estado ocupa
+# num_envs * STATE_COLUMNS floats y cada evaluación recorre max_steps pasos
+MAX_NUM_ENVS = 1 << 20
+MAX_POPULATION = 4096
+MAX_ITERATIONS = 10000
+MAX_STEPS = 10000
+
+
+def _rollout_workers(parameters: Dict[str, Any]) -> int:
+    """
+    Procesos de rollouts efectivos: los pedidos por la simulación (o
+    RUNNER_ROLLOUT_WORKERS) acotados a los núcleos del runner y a
+    RUNNER_MAX_ROLLOUT_WORKERS, y como mínimo uno. Cada proceso es un worker
+    con sus bloques de memoria compartida: un usuario no puede pedir cientos.
+    """
+    requested = int_parameter(parameters, "rollout_workers", os.getenv("RUNNER_ROLLOUT_WORKERS", "1"), minimum=None)
+    cpus = os.cpu_count() or 1
+    limit = int(os.getenv("RUNNER_MAX_ROLLOUT_WORKERS", "0")) or cpus
+    return max(1, min(requested, cpus, limit))
+
+
+def _wrap_angle(angle: np.ndarray) -> np.ndarray:
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+class DiffDriveEnv:
+    """
+    Lote de robots diferenciales. `state` puede ser un array externo (p. ej.
+    memoria compartida) de forma (n, STATE_COLUMNS); si no, se crea uno.
+    """
+
+    def __init__(self, n: int, config: Dict[str, Any], state: Optional[np.ndarray] = None):
+        self.n = n
+        self.wheel_base = float(config.get("wheel_base", 0.5))
+        self.wheel_radius = float(config.get("wheel_radius", 0.1))
+        self.max_wheel_speed = float(config.get("max_wheel_speed", 20.0))
+        self.sensor_noise = float(config.get("sensor_noise", 0.02))
+        self.dt = float(config.get("dt", 0.05))
+        self.goal_tolerance = float(config.get("goal_tolerance", 0.1))
+        self.arena_size = float(config.get("arena_size", 5.0))
+        self.state = state if state is not None else np.empty((n, STATE_COLUMNS))
+        self.steps_run = 0
+
+    def reset(self, rng: np.random.Generator):
+        """Posiciones, orientaciones y metas aleatorias dentro de la arena"""
+        half = self.arena_size / 2
+        s = self.state
+        s[:, X] = rng.uniform(-half, half, self.n)
+        s[:, Y] = rng.uniform(-half, half, self.n)
+        s[:, THETA] = rng.uniform(-np.pi, np.pi, self.n)
+        s[:, GOAL_X] = rng.uniform(-half, half, self.n)
+        s[:, GOAL_Y] = rng.uniform(-half, half, self.n)
+        s[:, START_DIST] = np.hypot(s[:, GOAL_X] - s[:, X], s[:, GOAL_Y] - s[:, Y])
+        s[:, DONE_STEP] = -1
+
+    def rollout(self, gains: np.ndarray, max_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Simular hasta `max_steps` pasos con las ganancias de cada entorno
+        (`gains` de forma (n, 3)). Devuelve la distancia final a la meta; el
+        paso en que cada robot llegó queda en la columna DONE_STEP (-1 si no).
+        """
+        s = self.state
+        x, y, theta = s[:, X].copy(), s[:, Y].copy(), s[:, THETA].copy()
+        goal_x, goal_y = s[:, GOAL_X], s[:, GOAL_Y]
+        done_step = s[:, DONE_STEP].copy()
+        active = done_step < 0
+        k_rho, k_alpha, k_beta = gains[:, 0], gains[:, 1], gains[:, 2]
+        half_base = self.wheel_base / 2
+        max_v = self.max_wheel_speed * self.wheel_radius
+
+        self.steps_run = 0
+        for step in range(max_steps):
+            dx, dy = goal_x - x, goal_y - y
+            rho = np.hypot(dx, dy)
+            reached = active & (rho < self.goal_tolerance)
+            done_step[reached] = step
+            active &= ~reached
+            if not active.any():
+                break
+
+            # Observación con ruido de sensores
+            if self.sensor_noise:
+                rho_obs = rho + rng.normal(0, self.sensor_noise, self.n)
+                heading = np.arctan2(dy, dx) + rng.normal(0, self.sensor_noise, self.n)
+            else:
+                rho_obs, heading = rho, np.arctan2(dy, dx)
+            alpha = _wrap_angle(heading - theta)
+            beta = _wrap_angle(-theta - alpha)
+
+            # Controlador polar -> velocidades de rueda saturadas -> (v, w) reales
+            v = np.clip(k_rho * rho_obs, -max_v, max_v)
+            w = k_alpha * alpha + k_beta * beta
+            wheel_left = np.clip((v - w * half_base) / self.wheel_radius, -self.max_wheel_speed, self.max_wheel_speed)
+            wheel_right = np.clip((v + w * half_base) / self.wheel_radius, -self.max_wheel_speed, self.max_wheel_speed)
+            v = (wheel_right + wheel_left) * self.wheel_radius / 2
+            w = (wheel_right - wheel_left) * self.wheel_radius / self.wheel_base
+
+            # Cinemática; los robots que ya llegaron no se mueven
+            moving = active.astype(float)
+            x += moving * v * np.cos(theta) * self.dt
+            y += moving * v * np.sin(theta) * self.dt
+            theta = _wrap_angle(theta + moving * w * self.dt)
+            self.steps_run += 1
+
+        s[:, X], s[:, Y], s[:, THETA], s[:, DONE_STEP] = x, y, theta, done_step
+        return np.hypot(goal_x - x, goal_y - y)
+
+
+@register_engine
+class DiffDriveEngine(TrainingEngine):
+    name = "diff_drive"
+
+    def __init__(self, robot_config, parameters, time_scale: float = 1.0):
+        super().__init__(robot_config, parameters, time_scale)
+        p = self.parameters
+        self.population = int_parameter(p, "population", 32, maximum=MAX_POPULATION)
+        self.num_envs = max(int_parameter(p, "num_envs", 2048, maximum=MAX_NUM_ENVS), self.population)
+        self.envs_per_candidate = self.num_envs // self.population
+        self.iterations = int_parameter(p, "iterations", 20, maximum=MAX_ITERATIONS)
+        self.max_steps = int_parameter(p, "max_steps", 100, maximum=MAX_STEPS)
+        self.elite = max(1, int(self.population * float(p.get("elite_fraction", 0.2))))
+        self.rng = np.random.default_rng(p.get("seed"))
+        self.env_config = {**self.robot_config, **{k: p[k] for k in ("dt", "goal_tolerance", "arena_size") if k in p}}
+        self.env = DiffDriveEnv(self.population * self.envs_per_candidate, self.env_config)
+        self.rollout_workers = _rollout_workers(p)
+        self.rollouts = None
+        self.startup_seconds = 0.0
+
+        self.iteration = 0
+        self.mean = INITIAL_GAINS.copy()
+        self.sigma = INITIAL_SIGMA.copy()
+        self.env_steps = 0
+        self.elapsed = 0.0
+        self.history = []
+        self._final: Dict[str, Any] = {}
+
+    @classmethod
+    def result_settings(cls, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        # Cada proceso de rollouts siembra su generador con el inicio de su
+        # fragmento: el número de procesos cambia los resultados
+        return {"rollout_workers": _rollout_workers(parameters)}
+
+    def open_rollouts(self):
+        """Repartir los entornos entre procesos con estado en memoria compartida"""
+        if self.rollout_workers > 1 and self.rollouts is None:
+            from rollouts import ParallelRollouts
+
+            self.rollouts = ParallelRollouts(self.env.n, len(GAIN_NAMES), self.env_config, self.rollout_workers)
+            self.env.state = self.rollouts.state
+
+    def close_rollouts(self):
+        if self.rollouts is not None:
+            # Copiar el estado fuera de la memoria compartida antes de liberarla
+            self.env.state = self.env.state.copy()
+            self.rollouts.close()
+            self.rollouts = None
+
+    def evaluate(self, gains: np.ndarray) -> np.ndarray:
+        """Distancia final normalizada (0 = meta alcanzada) de cada entorno"""
+        if self.rollouts is not None:
+            self.env_steps += self.rollouts.rollout(gains, self.max_steps, int(self.rng.integers(2**63)))
+            final = self.rollouts.final
+        else:
+            self.env.reset(self.rng)
+            final = self.env.rollout(gains, self.max_steps, self.rng)
+            self.env_steps += self.env.n * self.env.steps_run
+        return final / np.maximum(self.env.state[:, START_DIST], 1e-9)
+
+    def cost(self, normalized: np.ndarray) -> np.ndarray:
+        """Distancia restante más la fracción del tiempo usada"""
+        done_step = self.env.state[:, DONE_STEP]
+        used = np.where(done_step >= 0, done_step, self.max_steps) / self.max_steps
+        return normalized + TIME_PENALTY * used
+
+    def train_iteration(self):
+        """Una iteración de CEM sobre la población de ganancias"""
+        candidates = self.rng.normal(self.mean, self.sigma, (self.population, len(GAIN_NAMES)))
+        gains = np.repeat(candidates, self.envs_per_candidate, axis=0)
+        normalized = self.evaluate(gains)
+        cost = self.cost(normalized).reshape(self.population, self.envs_per_candidate).mean(axis=1)
+        elite = candidates[np.argsort(cost)[:self.elite]]
+        self.mean = elite.mean(axis=0)
+        self.sigma = elite.std(axis=0) + 0.01
+        self.iteration += 1
+        self.history.append(float(cost.min()))
+
+        # Curvas de la población en esta iteración
+        self.record(self.iteration, "best_cost", cost.min())
+        self.record(self.iteration, "mean_cost", cost.mean())
+        self.record(self.iteration, "loss", normalized.mean())
+        self.record(self.iteration, "success_rate", (self.env.state[:, DONE_STEP] >= 0).mean())
+        for name, gain in zip(GAIN_NAMES, self.mean):
+            self.record(self.iteration, name, gain)
+
+    def run(self) -> Iterator[ProgressEvent]:
+        started = time.perf_counter()
+        self.open_rollouts()
+        self.startup_seconds = time.perf_counter() - started
+        try:
+            yield 0, (
+                f"Entorno diff_drive: {self.env.n} robots en {self.rollout_workers} procesos, "
+                f"población {self.population}, {self.iterations} iteraciones de {self.max_steps} pasos"
+            ), "INFO"
+            while self.iteration < self.iterations:
+                started = time.perf_counter()
+                self.train_iteration()
+                self.elapsed += time.perf_counter() - started
+                progress = int(self.iteration / (self.iterations + 1) * 100)
+                yield progress, (
+                    f"[{progress}%] Iteración {self.iteration}/{self.iterations}: "
+                    f"coste del mejor candidato {self.history[-1]:.3f}"
+                ), "INFO"
+
+            started = time.perf_counter()
+            self._final = self.final_evaluation()
+            self.elapsed += time.perf_counter() - started
+            self.record(self.iteration, "final_success_rate", self._final["success_rate"])
+            self.record(self.iteration, "final_accuracy", self._final["accuracy"])
+            self.record(self.iteration, "final_loss", self._final["loss"])
+        finally:
+            self.close_rollouts()
+        yield 100, f"[100%] Evaluación final: éxito {self._final['success_rate']:.2%}", "INFO"
+
+    def final_evaluation(self) -> Dict[str, Any]:
+        """Evaluar la media de la distribución en todos los entornos"""
+        gains = np.tile(self.mean, (self.env.n, 1))
+        normalized = self.evaluate(gains)
+        done_step = self.env.state[:, DONE_STEP]
+        reached = done_step >= 0
+        # Detector de llegada: la distancia final tal como la ven los sensores
+        distance = normalized * self.env.state[:, START_DIST]
+        if self.env.sensor_noise:
+            distance = distance + self.rng.normal(0, self.env.sensor_noise, self.env.n)
+        detected = distance < self.env.goal_tolerance
+        hits = float((detected & reached).sum())
+        precision = hits / detected.sum() if detected.any() else 0.0
+        recall = hits / reached.sum() if reached.any() else 0.0
+        return {
+            "success_rate": float(reached.mean()),
+            "accuracy": float(np.clip(1 - normalized, 0, 1).mean()),
+            "loss": float(normalized.mean()),
+            "mean_steps_to_goal": float(done_step[reached].mean()) if reached.any() else None,
+            "precision": float(precision),
+            "recall": float(recall),
+            "f1_score": float(2 * precision * recall / (precision + recall)) if precision + recall else 0.0,
+        }
+
+    def state_dict(self) -> Optional[Dict[str, Any]]:
+        # Los entornos se reinician en cada evaluación: basta con la
+        # distribución de CEM y el generador aleatorio
+        return {
+            "iteration": self.iteration,
+            "mean": self.mean,
+            "sigma": self.sigma,
+            "history": np.asarray(self.history, dtype=np.float64),
+            "env_steps": self.env_steps,
+            "elapsed": self.elapsed,
+            "rng": self.rng.bit_generator.state,
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.iteration = int(state["iteration"])
+        self.mean = np.array(state["mean"], dtype=np.float64)
+        self.sigma = np.array(state["sigma"], dtype=np.float64)
+        self.history = [float(cost) for cost in state["history"]]
+        self.env_steps = int(state["env_steps"])
+        self.elapsed = float(state["elapsed"])
+        self.rng.bit_generator.state = state["rng"]
+
+    def results(self) -> Dict[str, Any]:
+        return {
+            "engine": self.name,
+            "training_duration": self.elapsed,
+            "accuracy": self._final["accuracy"],
+            "loss": self._final["loss"],
+            "iterations": self.iteration,
+            "success_rate": self._final["success_rate"],
+            "env_steps": self.env_steps,
+            "env_steps_per_second": self.env_steps / self.elapsed if self.elapsed else None,
+            "metrics": {
+                "precision": self._final["precision"],
+                "recall": self._final["recall"],
+                "f1_score": self._final["f1_score"],
+                "num_envs": self.env.n,
+                "population": self.population,
+                "rollout_workers": self.rollout_workers,
+                "rollout_startup_seconds": self.startup_seconds,
+                "mean_steps_to_goal": self._final["mean_steps_to_goal"],
+                "best_gains": dict(zip(GAIN_NAMES, map(float, self.mean))),
+                "fitness_history": self.history,
+            },
+        }
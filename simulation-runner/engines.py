@@ -0,0 +1,190 @@
+"""
+Motores de entrenamiento del runner.
+Un motor recibe la configuración del robot y los parámetros de la simulación,
+ejecuta el entrenamiento emitiendo eventos de progreso y métricas (step,
+nombre, valor) y al final entrega los resultados. El runner se encarga de
+leases, logs, métricas y estados; el motor solo calcula. Cada simulación
+elige su motor con `parameters["engine"]` (por defecto RUNNER_ENGINE).
+Con `parameters["seed"]` un motor es reproducible: mismas entradas y misma
+versión dan los mismos resultados (ver result_cache.py).
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# (porcentaje de progreso, mensaje, nivel de log)
+ProgressEvent = Tuple[int, str, str]
+
+# (step, nombre, valor); ver metrics_store.py
+MetricPoint = Tuple[int, str, float]
+
+
+class InvalidParameters(ValueError):
+    """Parámetros fuera de lo que admite el motor: la simulación falla sin reintentos"""
+
+
+def int_parameter(
+    parameters: Dict[str, Any],
+    name: str,
+    default: Any,
+    minimum: Optional[int] = 1,
+    maximum: Optional[int] = None,
+) -> int:
+    """Parámetro entero de la simulación; InvalidParameters si no es entero o está fuera de rango"""
+    value = parameters.get(name, default)
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise InvalidParameters(f"`{name}` debe ser un entero (recibido {value!r})") from None
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise InvalidParameters(f"`{name}` debe ser un entero (recibido {value!r})")
+    if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+        bounds = f"entre {minimum} y {maximum}" if maximum is not None else f"al menos {minimum}"
+        raise InvalidParameters(f"`{name}` debe ser {bounds} (recibido {number})")
+    return number
+
+
+class TrainingEngine:
+    """Interfaz de los motores de entrenamiento"""
+
+    name = "base"
+    # Incrementar al cambiar lo que calcula el motor: invalida los resultados memoizados
+    version = "1"
+
+    def __init__(self, robot_config: Dict[str, Any], parameters: Dict[str, Any], time_scale: float = 1.0):
+        self.robot_config = robot_config or {}
+        self.parameters = parameters or {}
+        self.time_scale = time_scale
+        self._metrics: List[MetricPoint] = []
+
+    def record(self, step: int, name: str, value: float):
+        """Registrar un punto de una serie de métricas"""
+        self._metrics.append((step, name, float(value)))
+
+    def drain_metrics(self) -> List[MetricPoint]:
+        """Métricas registradas desde la última llamada (el runner las recoge en cada evento)"""
+        metrics, self._metrics = self._metrics, []
+        return metrics
+
+    def run(self) -> Iterator[ProgressEvent]:
+        """Ejecutar el entrenamiento; cada evento es un punto de control del runner"""
+        raise NotImplementedError
+
+    def results(self) -> Dict[str, Any]:
+        """Resultados finales (se guardan en `simulations.results`)"""
+        raise NotImplementedError
+
+    @classmethod
+    def result_settings(cls, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ajustes efectivos de la ejecución que cambian los resultados aunque no
+        vengan en `parameters` (p. ej. variables de entorno del runner). Forman
+        parte de la clave de result_cache.py.
+        """
+        return {}
+
+    def state_dict(self) -> Optional[Dict[str, Any]]:
+        """
+        Estado para un checkpoint (arrays NumPy y valores serializables a
+        JSON), tomado entre dos eventos de `run()`. None si el motor no admite
+        reanudación.
+        """
+        return None
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """Restaurar un estado de `state_dict()` antes de llamar a `run()`"""
+        raise NotImplementedError
+
+
+ENGINES: Dict[str, Callable[..., TrainingEngine]] = {}
+
+
+def register_engine(cls):
+    """Decorador para registrar un motor por su `name`"""
+    ENGINES[cls.name] = cls
+    return cls
+
+
+def engine_class(name: str) -> Callable[..., TrainingEngine]:
+    if name not in ENGINES:
+        raise ValueError(f"Motor de entrenamiento desconocido: {name}")
+    return ENGINES[name]
+
+
+def build_engine(
+    name: str,
+    robot_config: Optional[Dict[str, Any]],
+    parameters: Optional[Dict[str, Any]],
+    time_scale: float = 1.0,
+) -> TrainingEngine:
+    return engine_class(name)(robot_config, parameters, time_scale)
+
+
+@register_engine
+class DummyEngine(TrainingEngine):
+    """Motor de pruebas: etapas con esperas aleatorias y métricas aleatorias (reproducibles con `seed`)"""
+
+    name = "dummy"
+
+    STAGES = [
+        "Inicializando entorno de simulación...",
+        "Cargando modelo del robot...",
+        "Configurando sensores y actuadores...",
+        "Ejecutando algoritmo de navegación...",
+        "Entrenando modelo de reconocimiento...",
+        "Optimizando parámetros de control...",
+        "Validando resultados del entrenamiento...",
+        "Generando reporte final..."
+    ]
+
+    def __init__(self, robot_config, parameters, time_scale: float = 1.0):
+        super().__init__(robot_config, parameters, time_scale)
+        self.rng = random.Random(self.parameters.get("seed"))
+        self.stage = 0
+
+    def run(self) -> Iterator[ProgressEvent]:
+        while self.stage < len(self.STAGES):
+            stage = self.STAGES[self.stage]
+            # Simular tiempo de procesamiento
+            time.sleep(self.rng.uniform(2, 8) * self.time_scale)
+            self.stage += 1
+            progress = int(self.stage / len(self.STAGES) * 100)
+            self.record(self.stage, "loss", self.rng.uniform(0.01, 0.25) / self.stage)
+            self.record(self.stage, "accuracy", 1 - self.rng.uniform(0.02, 0.25) / self.stage)
+            yield progress, f"[{progress}%] {stage}", "INFO"
+
+            # Simular posibles errores (10% de probabilidad)
+            if self.rng.random() < 0.1:
+                yield progress, f"Error simulado en etapa: {stage}", "ERROR"
+
+    def results(self) -> Dict[str, Any]:
+        return {
+            "training_duration": self.rng.uniform(30, 120),
+            "accuracy": self.rng.uniform(0.75, 0.98),
+            "loss": self.rng.uniform(0.01, 0.25),
+            "iterations": self.rng.randint(100, 1000),
+            "success_rate": self.rng.uniform(0.85, 0.99),
+            "metrics": {
+                "precision": self.rng.uniform(0.80, 0.95),
+                "recall": self.rng.uniform(0.75, 0.90),
+                "f1_score": self.rng.uniform(0.80, 0.92)
+            }
+        }
+
+    def state_dict(self) -> Optional[Dict[str, Any]]:
+        # Con el estado del generador una simulación reanudada produce los
+        # mismos tiempos, métricas y resultados que una sin interrupciones
+        version, internal, gauss_next = self.rng.getstate()
+        return {"stage": self.stage, "rng": [version, list(internal), gauss_next]}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        self.stage = int(state["stage"])
+        if "rng" in state:
+            # meta.json guarda las tuplas como listas
+            version, internal, gauss_next = state["rng"]
+            self.rng.setstate((version, tuple(internal), gauss_next))
+
+
+# Registrar los motores incluidos
+import diff_drive  # noqa: E402,F401
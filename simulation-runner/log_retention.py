@@ -0,0 +1,201 @@
+"""
+Retención y compactación de `training_logs`.
+Un hilo del runner, cada `interval` segundos:
+1. Borra los logs cuyo nivel superó su TTL (p. ej. DEBUG a los 7 días).
+2. Mueve los logs de las simulaciones terminadas hace más de `archive_after`
+   segundos a un archivo comprimido por simulación (log_archive.py), que el
+   backend sirve en lugar de las filas.
+Todos los borrados van en lotes de `chunk_rows` filas, cada uno en su propia
+transacción corta y con una pausa entre lotes, así los escritores de logs y
+de estados no esperan a un DELETE largo. En SQLite el espacio liberado se
+devuelve al sistema con `PRAGMA incremental_vacuum` (requiere
+auto_vacuum=INCREMENTAL, ver sqlite_profile.py).
+
+Estados de archivado de una simulación:
+- logs_archive_path NULL: logs en la tabla
+- logs_archive_path y logs_archived_at NULL: archivo escrito, borrando filas
+- logs_archive_path y logs_archived_at: archivada
+El archivo se escribe antes de reclamar la simulación con un UPDATE
+condicional, así varias réplicas del runner pueden compactar a la vez y un
+runner que muere a mitad de los borrados deja el trabajo reanudable.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from log_archive import LogArchive
+from storage import BUMP_SIMULATION_USER_VERSION, Storage, db_timestamp
+
+logger = logging.getLogger(__name__)
+
+LOG_COLUMNS = "id, simulation_id, robot_id, user_id, log_level, message, timestamp"
+
+
+def parse_ttls(value: str) -> Dict[str, float]:
+    """`"DEBUG:7,INFO:90"` -> {"DEBUG": 7.0, "INFO": 90.0} (días por nivel)"""
+    ttls = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        level, days = item.split(":")
+        ttls[level.strip().upper()] = float(days)
+    return ttls
+
+
+class LogRetention:
+    def __init__(
+        self,
+        storage: Storage,
+        archive: Optional[LogArchive],
+        ttls: Dict[str, float],
+        interval: float = 600,
+        archive_after: float = 3600,
+        chunk_rows: int = 5000,
+        chunk_pause: float = 0.05,
+        vacuum_pages: int = 1000,
+        batch_simulations: int = 100,
+    ):
+        self.storage = storage
+        self.archive = archive
+        self.ttls = ttls
+        self.interval = interval
+        self.archive_after = archive_after
+        self.chunk_rows = chunk_rows
+        self.chunk_pause = chunk_pause
+        self.vacuum_pages = vacuum_pages
+        self.batch_simulations = batch_simulations
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"expired_rows": 0, "archived_simulations": 0, "archived_rows": 0, "runs": 0}
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        if self.storage.dialect == "sqlite" and self._sqlite_auto_vacuum() != 2:
+            logger.warning(
+                "SQLite sin auto_vacuum=INCREMENTAL: el espacio de los logs borrados no se devuelve "
+                "al sistema hasta ejecutar 'PRAGMA auto_vacuum = INCREMENTAL; VACUUM;' una vez"
+            )
+        self._thread = threading.Thread(target=self._loop, name="log-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error en la retención de logs: {e}")
+
+    def run_once(self) -> Dict[str, Any]:
+        expired = self.expire()
+        archived = self.compact() if self.archive is not None else 0
+        self.stats["runs"] += 1
+        if expired or archived:
+            logger.info(f"Retención de logs: {expired} filas expiradas, {archived} simulaciones archivadas")
+        return dict(self.stats)
+
+    def _delete_chunks(self, where: str, params: Dict[str, Any]) -> int:
+        """Borrar `training_logs` que cumplen `where` en lotes cortos"""
+        deleted = 0
+        while not self._stop.is_set():
+            count = self.storage.execute(f"""
+                DELETE FROM training_logs WHERE id IN (
+                    SELECT id FROM training_logs WHERE {where} LIMIT :chunk_rows
+                )
+            """, {**params, "chunk_rows": self.chunk_rows})
+            deleted += count
+            self._vacuum()
+            if count < self.chunk_rows:
+                break
+            time.sleep(self.chunk_pause)
+        return deleted
+
+    def _sqlite_auto_vacuum(self) -> int:
+        with self.storage.connect() as conn:
+            return conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+    def _vacuum(self):
+        if self.storage.dialect != "sqlite" or self.vacuum_pages <= 0:
+            return
+        # sqlite3.execute avanza el pragma un solo paso (una página); executescript lo completa
+        raw = self.storage.engine.raw_connection()
+        try:
+            raw.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})")
+        finally:
+            raw.close()
+
+    def expire(self) -> int:
+        """Borrar los logs de cada nivel más antiguos que su TTL"""
+        expired = 0
+        for level, days in self.ttls.items():
+            if days <= 0:
+                continue
+            cutoff = db_timestamp(datetime.utcnow() - timedelta(days=days))
+            expired += self._delete_chunks(
+                "log_level = :level AND timestamp < :cutoff", {"level": level, "cutoff": cutoff}
+            )
+        self.stats["expired_rows"] += expired
+        return expired
+
+    def compact(self) -> int:
+        """Archivar los logs de las simulaciones terminadas"""
+        cutoff = db_timestamp(datetime.utcnow() - timedelta(seconds=self.archive_after))
+        simulations = self.storage.fetch_all("""
+            SELECT id, logs_archive_path FROM simulations
+            WHERE status IN ('completed', 'failed')
+            AND logs_archived_at IS NULL
+            AND COALESCE(completed_at, updated_at) < :cutoff
+            ORDER BY id
+            LIMIT :limit
+        """, {"cutoff": cutoff, "limit": self.batch_simulations})
+
+        archived = 0
+        for simulation in simulations:
+            if self._stop.is_set():
+                break
+            if self.archive_simulation(simulation["id"], simulation["logs_archive_path"]):
+                archived += 1
+        self.stats["archived_simulations"] += archived
+        return archived
+
+    def archive_simulation(self, simulation_id: int, archive_path: Optional[str] = None) -> bool:
+        if archive_path is None:
+            # Leer en streaming: el archivo se escribe sin cargar todos los logs en memoria
+            with self.storage.connect() as conn:
+                rows = conn.execution_options(yield_per=1000).execute(
+                    text(f"SELECT {LOG_COLUMNS} FROM training_logs WHERE simulation_id = :id ORDER BY id"),
+                    {"id": simulation_id},
+                )
+                archive_path, count = self.archive.write(simulation_id, (row._mapping for row in rows))
+
+            claimed = self.storage.execute("""
+                UPDATE simulations SET logs_archive_path = :path
+                WHERE id = :id AND logs_archive_path IS NULL
+            """, {"path": archive_path, "id": simulation_id})
+            if not claimed:
+                # Otra réplica la archivó primero
+                self.archive.delete(archive_path)
+                return False
+            self.stats["archived_rows"] += count
+
+        # Desde aquí el backend lee el archivo; las filas ya no se usan
+        self._delete_chunks("simulation_id = :id", {"id": simulation_id})
+        if self._stop.is_set():
+            return False
+        with self.storage.engine.begin() as conn:
+            conn.execute(
+                text("UPDATE simulations SET logs_archived_at = :now WHERE id = :id"),
+                {"now": db_timestamp(), "id": simulation_id},
+            )
+            conn.execute(text(BUMP_SIMULATION_USER_VERSION), {"id": simulation_id})
+        return True
@@ -0,0 +1,176 @@
+"""
+Sink de logs de entrenamiento con buffer y conexión persistente.
+Los logs se acumulan en memoria y se escriben con `executemany` en una sola
+transacción al alcanzar un tamaño o un intervalo de tiempo. Las escrituras de
+estado del runner pasan por la misma conexión para que los logs pendientes se
+confirmen junto con cada transición de estado.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Duración de cada transacción de la conexión persistente: "flush" (solo logs)
+# o "statement" (escritura de estado más los logs pendientes)
+write_duration = instrumentation.histogram(
+    "runner_log_write_seconds", "Duración de las transacciones del sink de logs", ["operation"],
+)
+
+INSERT_LOG = text("""
+    INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp)
+    VALUES (:simulation_id, :robot_id, :user_id, :log_level, :message, :timestamp)
+""")
+
+
+class TrainingLogSink:
+    def __init__(
+        self,
+        connect: Callable[[], Connection],
+        flush_rows: int = 500,
+        flush_interval: float = 1.0,
+        max_buffered_rows: int = 50000,
+    ):
+        self._connect = connect
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.rows_written = 0
+        self.flushes = 0
+
+    def _connection(self) -> Connection:
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def start(self):
+        """Arrancar el hilo que vacía el buffer por tiempo"""
+        self._thread = threading.Thread(target=self._flush_loop, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error vaciando logs de entrenamiento: {e}")
+
+    def add(self, simulation_id: int, robot_id: int, user_id: int, level: str, message: str, timestamp: str):
+        """Encolar un log; se escribe en el próximo flush"""
+        with self._buffer_lock:
+            self._buffer.append({
+                "simulation_id": simulation_id,
+                "robot_id": robot_id,
+                "user_id": user_id,
+                "log_level": level,
+                "message": message,
+                "timestamp": timestamp,
+            })
+            full = len(self._buffer) >= self.flush_rows
+        if full:
+            self.flush()
+
+    def _take_buffer(self) -> List[Dict[str, Any]]:
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        return rows
+
+    def _restore_buffer(self, rows: List[Dict[str, Any]]):
+        """Devolver filas no escritas al frente del buffer, descartando si excede el límite"""
+        with self._buffer_lock:
+            self._buffer = rows + self._buffer
+            overflow = len(self._buffer) - self.max_buffered_rows
+            if overflow > 0:
+                del self._buffer[:overflow]
+                logger.error(f"Buffer de logs lleno, descartadas {overflow} filas")
+
+    def _write_rows(self, conn: Connection, rows: List[Dict[str, Any]]):
+        if rows:
+            conn.execute(INSERT_LOG, rows)
+
+    def flush(self) -> int:
+        """Escribir todos los logs pendientes en una transacción"""
+        with self._conn_lock:
+            rows = self._take_buffer()
+            if not rows:
+                return 0
+            conn = self._connection()
+            started = time.perf_counter()
+            try:
+                self._write_rows(conn, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._restore_buffer(rows)
+                raise
+            write_duration.labels("flush").observe(time.perf_counter() - started)
+            self.rows_written += len(rows)
+            self.flushes += 1
+            return len(rows)
+
+    def execute(
+        self,
+        query: str,
+        params: Optional[Mapping[str, Any]] = None,
+        flush: bool = True,
+        after: Sequence[Tuple[str, Mapping[str, Any]]] = (),
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Ejecutar una escritura en la conexión persistente. Con `flush=True` los
+        logs pendientes se confirman en la misma transacción, igual que las
+        sentencias de `after` si la escritura modificó alguna fila. Devuelve
+        (rowcount, filas devueltas por RETURNING).
+        """
+        with self._conn_lock:
+            rows = self._take_buffer() if flush else []
+            conn = self._connection()
+            started = time.perf_counter()
+            try:
+                self._write_rows(conn, rows)
+                result = conn.execute(text(query), params or {})
+                returned = [dict(row._mapping) for row in result] if result.returns_rows else []
+                rowcount = result.rowcount
+                changed = len(returned) if result.returns_rows else rowcount
+                if changed > 0:
+                    for statement, statement_params in after:
+                        conn.execute(text(statement), statement_params)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                self._restore_buffer(rows)
+                raise
+            write_duration.labels("statement").observe(time.perf_counter() - started)
+            if rows:
+                self.rows_written += len(rows)
+                self.flushes += 1
+            return rowcount, returned
+
+    def pending(self) -> int:
+        with self._buffer_lock:
+            return len(self._buffer)
+
+    def close(self):
+        """Detener el hilo de flush, escribir lo pendiente y cerrar la conexión"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(5)
+        try:
+            self.flush()
+        finally:
+            with self._conn_lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
@@ -0,0 +1,172 @@
+"""
+Memoización de resultados de simulaciones.
+Los usuarios reenvían a menudo la misma configuración de robot con los mismos
+parámetros. Si la simulación es reproducible (tiene `seed`), sus resultados
+dependen solo de sus entradas, y el runner puede completarla al instante con
+los de una ejecución anterior en lugar de volver a entrenar.
+
+La clave es el sha256 de un JSON canónico de (robot_type, configuration,
+parameters, motor efectivo, versión del motor, ajustes de ejecución del
+motor, seed): claves ordenadas, sin espacios y con los floats enteros
+normalizados (1.0 == 1), así dos envíos equivalentes dan la misma clave. El
+motor es el que usa el runner (`parameters.engine` o RUNNER_ENGINE) y los
+ajustes son los que devuelve su `result_settings` (p. ej. los procesos de
+rollouts de diff_drive, que pueden venir de RUNNER_ROLLOUT_WORKERS). Los
+parámetros que solo afectan a cómo se ejecuta (RUNTIME_PARAMETERS) no forman
+parte de la clave; los que el motor resuelve en `result_settings` entran con
+su valor efectivo.
+
+Las entradas viven en la tabla `simulation_result_cache`, compartida por
+todos los runners, y se descartan por LRU (`last_used_at`) al superar
+`max_entries`. Una simulación con `use_result_cache = false` siempre se
+calcula y no escribe en la cache.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from storage import Storage, db_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Parámetros que no cambian los resultados
+RUNTIME_PARAMETERS = frozenset({"checkpoint_interval"})
+# Sustituidos por el motor y los ajustes efectivos (argumentos de cache_key)
+RESOLVED_PARAMETERS = frozenset({"engine", "rollout_workers"})
+
+STORE_RESULT = """
+    INSERT INTO simulation_result_cache (key, engine, results, simulation_id, hits, created_at, last_used_at)
+    VALUES (:key, :engine, :results, :simulation_id, 0, :now, :now)
+    ON CONFLICT (key) DO UPDATE
+    SET results = excluded.results, simulation_id = excluded.simulation_id, last_used_at = excluded.last_used_at
+"""
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(
+    robot_type: str,
+    configuration: Mapping[str, Any],
+    parameters: Mapping[str, Any],
+    engine: str,
+    engine_version: str,
+    engine_settings: Optional[Mapping[str, Any]] = None,
+) -> Optional[str]:
+    """Clave de las entradas de una simulación, o None si no es reproducible (sin `seed`)"""
+    if parameters.get("seed") is None:
+        return None
+    payload = {
+        "robot_type": robot_type,
+        "configuration": configuration or {},
+        "parameters": {
+            k: v for k, v in parameters.items() if k not in RUNTIME_PARAMETERS and k not in RESOLVED_PARAMETERS
+        },
+        "engine": engine,
+        "engine_version": str(engine_version),
+        "engine_settings": engine_settings or {},
+        "seed": parameters["seed"],
+    }
+    canonical = json.dumps(_canonical(payload), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, storage: Storage, max_entries: int = 10000):
+        self.storage = storage
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "bypassed": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self._stats[name] += value
+
+    def lookup(self, key: Optional[str]) -> Optional[Tuple[Dict[str, Any], Optional[int]]]:
+        """(resultados, simulación de origen) memoizados para `key`, o None"""
+        if key is None or not self.enabled:
+            self._count("bypassed")
+            return None
+        try:
+            row = self.storage.fetch_one(
+                "SELECT results, simulation_id FROM simulation_result_cache WHERE key = :key", {"key": key}
+            )
+            if row is not None:
+                self.storage.execute(
+                    "UPDATE simulation_result_cache SET hits = hits + 1, last_used_at = :now WHERE key = :key",
+                    {"key": key, "now": db_timestamp()},
+                )
+        except Exception as e:
+            # Un fallo de la cache no debe fallar la simulación: se calcula normalmente
+            logger.warning(f"Error leyendo la cache de resultados: {e}")
+            row = None
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        results = row["results"]
+        return (json.loads(results) if isinstance(results, str) else results), row["simulation_id"]
+
+    def store_statement(
+        self, key: str, engine: str, results: Dict[str, Any], simulation_id: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Sentencia que guarda los resultados, para ejecutarla en la misma
+        transacción que marca la simulación como completada (ver
+        `TrainingLogSink.execute(after=...)`): solo se memoiza lo que se confirma.
+        """
+        return STORE_RESULT, {
+            "key": key, "engine": engine, "results": json.dumps(results),
+            "simulation_id": simulation_id, "now": db_timestamp(),
+        }
+
+    def stored(self):
+        """Registrar una escritura confirmada y descartar las entradas sobrantes"""
+        self._count("stores")
+        try:
+            self.evict()
+        except Exception as e:
+            logger.warning(f"Error descartando resultados memoizados: {e}")
+
+    def evict(self) -> int:
+        """Borrar las entradas menos usadas recientemente por encima de `max_entries`"""
+        total = self.size()
+        excess = total - self.max_entries
+        if excess <= 0:
+            return 0
+        evicted = self.storage.execute("""
+            DELETE FROM simulation_result_cache WHERE key IN (
+                SELECT key FROM simulation_result_cache
+                ORDER BY last_used_at ASC, key ASC
+                LIMIT :excess
+            )
+        """, {"excess": excess})
+        self._count("evictions", evicted)
+        return evicted
+
+    def size(self) -> int:
+        return self.storage.fetch_one("SELECT COUNT(*) AS total FROM simulation_result_cache")["total"]
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de este proceso y entradas en la tabla (compartida por los runners)"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["size"] = self.size()
+        stats["max_entries"] = self.max_entries
+        return stats
@@ -0,0 +1,107 @@
+"""
+Rollouts de una simulación repartidos en varios procesos.
+El estado de los entornos, las ganancias y las distancias finales viven en
+bloques de memoria compartida (`multiprocessing.shared_memory`); cada proceso
+del pool se adjunta a ellos una sola vez y simula su rango de entornos sobre
+vistas NumPy de esos bloques. Por cada rollout solo viajan por el pipe los
+índices del rango y una semilla, nunca los arrays.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from diff_drive import STATE_COLUMNS, DiffDriveEnv
+
+logger = logging.getLogger(__name__)
+
+# Arrays compartidos del proceso hijo (se adjuntan en el initializer)
+_shared: Dict[str, Any] = {}
+
+
+def _create(shape: Tuple[int, ...]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    size = max(int(np.prod(shape)) * np.dtype(np.float64).itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _attach(names: Dict[str, str], n: int, gain_columns: int, config: Dict[str, Any]):
+    """Initializer de cada proceso: adjuntar los bloques compartidos"""
+    shapes = {"state": (n, STATE_COLUMNS), "gains": (n, gain_columns), "final": (n,)}
+    for key, name in names.items():
+        block = shared_memory.SharedMemory(name=name)
+        _shared[key + "_block"] = block
+        _shared[key] = np.ndarray(shapes[key], dtype=np.float64, buffer=block.buf)
+    _shared["config"] = config
+
+
+def _rollout_shard(start: int, end: int, max_steps: int, seed: int) -> int:
+    """Reset + rollout de los entornos [start, end); devuelve los pasos de entorno simulados"""
+    rng = np.random.default_rng([seed, start])
+    env = DiffDriveEnv(end - start, _shared["config"], state=_shared["state"][start:end])
+    env.reset(rng)
+    _shared["final"][start:end] = env.rollout(_shared["gains"][start:end], max_steps, rng)
+    return env.n * env.steps_run
+
+
+def split_ranges(n: int, shards: int) -> List[Tuple[int, int]]:
+    bounds = np.linspace(0, n, shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+class ParallelRollouts:
+    def __init__(
+        self,
+        n: int,
+        gain_columns: int,
+        config: Dict[str, Any],
+        workers: int,
+        shards_per_worker: int = 1,
+        start_method: Optional[str] = None,
+    ):
+        self.n = n
+        self.workers = workers
+        self._blocks = []
+        state_block, self.state = _create((n, STATE_COLUMNS))
+        gains_block, self.gains = _create((n, gain_columns))
+        final_block, self.final = _create((n,))
+        self._blocks = [state_block, gains_block, final_block]
+        names = {"state": state_block.name, "gains": gains_block.name, "final": final_block.name}
+
+        # El runner tiene hilos: `fork` podría heredar locks tomados
+        context = multiprocessing.get_context(start_method or os.getenv("RUNNER_ROLLOUT_START_METHOD", "forkserver"))
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_attach,
+            initargs=(names, n, gain_columns, config),
+        )
+        self.ranges = split_ranges(n, workers * shards_per_worker)
+
+    def rollout(self, gains: np.ndarray, max_steps: int, seed: int) -> int:
+        """
+        Ejecutar un rollout de todos los entornos con `gains` (n, columnas).
+        El estado resultante queda en `self.state` y las distancias finales en
+        `self.final`. Devuelve los pasos de entorno simulados.
+        """
+        self.gains[:] = gains
+        futures = [
+            self.executor.submit(_rollout_shard, start, end, max_steps, seed)
+            for start, end in self.ranges
+        ]
+        return sum(future.result() for future in futures)
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        for block in self._blocks:
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
@@ -6,14 +6,29 @@ Este servicio procesa simulaciones pendientes y simula el entrenamiento.
 
 import time
 import json
-import random
 import requests
-import sqlite3
 import os
-from datetime import datetime
+import signal
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import logging
 
+from checkpoints import CheckpointStore
+from engines import InvalidParameters, TrainingEngine, build_engine, engine_class
+import instrumentation
+from log_archive import LogArchive
+from log_retention import LogRetention, parse_ttls
+from log_sink import TrainingLogSink
+from metrics_store import MetricsBuffer, MetricsStore
+from result_cache import ResultCache, cache_key
+from scheduler import FairShareScheduler, parse_weights
+from storage import BUMP_SIMULATION_USER_VERSION, BUMP_USER_VERSION, Storage, db_timestamp
+from wakeup import WakeupListener
+from worker_pool import WorkerPool
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,194 +36,526 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Métricas del runner (no-op salvo con PROMETHEUS_ENABLED=1)
+claim_to_start = instrumentation.histogram(
+    "runner_claim_to_start_seconds",
+    "Espera entre reclamar una simulación y que un worker empiece a ejecutarla",
+)
+stage_duration = instrumentation.histogram(
+    "runner_stage_duration_seconds",
+    "Duración de cada etapa de una simulación (setup, training, checkpoint, finalize)",
+    ["stage"],
+    buckets=instrumentation.DURATION_BUCKETS,
+)
+simulations_processed = instrumentation.counter(
+    "runner_simulations_total",
+    "Simulaciones procesadas por resultado",
+    ["outcome"],
+)
+
+def json_field(value: Any) -> Dict[str, Any]:
+    """Columna JSON como dict (SQLite la devuelve como texto, PostgreSQL ya decodificada)"""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+class LeaseLostError(Exception):
+    """El lease de la simulación expiró y otro runner la reclamó"""
+
+class SimulationSuspended(Exception):
+    """El runner se detiene: la simulación quedó guardada en un checkpoint y vuelve a la cola"""
+
 class SimulationRunner:
     def __init__(self):
         self.database_path = os.getenv("DATABASE_URL", "sqlite:///app/data/robot_training.db")
         self.backend_url = os.getenv("BACKEND_URL", "http://backend:8000")
         self.running = True
         
-        # Convertir URL de SQLite a path de archivo
-        if self.database_path.startswith("sqlite:///"):
-            self.db_file = self.database_path.replace("sqlite:///", "")
-        else:
-            self.db_file = "/data/robot_training.db"
+        # Concurrencia y tiempos del runner
+        self.worker_count = int(os.getenv("RUNNER_WORKERS", "4"))
+        self.poll_interval = float(os.getenv("RUNNER_POLL_INTERVAL", "30"))
+        self.drain_timeout = float(os.getenv("RUNNER_DRAIN_TIMEOUT", "120"))
+        self.time_scale = float(os.getenv("SIMULATION_TIME_SCALE", "1.0"))
+        self.engine_name = os.getenv("RUNNER_ENGINE", "diff_drive")
+        
+        # Identidad del runner y duración de los leases sobre simulaciones
+        self.runner_id = os.getenv("RUNNER_ID", f"{socket.gethostname()}-{os.getpid()}")
+        self.lease_seconds = float(os.getenv("RUNNER_LEASE_SECONDS", "60"))
+        self._wakeup = threading.Event()
+        
+        # Reparto justo entre usuarios y cuota de concurrencia por usuario
+        self.scheduler = FairShareScheduler(
+            weights=parse_weights(os.getenv("SCHEDULER_USER_WEIGHTS", "")),
+            default_weight=float(os.getenv("SCHEDULER_DEFAULT_WEIGHT", "1.0")),
+            max_running_per_user=int(os.getenv("SCHEDULER_MAX_RUNNING_PER_USER", "0")),
+        )
+        
+        # Checkpoints del estado de los motores para reanudar tras reinicios o fallos
+        self.checkpoints = CheckpointStore(
+            os.getenv("RUNNER_CHECKPOINT_DIR", "/app/data/checkpoints"),
+            mmap_threshold=int(os.getenv("RUNNER_CHECKPOINT_MMAP_BYTES", str(1 << 20))),
+        )
+        self.checkpoint_interval = float(os.getenv("RUNNER_CHECKPOINT_INTERVAL", "30"))
+        self.max_attempts = int(os.getenv("RUNNER_MAX_ATTEMPTS", "3"))
+        
+        # Series de métricas de los motores, escritas por lotes en el almacén columnar
+        self.metrics = MetricsStore(os.getenv("METRICS_DIR", "/app/data/metrics"))
+        self.metrics_flush_points = int(os.getenv("RUNNER_METRICS_FLUSH_POINTS", "1000"))
+        self.metrics_flush_interval = float(os.getenv("RUNNER_METRICS_FLUSH_INTERVAL", "1.0"))
+        
+        self.pool = WorkerPool(
+            self.worker_count,
+            self.process_simulation,
+            job_id=lambda simulation: simulation["id"],
+            on_idle=self._wakeup.set,
+        )
+        
+        # Notificaciones del backend; el polling queda como respaldo
+        self.notify_port = int(os.getenv("RUNNER_NOTIFY_PORT", "9999"))
+        self.listener = None
+        if self.notify_port:
+            self.listener = WakeupListener(
+                os.getenv("RUNNER_NOTIFY_HOST", "0.0.0.0"), self.notify_port, self.wakeup
+            )
+        
+        # SQLite o PostgreSQL según DATABASE_URL, con pool de conexiones
+        self.storage = Storage(
+            self.database_path,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        )
+        
+        # Escritor persistente: logs con buffer y cambios de estado
+        self.log_sink = TrainingLogSink(
+            self.storage.connect,
+            flush_rows=int(os.getenv("LOG_FLUSH_ROWS", "500")),
+            flush_interval=float(os.getenv("LOG_FLUSH_INTERVAL", "1.0")),
+        )
+        
+        # Resultados memoizados de simulaciones reproducibles con las mismas entradas
+        self.result_cache = ResultCache(self.storage, max_entries=int(os.getenv("RESULT_CACHE_SIZE", "10000")))
+        
+        # Retención de logs: TTL por nivel y archivado de simulaciones terminadas
+        archive_codec = os.getenv("LOG_ARCHIVE_CODEC", "gzip")
+        self.log_retention = LogRetention(
+            self.storage,
+            LogArchive(os.getenv("LOG_ARCHIVE_DIR", "/app/data/log_archives"), archive_codec) if archive_codec else None,
+            ttls=parse_ttls(os.getenv("LOG_RETENTION_TTLS", "DEBUG:7")),
+            interval=float(os.getenv("LOG_RETENTION_INTERVAL", "600")),
+            archive_after=float(os.getenv("LOG_ARCHIVE_AFTER", "3600")),
+            chunk_rows=int(os.getenv("LOG_RETENTION_CHUNK_ROWS", "5000")),
+            vacuum_pages=int(os.getenv("LOG_VACUUM_PAGES", "1000")),
+        )
         
         logger.info(f"Simulation Runner iniciado")
-        logger.info(f"Base de datos: {self.db_file}")
+        logger.info(f"Base de datos: {self.storage.engine.url!r} ({self.storage.dialect})")
         logger.info(f"Backend URL: {self.backend_url}")
-    
-    def get_db_connection(self):
-        """Obtener conexión a la base de datos SQLite"""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            conn.row_factory = sqlite3.Row
-            return conn
-        except Exception as e:
-            logger.error(f"Error conectando a la base de datos: {e}")
-            return None
+        logger.info(f"Workers: {self.worker_count}")
+        logger.info(f"Runner ID: {self.runner_id}")
     
     def get_pending_simulations(self) -> list:
         """Obtener simulaciones pendientes de la base de datos"""
-        conn = self.get_db_connection()
-        if not conn:
-            return []
-        
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
+            return self.storage.fetch_all("""
                 SELECT s.*, r.name as robot_name, u.username
                 FROM simulations s
                 JOIN robots r ON s.robot_id = r.id
                 JOIN users u ON s.user_id = u.id
                 WHERE s.status = 'pending'
-                ORDER BY s.created_at ASC
+                ORDER BY s.priority DESC, s.created_at ASC
             """)
-            
-            simulations = cursor.fetchall()
-            return [dict(sim) for sim in simulations]
         except Exception as e:
             logger.error(f"Error obteniendo simulaciones pendientes: {e}")
             return []
-        finally:
-            conn.close()
     
-    def update_simulation_status(self, simulation_id: int, status: str, **kwargs):
-        """Actualizar estado de una simulación en la base de datos"""
-        conn = self.get_db_connection()
-        if not conn:
-            return False
+    def get_simulation(self, simulation_id: int) -> Optional[Dict[str, Any]]:
+        """Obtener una simulación con los datos de su robot y usuario"""
+        return self.storage.fetch_one("""
+            SELECT s.*, r.name as robot_name, r.robot_type, r.configuration as robot_configuration, u.username
+            FROM simulations s
+            JOIN robots r ON s.robot_id = r.id
+            JOIN users u ON s.user_id = u.id
+            WHERE s.id = :id
+        """, {"id": simulation_id})
+    
+    def get_pending_users(self) -> list:
+        """
+        Usuarios con simulaciones pendientes. Recorre el índice de la cola
+        saltando de usuario en usuario (un lookup por usuario) en lugar de
+        leer todas las filas pendientes.
+        """
+        rows = self.storage.fetch_all("""
+            WITH RECURSIVE pending_users(user_id) AS (
+                SELECT MIN(user_id) FROM simulations WHERE status = 'pending'
+                UNION ALL
+                SELECT (
+                    SELECT MIN(user_id) FROM simulations
+                    WHERE status = 'pending' AND user_id > pending_users.user_id
+                )
+                FROM pending_users
+                WHERE pending_users.user_id IS NOT NULL
+            )
+            SELECT user_id FROM pending_users WHERE user_id IS NOT NULL
+        """)
+        return [row["user_id"] for row in rows]
+    
+    def get_running_by_user(self) -> Dict[int, int]:
+        """Simulaciones en ejecución por usuario (en todos los runners)"""
+        rows = self.storage.fetch_all("""
+            SELECT user_id, COUNT(*) AS running FROM simulations
+            WHERE status = 'running'
+            GROUP BY user_id
+        """)
+        return {row["user_id"]: row["running"] for row in rows}
+    
+    def claim_simulation(self) -> Optional[Dict[str, Any]]:
+        """
+        Reclamar la siguiente simulación según el planificador: el usuario lo
+        elige el reparto justo y, dentro de su cola, la de mayor prioridad y
+        más antigua.
+        """
+        try:
+            pending_users = self.get_pending_users()
+            running = self.get_running_by_user()
+        except Exception as e:
+            logger.error(f"Error leyendo la cola de simulaciones: {e}")
+            return None
         
+        self.scheduler.forget(pending_users)
+        for user_id in self.scheduler.order_users(pending_users, running):
+            simulation = self.claim_user_simulation(user_id)
+            if simulation is not None:
+                self.scheduler.record_claim(user_id)
+                return simulation
+        return None
+    
+    def claim_user_simulation(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Reclamar atómicamente la siguiente simulación pendiente de un usuario.
+        Un único UPDATE condicional la pasa a `running` con un lease a nombre
+        de este runner, de modo que varias réplicas nunca ejecutan la misma.
+        En PostgreSQL la subconsulta usa SKIP LOCKED para que los runners no
+        compitan por la misma fila.
+        """
+        worker_id = f"{self.runner_id}:{uuid.uuid4().hex[:8]}"
+        now = datetime.utcnow()
+        try:
+            _, claimed = self.log_sink.execute(f"""
+                UPDATE simulations
+                SET status = 'running',
+                    worker_id = :worker_id,
+                    started_at = COALESCE(started_at, :now),
+                    heartbeat_at = :now,
+                    lease_expires_at = :lease_expires_at,
+                    updated_at = :now
+                WHERE id = (
+                    SELECT id FROM simulations
+                    WHERE status = 'pending' AND user_id = :user_id
+                    ORDER BY priority DESC, created_at ASC, id ASC
+                    LIMIT 1
+                    {self.storage.skip_locked}
+                )
+                AND status = 'pending'
+                RETURNING id
+            """, {
+                "user_id": user_id,
+                "worker_id": worker_id,
+                "now": db_timestamp(now),
+                "lease_expires_at": db_timestamp(now + timedelta(seconds=self.lease_seconds)),
+            }, flush=False, after=[(BUMP_USER_VERSION, {"user_id": user_id})])
+            if not claimed:
+                return None
+            simulation = self.get_simulation(claimed[0]["id"])
+            if simulation is not None:
+                simulation["_claimed_at"] = time.monotonic()
+            return simulation
+        except Exception as e:
+            logger.error(f"Error reclamando simulación: {e}")
+            return None
+    
+    def renew_lease(self, simulation: Dict[str, Any]):
+        """Registrar heartbeat y extender el lease; falla si se perdió"""
+        now = datetime.utcnow()
+        renewed, _ = self.log_sink.execute("""
+            UPDATE simulations
+            SET heartbeat_at = :now, lease_expires_at = :lease_expires_at
+            WHERE id = :id AND worker_id = :worker_id AND status = 'running'
+        """, {
+            "now": db_timestamp(now),
+            "lease_expires_at": db_timestamp(now + timedelta(seconds=self.lease_seconds)),
+            "id": simulation["id"],
+            "worker_id": simulation["worker_id"],
+        }, flush=False)
+        
+        if renewed == 0:
+            raise LeaseLostError(f"Lease perdido para simulación {simulation['id']}")
+    
+    def release_simulation(self, simulation: Dict[str, Any]):
+        """Devolver a `pending` una simulación reclamada que no llegó a ejecutarse"""
+        if self.update_simulation_status(
+            simulation["id"], "pending", worker_id=simulation["worker_id"], started_at=None
+        ):
+            logger.info(f"Simulación {simulation['id']} devuelta a la cola")
+    
+    def reclaim_expired_leases(self) -> int:
+        """Devolver a la cola las simulaciones cuyo runner dejó de renovar el lease"""
+        now = db_timestamp()
+        try:
+            reclaimed, _ = self.log_sink.execute("""
+                UPDATE simulations
+                SET status = 'pending',
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    heartbeat_at = NULL,
+                    updated_at = :now
+                WHERE status = 'running'
+                AND lease_expires_at IS NOT NULL
+                AND lease_expires_at < :now
+            """, {"now": now}, flush=False, after=[("""
+                UPDATE users SET data_version = data_version + 1
+                WHERE id IN (SELECT user_id FROM simulations WHERE status = 'pending' AND updated_at = :now)
+            """, {"now": now})])
+            if reclaimed:
+                logger.warning(f"Reclamadas {reclaimed} simulaciones con lease expirado")
+            return reclaimed
+        except Exception as e:
+            logger.error(f"Error reclamando leases expirados: {e}")
+            return 0
+    
+    def update_simulation_status(self, simulation_id: int, status: str, after=(), **kwargs):
+        """
+        Actualizar estado de una simulación en la base de datos.
+        Los logs pendientes y las sentencias de `after` se escriben en la misma
+        transacción (estas últimas solo si la simulación se actualizó).
+        """
         try:
-            cursor = conn.cursor()
-            
             # Construir query de actualización
-            update_fields = ["status = ?", "updated_at = ?"]
-            params = [status, datetime.utcnow().isoformat()]
+            update_fields = ["status = :status", "updated_at = :updated_at"]
+            params = {"status": status, "updated_at": db_timestamp(), "id": simulation_id}
             
             if "started_at" in kwargs:
-                update_fields.append("started_at = ?")
-                params.append(kwargs["started_at"])
+                update_fields.append("started_at = :started_at")
+                params["started_at"] = kwargs["started_at"]
             
             if "completed_at" in kwargs:
-                update_fields.append("completed_at = ?")
-                params.append(kwargs["completed_at"])
+                update_fields.append("completed_at = :completed_at")
+                params["completed_at"] = kwargs["completed_at"]
             
             if "results" in kwargs:
-                update_fields.append("results = ?")
-                params.append(json.dumps(kwargs["results"]))
+                update_fields.append("results = :results")
+                params["results"] = json.dumps(kwargs["results"])
+            
+            if "attempts" in kwargs:
+                update_fields.append("attempts = :attempts")
+                params["attempts"] = kwargs["attempts"]
+            
+            if "checkpoint_path" in kwargs:
+                update_fields.append("checkpoint_path = :checkpoint_path")
+                params["checkpoint_path"] = kwargs["checkpoint_path"]
             
-            query = f"UPDATE simulations SET {', '.join(update_fields)} WHERE id = ?"
-            params.append(simulation_id)
+            if "result_cache_hit" in kwargs:
+                update_fields.append("result_cache_hit = :result_cache_hit")
+                params["result_cache_hit"] = kwargs["result_cache_hit"]
             
-            cursor.execute(query, params)
-            conn.commit()
-            return True
+            # Al salir de `running` el lease deja de tener sentido
+            if status != "running":
+                update_fields.extend(["worker_id = NULL", "lease_expires_at = NULL", "heartbeat_at = NULL"])
+            
+            query = f"UPDATE simulations SET {', '.join(update_fields)} WHERE id = :id"
+            
+            # Solo el dueño del lease puede cambiar el estado
+            if kwargs.get("worker_id"):
+                query += " AND worker_id = :worker_id"
+                params["worker_id"] = kwargs["worker_id"]
+            
+            updated, _ = self.log_sink.execute(
+                query, params, after=[(BUMP_SIMULATION_USER_VERSION, {"id": simulation_id}), *after]
+            )
+            return updated > 0
         except Exception as e:
             logger.error(f"Error actualizando simulación {simulation_id}: {e}")
             return False
-        finally:
-            conn.close()
     
-    def add_training_log(self, simulation_id: int, robot_id: int, user_id: int, message: str, level: str = "INFO"):
-        """Agregar log de entrenamiento a la base de datos"""
-        conn = self.get_db_connection()
-        if not conn:
+    def save_checkpoint(self, simulation: Dict[str, Any], engine: TrainingEngine, metrics: MetricsBuffer):
+        """
+        Guardar el estado del motor y apuntar la simulación a él. El checkpoint
+        anterior se borra solo cuando la base de datos ya referencia el nuevo.
+        Guarda también la longitud de cada serie de métricas para descartar al
+        reanudar los puntos escritos después del checkpoint.
+        """
+        started = time.perf_counter()
+        metrics.flush()
+        state = engine.state_dict()
+        state["_metric_lengths"] = self.metrics.lengths(simulation["id"])
+        path = self.checkpoints.save(simulation["id"], state)
+        saved, _ = self.log_sink.execute("""
+            UPDATE simulations
+            SET checkpoint_path = :path, checkpointed_at = :now
+            WHERE id = :id AND worker_id = :worker_id AND status = 'running'
+        """, {
+            "path": path,
+            "now": db_timestamp(),
+            "id": simulation["id"],
+            "worker_id": simulation["worker_id"],
+        }, after=[(BUMP_USER_VERSION, {"user_id": simulation["user_id"]})])
+        if saved == 0:
+            raise LeaseLostError(f"Lease perdido para simulación {simulation['id']}")
+        self.checkpoints.prune(simulation["id"], keep=path)
+        stage_duration.labels("checkpoint").observe(time.perf_counter() - started)
+    
+    def resume_from_checkpoint(self, simulation: Dict[str, Any], engine: TrainingEngine) -> bool:
+        """Restaurar el motor desde el último checkpoint; si no se puede, empezar de cero"""
+        path = simulation.get("checkpoint_path")
+        if not path:
             return False
-        
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (simulation_id, robot_id, user_id, level, message, datetime.utcnow().isoformat()))
-            
-            conn.commit()
-            return True
+            state = self.checkpoints.load(path)
+            metric_lengths = state.pop("_metric_lengths", {})
+            engine.load_state_dict(state)
+            self.metrics.truncate(simulation["id"], metric_lengths)
         except Exception as e:
-            logger.error(f"Error agregando log: {e}")
+            logger.warning(f"Checkpoint inválido para simulación {simulation['id']} ({path}): {e}")
             return False
-        finally:
-            conn.close()
+        self.add_training_log(
+            simulation["id"],
+            simulation["robot_id"],
+            simulation["user_id"],
+            f"Reanudando desde checkpoint del {simulation.get('checkpointed_at')}",
+            "INFO"
+        )
+        logger.info(f"Simulación {simulation['id']} reanudada desde {path}")
+        return True
+    
+    def add_training_log(self, simulation_id: int, robot_id: int, user_id: int, message: str, level: str = "INFO"):
+        """Agregar log de entrenamiento al buffer del sink"""
+        self.log_sink.add(simulation_id, robot_id, user_id, level, message, db_timestamp())
+        return True
+    
+    def complete_from_cache(
+        self, simulation: Dict[str, Any], results: Dict[str, Any], source_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """Completar una simulación con resultados memoizados, sin ejecutar el motor"""
+        simulation_id = simulation["id"]
+        # Las curvas de métricas también se reutilizan si la simulación de origen las conserva
+        self.metrics.delete(simulation_id)
+        if source_id is not None and source_id != simulation_id:
+            self.metrics.copy(source_id, simulation_id)
+        self.add_training_log(
+            simulation_id,
+            simulation["robot_id"],
+            simulation["user_id"],
+            f"Resultados reutilizados de la simulación {source_id} (mismas entradas y seed). "
+            f"Accuracy: {results.get('accuracy', 0):.2%}",
+            "INFO"
+        )
+        if not self.update_simulation_status(
+            simulation_id,
+            "completed",
+            completed_at=db_timestamp(),
+            results=results,
+            checkpoint_path=None,
+            result_cache_hit=True,
+            worker_id=simulation["worker_id"]
+        ):
+            raise LeaseLostError(f"Lease perdido para simulación {simulation_id}")
+        self.checkpoints.delete(simulation_id)
+        logger.info(f"Simulación {simulation_id} completada desde la cache de resultados (origen: {source_id})")
+        return results
     
     def simulate_training(self, simulation: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Simular proceso de entrenamiento de robot.
-        En un entorno real, aquí se ejecutaría el algoritmo de entrenamiento.
+        Ejecutar el entrenamiento de la simulación con su motor.
+        Cada evento de progreso del motor renueva el lease y se registra como log;
+        sus métricas se escriben por lotes en el almacén columnar. Si el motor
+        admite checkpoints, su estado se guarda como mucho cada
+        `checkpoint_interval` segundos y se reanuda desde el último al volver a
+        ejecutar la simulación (reintento, lease reclamado o runner reiniciado).
+        Una simulación reproducible (con `seed`) cuyas entradas ya se calcularon
+        se completa con los resultados memoizados (ver result_cache.py).
         """
         simulation_id = simulation["id"]
         robot_name = simulation["robot_name"]
         username = simulation["username"]
+        parameters = json_field(simulation.get("parameters"))
+        engine_name = parameters.get("engine", self.engine_name)
         
-        logger.info(f"Iniciando simulación {simulation_id} para robot {robot_name} (usuario: {username})")
+        logger.info(
+            f"Iniciando simulación {simulation_id} para robot {robot_name} "
+            f"(usuario: {username}, motor: {engine_name})"
+        )
+        stage_started = time.perf_counter()
+        robot_configuration = json_field(simulation.get("robot_configuration"))
+        key = None
+        if simulation.get("use_result_cache", True):
+            engine_cls = engine_class(engine_name)
+            key = cache_key(
+                simulation.get("robot_type"), robot_configuration, parameters,
+                engine_name, engine_cls.version, engine_cls.result_settings(parameters),
+            )
+        cached = self.result_cache.lookup(key)
+        if cached is not None:
+            return self.complete_from_cache(simulation, *cached)
         
-        # Marcar simulación como en ejecución
-        self.update_simulation_status(simulation_id, "running", started_at=datetime.utcnow().isoformat())
+        engine = build_engine(
+            engine_name, robot_configuration, parameters, self.time_scale
+        )
         
-        # Simular diferentes etapas del entrenamiento
-        training_stages = [
-            "Inicializando entorno de simulación...",
-            "Cargando modelo del robot...",
-            "Configurando sensores y actuadores...",
-            "Ejecutando algoritmo de navegación...",
-            "Entrenando modelo de reconocimiento...",
-            "Optimizando parámetros de control...",
-            "Validando resultados del entrenamiento...",
-            "Generando reporte final..."
-        ]
+        # Intervalo por simulación (parameters.checkpoint_interval); 0 desactiva los checkpoints
+        checkpoint_interval = float(parameters.get("checkpoint_interval", self.checkpoint_interval))
+        checkpointing = checkpoint_interval > 0 and engine.state_dict() is not None
+        if not (checkpointing and self.resume_from_checkpoint(simulation, engine)):
+            # Empezar de cero: descartar series de ejecuciones anteriores
+            self.metrics.delete(simulation_id)
+        metrics = MetricsBuffer(
+            self.metrics, simulation_id, self.metrics_flush_points, self.metrics_flush_interval
+        )
         
-        # Simular progreso del entrenamiento
-        for i, stage in enumerate(training_stages):
-            # Simular tiempo de procesamiento
-            processing_time = random.uniform(2, 8)
-            time.sleep(processing_time)
-            
-            # Agregar log de progreso
-            progress = int((i + 1) / len(training_stages) * 100)
-            log_message = f"[{progress}%] {stage}"
-            self.add_training_log(
-                simulation_id, 
-                simulation["robot_id"], 
-                simulation["user_id"], 
-                log_message
-            )
-            
-            logger.info(f"Simulación {simulation_id}: {log_message}")
-            
-            # Simular posibles errores (10% de probabilidad)
-            if random.random() < 0.1:
-                error_message = f"Error simulado en etapa: {stage}"
+        self.renew_lease(simulation)
+        events = engine.run()
+        last_checkpoint = time.monotonic()
+        stage_duration.labels("setup").observe(time.perf_counter() - stage_started)
+        stage_started = time.perf_counter()
+        try:
+            for _progress, log_message, level in events:
+                # Mantener vivo el lease; si se perdió, otro runner se hizo cargo
+                self.renew_lease(simulation)
                 self.add_training_log(
                     simulation_id, 
                     simulation["robot_id"], 
                     simulation["user_id"], 
-                    error_message, 
-                    "ERROR"
+                    log_message,
+                    level
                 )
-                logger.warning(f"Simulación {simulation_id}: {error_message}")
-        
-        # Generar resultados simulados
-        results = {
-            "training_duration": random.uniform(30, 120),
-            "accuracy": random.uniform(0.75, 0.98),
-            "loss": random.uniform(0.01, 0.25),
-            "iterations": random.randint(100, 1000),
-            "success_rate": random.uniform(0.85, 0.99),
-            "metrics": {
-                "precision": random.uniform(0.80, 0.95),
-                "recall": random.uniform(0.75, 0.90),
-                "f1_score": random.uniform(0.80, 0.92)
-            }
-        }
+                if level == "ERROR":
+                    logger.warning(f"Simulación {simulation_id}: {log_message}")
+                else:
+                    logger.info(f"Simulación {simulation_id}: {log_message}")
+                metrics.add(engine.drain_metrics())
+                
+                if not checkpointing:
+                    continue
+                if not self.running:
+                    # Parada del runner: guardar y devolver a la cola en vez de esperar al final
+                    self.save_checkpoint(simulation, engine, metrics)
+                    raise SimulationSuspended(f"Simulación {simulation_id} suspendida por parada del runner")
+                if time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    self.save_checkpoint(simulation, engine, metrics)
+                    last_checkpoint = time.monotonic()
+        finally:
+            # Liberar recursos del motor (procesos, memoria compartida) aunque se pierda el lease
+            events.close()
         
-        # Marcar simulación como completada
-        self.update_simulation_status(
-            simulation_id, 
-            "completed", 
-            completed_at=datetime.utcnow().isoformat(),
-            results=results
-        )
+        # Incluye los checkpoints intermedios, que además se miden por separado
+        stage_duration.labels("training").observe(time.perf_counter() - stage_started)
+        stage_started = time.perf_counter()
+        metrics.add(engine.drain_metrics())
+        metrics.flush()
+        results = engine.results()
         
-        # Agregar log final
+        # Agregar log final (se confirma junto con el cambio de estado)
         final_message = f"Simulación completada exitosamente. Accuracy: {results['accuracy']:.2%}"
         self.add_training_log(
             simulation_id, 
@@ -218,60 +565,196 @@ class SimulationRunner:
             "INFO"
         )
         
+        # Marcar simulación como completada (y memoizar sus resultados en la misma transacción)
+        store = []
+        if key is not None and self.result_cache.enabled:
+            store.append(self.result_cache.store_statement(key, engine_name, results, simulation_id))
+        if not self.update_simulation_status(
+            simulation_id, 
+            "completed", 
+            completed_at=db_timestamp(),
+            results=results,
+            checkpoint_path=None,
+            worker_id=simulation["worker_id"],
+            after=store
+        ):
+            raise LeaseLostError(f"Lease perdido para simulación {simulation_id}")
+        if store:
+            self.result_cache.stored()
+        self.checkpoints.delete(simulation_id)
+        stage_duration.labels("finalize").observe(time.perf_counter() - stage_started)
+        
         logger.info(f"Simulación {simulation_id} completada exitosamente")
         return results
     
+    def process_simulation(self, simulation: Dict[str, Any]):
+        """Procesar una simulación dentro de un worker del pool"""
+        if "_claimed_at" in simulation:
+            claim_to_start.observe(time.monotonic() - simulation["_claimed_at"])
+        try:
+            results = self.simulate_training(simulation)
+            logger.info(f"Simulación {simulation['id']} procesada con resultados: {results}")
+            simulations_processed.labels("completed").inc()
+            
+        except LeaseLostError as e:
+            # Otro runner reclamó la simulación: abandonarla sin tocar su estado
+            logger.warning(str(e))
+            simulations_processed.labels("lease_lost").inc()
+            
+        except SimulationSuspended as e:
+            logger.info(str(e))
+            self.update_simulation_status(simulation['id'], "pending", worker_id=simulation["worker_id"])
+            simulations_processed.labels("suspended").inc()
+            
+        except Exception as e:
+            logger.error(f"Error procesando simulación {simulation['id']}: {e}")
+            attempts = (simulation.get("attempts") or 0) + 1
+            
+            # Con parámetros inválidos reintentar daría el mismo error
+            if attempts < self.max_attempts and not isinstance(e, InvalidParameters):
+                # Volver a la cola; el reintento continúa desde el último checkpoint
+                self.add_training_log(
+                    simulation['id'],
+                    simulation['robot_id'],
+                    simulation['user_id'],
+                    f"Error en simulación: {str(e)}. Reintento {attempts}/{self.max_attempts - 1}",
+                    "WARNING"
+                )
+                self.update_simulation_status(
+                    simulation['id'], "pending", attempts=attempts, worker_id=simulation["worker_id"]
+                )
+                simulations_processed.labels("retried").inc()
+                return
+            
+            # Agregar log de error
+            self.add_training_log(
+                simulation['id'],
+                simulation['robot_id'],
+                simulation['user_id'],
+                f"Error en simulación: {str(e)}",
+                "ERROR"
+            )
+            simulations_processed.labels("failed").inc()
+            
+            # Marcar simulación como fallida
+            if self.update_simulation_status(
+                simulation['id'], "failed", attempts=attempts, checkpoint_path=None,
+                worker_id=simulation["worker_id"]
+            ):
+                self.checkpoints.delete(simulation['id'])
+    
+    def dispatch_pending(self) -> int:
+        """Reclamar simulaciones pendientes para los workers libres"""
+        dispatched = 0
+        while self.running and self.pool.idle_capacity() > 0:
+            simulation = self.claim_simulation()
+            if simulation is None:
+                break
+            if not self.pool.submit(simulation):
+                self.release_simulation(simulation)
+                break
+            dispatched += 1
+        
+        if dispatched:
+            logger.info(f"Despachadas {dispatched} simulaciones pendientes")
+        else:
+            logger.debug("No hay simulaciones pendientes")
+        return dispatched
+    
+    def health(self) -> Dict[str, Any]:
+        """Estado de salud del runner y de sus workers"""
+        return {"running": self.running, "pool": self.pool.health(), "result_cache": self.result_cache.stats()}
+    
+    def metrics_samples(self):
+        """
+        Muestras leídas al momento del scrape: tamaño de la cola (en todos los
+        runners), ocupación del pool, logs sin escribir y retención.
+        """
+        counts = {"pending": 0, "running": 0}
+        for row in self.storage.fetch_all(
+            "SELECT status, COUNT(*) AS total FROM simulations "
+            "WHERE status IN ('pending', 'running') GROUP BY status"
+        ):
+            counts[row["status"]] = row["total"]
+        yield "gauge", "runner_queue_pending", "Simulaciones pendientes en la cola", {}, counts["pending"]
+        yield "gauge", "runner_simulations_running", "Simulaciones en ejecución en todos los runners", {}, counts["running"]
+        
+        pool = self.pool.health()
+        yield "gauge", "runner_workers_size", "Workers configurados en este runner", {}, pool["size"]
+        yield "gauge", "runner_workers_busy", "Workers ejecutando una simulación", {}, pool["busy"]
+        yield "gauge", "runner_log_buffer_rows", "Logs en el buffer del sink pendientes de escribir", {}, self.log_sink.pending()
+        yield "counter", "runner_log_rows_written", "Logs escritos por el sink", {}, self.log_sink.rows_written
+        yield from instrumentation.cache_samples("simulation_results", self.result_cache.stats())
+        for name, value in self.log_retention.stats.items():
+            yield "counter", f"runner_log_retention_{name}", "Trabajo acumulado de la retención de logs", {}, value
+    
+    def wakeup(self, message: Optional[Dict[str, Any]] = None):
+        """Despertar al dispatcher (p. ej. al recibir una notificación del backend)"""
+        self._wakeup.set()
+    
+    def stop(self, *_args):
+        """Solicitar parada ordenada (SIGTERM/SIGINT)"""
+        if self.running:
+            logger.info("Recibida señal de parada, drenando workers...")
+        self.running = False
+        self._wakeup.set()
+    
+    def install_signal_handlers(self):
+        """Registrar SIGTERM/SIGINT para drenar el pool antes de salir"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+    
     def run(self):
         """Ejecutar el loop principal del runner"""
         logger.info("Iniciando loop principal del Simulation Runner")
+        if instrumentation.ENABLED:
+            instrumentation.register_callback(self.metrics_samples)
+            port = int(os.getenv("PROMETHEUS_PORT", "9100"))
+            try:
+                instrumentation.start_http_server(port)
+                logger.info(f"Métricas en http://0.0.0.0:{port}/metrics")
+            except OSError as e:
+                logger.warning(f"No se pudo servir métricas en el puerto {port}: {e}")
+        self.log_sink.start()
+        self.log_retention.start()
+        self.pool.start()
+        if self.listener:
+            try:
+                self.listener.start()
+            except OSError as e:
+                logger.warning(f"No se pudo escuchar notificaciones, solo polling: {e}")
+                self.listener = None
         
         while self.running:
             try:
-                # Obtener simulaciones pendientes
-                pending_simulations = self.get_pending_simulations()
-                
-                if pending_simulations:
-                    logger.info(f"Procesando {len(pending_simulations)} simulaciones pendientes")
-                    
-                    for simulation in pending_simulations:
-                        try:
-                            # Procesar simulación
-                            results = self.simulate_training(simulation)
-                            logger.info(f"Simulación {simulation['id']} procesada con resultados: {results}")
-                            
-                        except Exception as e:
-                            logger.error(f"Error procesando simulación {simulation['id']}: {e}")
-                            
-                            # Marcar simulación como fallida
-                            self.update_simulation_status(simulation['id'], "failed")
-                            
-                            # Agregar log de error
-                            self.add_training_log(
-                                simulation['id'],
-                                simulation['robot_id'],
-                                simulation['user_id'],
-                                f"Error en simulación: {str(e)}",
-                                "ERROR"
-                            )
-                else:
-                    logger.debug("No hay simulaciones pendientes")
+                self.pool.ensure_workers()
+                self._wakeup.clear()
+                self.reclaim_expired_leases()
+                self.dispatch_pending()
                 
-                # Esperar antes de la siguiente iteración
-                time.sleep(10)
+                # Esperar hasta el siguiente poll, una notificación o un worker libre
+                self._wakeup.wait(self.poll_interval)
                 
             except KeyboardInterrupt:
-                logger.info("Recibida señal de interrupción, deteniendo runner...")
-                self.running = False
+                self.stop()
                 break
             except Exception as e:
                 logger.error(f"Error en loop principal: {e}")
-                time.sleep(30)  # Esperar más tiempo en caso de error
+                self._wakeup.wait(30)  # Esperar más tiempo en caso de error
         
+        if self.listener:
+            self.listener.stop()
+        if not self.pool.drain(self.drain_timeout, on_discard=self.release_simulation):
+            logger.warning("Timeout drenando workers; quedan simulaciones en ejecución")
+        self.log_retention.stop()
+        self.log_sink.close()
+        self.storage.dispose()
         logger.info("Simulation Runner detenido")
 
 def main():
     """Función principal"""
     runner = SimulationRunner()
+    runner.install_signal_handlers()
     runner.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""
+Acceso a la base de datos del runner sobre SQLAlchemy Core.
+El mismo SQL (parámetros con nombre) corre en SQLite y PostgreSQL; las
+diferencias de dialecto quedan aquí. Las conexiones salen de un pool real,
+así los hilos del runner no abren una conexión por consulta.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection
+
+from sqlite_profile import profile as sqlite_profile
+
+logger = logging.getLogger(__name__)
+
+# Mismo formato que SQLAlchemy usa para DateTime en SQLite, para que las
+# comparaciones de texto entre timestamps del backend y del runner sean válidas
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def db_timestamp(value: Optional[datetime] = None) -> str:
+    """Formatear un datetime UTC para guardarlo en la base de datos"""
+    return (value or datetime.utcnow()).strftime(TIMESTAMP_FORMAT)
+
+
+# Versión de datos del usuario (ETags del backend, ver backend/etags.py): se
+# incrementa en la misma transacción que cada cambio visible de una simulación
+BUMP_USER_VERSION = "UPDATE users SET data_version = data_version + 1 WHERE id = :user_id"
+BUMP_SIMULATION_USER_VERSION = (
+    "UPDATE users SET data_version = data_version + 1 "
+    "WHERE id = (SELECT user_id FROM simulations WHERE id = :id)"
+)
+
+
+def _apply_sqlite_profile(dbapi_connection, connection_record):
+    sqlite_profile.apply(dbapi_connection)
+
+
+class Storage:
+    def __init__(self, url: str, pool_size: int = 5, max_overflow: int = 10, pool_timeout: float = 30):
+        self.url = url
+        options: Dict[str, Any] = {"pool_size": pool_size, "max_overflow": max_overflow, "pool_timeout": pool_timeout}
+        if url.startswith("sqlite"):
+            options["connect_args"] = {"check_same_thread": False, "timeout": sqlite_profile.timeout}
+        else:
+            # Descartar conexiones cortadas por reinicios del servidor
+            options["pool_pre_ping"] = True
+        self.engine = create_engine(url, **options)
+        self.dialect = self.engine.dialect.name
+        if self.dialect == "sqlite":
+            event.listen(self.engine, "connect", _apply_sqlite_profile)
+
+    @property
+    def skip_locked(self) -> str:
+        """
+        Cláusula de bloqueo para reclamar filas. En PostgreSQL varios runners
+        se saltan las filas que otro está reclamando en lugar de esperarlo;
+        SQLite serializa los escritores y no la necesita.
+        """
+        return "FOR UPDATE SKIP LOCKED" if self.dialect == "postgresql" else ""
+
+    def connect(self) -> Connection:
+        """Tomar una conexión del pool (devolverla con `close()`)"""
+        return self.engine.connect()
+
+    def fetch_all(self, query: str, params: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(text(query), params or {})]
+
+    def fetch_one(self, query: str, params: Optional[Mapping[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        rows = self.fetch_all(query, params)
+        return rows[0] if rows else None
+
+    def execute(self, query: str, params: Optional[Mapping[str, Any]] = None) -> int:
+        """Ejecutar una sentencia en su propia transacción; devuelve las filas afectadas"""
+        with self.engine.begin() as conn:
+            return conn.execute(text(query), params or {}).rowcount
+
+    def pool_status(self) -> str:
+        return self.engine.pool.status()
+
+    def dispose(self):
+        self.engine.dispose()
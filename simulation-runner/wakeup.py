@@ -0,0 +1,57 @@
+"""
+Listener de notificaciones de wake-up enviadas por el backend.
+Cada datagrama recibido despierta al dispatcher del runner; el polling
+periódico queda solo como respaldo si se pierde una notificación.
+"""
+
+import json
+import logging
+import socket
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class WakeupListener:
+    """Escucha datagramas UDP JSON y llama a `on_wakeup(message)` por cada uno"""
+
+    def __init__(self, host: str, port: int, on_wakeup: Callable[[Dict], None]):
+        self.host = host
+        self.port = port
+        self.on_wakeup = on_wakeup
+        self._stop = threading.Event()
+        self._thread = None
+        self._socket = None
+
+    def start(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        self._socket.settimeout(1.0)
+        self.port = self._socket.getsockname()[1]
+        self._thread = threading.Thread(target=self._loop, name="wakeup-listener", daemon=True)
+        self._thread.start()
+        logger.info(f"Escuchando notificaciones en {self.host}:{self.port}/udp")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                data, _ = self._socket.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                message = json.loads(data)
+            except ValueError:
+                message = {}
+            logger.debug(f"Notificación recibida: {message}")
+            self.on_wakeup(message)
+
+    def stop(self):
+        self._stop.set()
+        if self._socket:
+            self._socket.close()
+        if self._thread:
+            self._thread.join(2)
@@ -0,0 +1,198 @@
+"""
+Pool de workers para ejecutar simulaciones en paralelo dentro de un runner.
+Cada worker es un hilo dedicado que consume trabajos de una cola acotada y
+publica su estado para los chequeos de salud.
+"""
+
+import queue
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerState:
+    """Estado observable de un worker del pool"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.name = f"worker-{index}"
+        self.status = "starting"  # starting, idle, busy, stopped
+        self.current_job: Optional[Any] = None
+        self.job_started_at: Optional[float] = None
+        self.last_heartbeat = time.time()
+        self.processed = 0
+        self.failed = 0
+        self.thread: Optional[threading.Thread] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "name": self.name,
+            "status": self.status,
+            "alive": bool(self.thread and self.thread.is_alive()),
+            "current_job": self.current_job,
+            "job_seconds": round(now - self.job_started_at, 3) if self.job_started_at else None,
+            "seconds_since_heartbeat": round(now - self.last_heartbeat, 3),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+class WorkerPool:
+    """
+    Pool de hilos con cola acotada al número de workers.
+    `handler(job)` se ejecuta en un worker; `on_idle()` se invoca cada vez que
+    un worker queda libre para que el dispatcher pueda reponer trabajo.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        handler: Callable[[Any], Any],
+        job_id: Callable[[Any], Any] = lambda job: job,
+        on_idle: Optional[Callable[[], None]] = None,
+    ):
+        if size < 1:
+            raise ValueError("El pool necesita al menos un worker")
+        self.size = size
+        self.handler = handler
+        self.job_id = job_id
+        self.on_idle = on_idle
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._accepting = True
+        self._stopping = threading.Event()
+        self.workers = [WorkerState(i) for i in range(size)]
+
+    def start(self):
+        """Arrancar todos los workers"""
+        for state in self.workers:
+            self._spawn(state)
+        logger.info(f"Pool iniciado con {self.size} workers")
+
+    def _spawn(self, state: WorkerState):
+        state.status = "idle"
+        state.thread = threading.Thread(
+            target=self._worker_loop, args=(state,), name=state.name, daemon=True
+        )
+        state.thread.start()
+
+    def _worker_loop(self, state: WorkerState):
+        while True:
+            state.last_heartbeat = time.time()
+            try:
+                job = self._queue.get(timeout=1)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    break
+                continue
+
+            if job is None:
+                self._queue.task_done()
+                break
+
+            key = self.job_id(job)
+            state.status = "busy"
+            state.current_job = key
+            state.job_started_at = time.time()
+            try:
+                self.handler(job)
+                state.processed += 1
+            except Exception as e:
+                state.failed += 1
+                logger.error(f"{state.name}: error no controlado en trabajo {key}: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+                state.status = "idle"
+                state.current_job = None
+                state.job_started_at = None
+                state.last_heartbeat = time.time()
+                self._queue.task_done()
+                if self.on_idle:
+                    self.on_idle()
+
+        state.status = "stopped"
+
+    def idle_capacity(self) -> int:
+        """Número de trabajos que se pueden encolar sin esperar"""
+        with self._lock:
+            return max(0, self.size - len(self._inflight))
+
+    def submit(self, job: Any) -> bool:
+        """Encolar un trabajo si hay capacidad libre; no bloquea"""
+        key = self.job_id(job)
+        with self._lock:
+            if not self._accepting or key in self._inflight:
+                return False
+            if len(self._inflight) >= self.size:
+                return False
+            self._inflight.add(key)
+        self._queue.put_nowait(job)
+        return True
+
+    def ensure_workers(self):
+        """Relanzar workers cuyo hilo haya muerto inesperadamente"""
+        if self._stopping.is_set():
+            return
+        for state in self.workers:
+            if state.thread is None or not state.thread.is_alive():
+                logger.warning(f"{state.name} no está vivo, relanzando")
+                self._spawn(state)
+
+    def health(self) -> Dict[str, Any]:
+        """Resumen de salud del pool y de cada worker"""
+        workers = [state.to_dict() for state in self.workers]
+        return {
+            "size": self.size,
+            "busy": sum(1 for w in workers if w["status"] == "busy"),
+            "alive": sum(1 for w in workers if w["alive"]),
+            "accepting": self._accepting,
+            "workers": workers,
+        }
+
+    def drain(
+        self,
+        timeout: Optional[float] = None,
+        on_discard: Optional[Callable[[Any], None]] = None,
+    ) -> bool:
+        """
+        Dejar de aceptar trabajos y esperar a que terminen los que están en
+        ejecución. Los trabajos encolados que aún no comenzaron se descartan
+        (pasándolos a `on_discard`). Devuelve True si todos los workers
+        terminaron dentro del timeout.
+        """
+        with self._lock:
+            self._accepting = False
+
+        discarded = []
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            key = self.job_id(job)
+            discarded.append(key)
+            with self._lock:
+                self._inflight.discard(key)
+            self._queue.task_done()
+            if on_discard:
+                on_discard(job)
+        if discarded:
+            logger.info(f"Descartados trabajos no iniciados: {discarded}")
+
+        self._stopping.set()
+        deadline = None if timeout is None else time.time() + timeout
+        finished = True
+        for state in self.workers:
+            if state.thread is None:
+                continue
+            remaining = None if deadline is None else max(0, deadline - time.time())
+            state.thread.join(remaining)
+            if state.thread.is_alive():
+                finished = False
+        return finished
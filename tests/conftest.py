@@ -0,0 +1,123 @@
+"""
+Fixtures compartidas por los tests.
+Una sola base SQLite temporal (esquema de init_db.sh) para toda la sesión: la
+app del backend lee DATABASE_URL al importarse y su engine async queda ligado
+al event loop del TestClient, así que se importa y se abre una única vez.
+Cada test crea su propio usuario para no depender de los demás. Los runners
+se construyen sobre la misma base y se usan sin arrancar su loop: los tests
+llaman directamente a claim, reclaim y process.
+
+    pip install pytest
+    python -m pytest
+"""
+
+import itertools
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import common  # noqa: E402
+
+common.use_backend()
+common.use_runner()
+
+_users = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def data_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("data")
+
+
+@pytest.fixture(scope="session")
+def database(data_dir):
+    path = str(data_dir / "robot_training.db")
+    common.create_database(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def client(database, data_dir):
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{database}",
+        "METRICS_DIR": str(data_dir / "metrics"),
+        "NOTIFY_BACKEND": "none",
+        "BCRYPT_ROUNDS": "4",
+        # Lotes pequeños y sin pausa: los borrados recorren varios lotes
+        "DELETE_BATCH_SIZE": "2",
+        "DELETE_BATCH_PAUSE": "0",
+    })
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def user(client):
+    """Usuario nuevo con sus cabeceras de autenticación"""
+    n = next(_users)
+    headers = common.register_and_login(client, f"user{n}@example.com", "test-password")
+    me = client.get("/users/me", headers=headers).json()
+    return SimpleNamespace(id=me["id"], headers=headers)
+
+
+@pytest.fixture
+def robot(client, user):
+    response = client.post("/robots/", json={"name": "robot", "robot_type": "mobile_robot"}, headers=user.headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def create_simulation(client, user, robot):
+    def create(**fields):
+        body = {"robot_id": robot["id"], "name": "simulation", **fields}
+        response = client.post("/simulations/", json=body, headers=user.headers)
+        assert response.status_code == 200
+        return response.json()
+
+    return create
+
+
+@pytest.fixture
+def make_runner(database, data_dir, monkeypatch):
+    """Construir runners sobre la base de la sesión; se cierran al terminar el test"""
+    runners = []
+    overrides = set()
+
+    def make(**env):
+        settings = {
+            "DATABASE_URL": f"sqlite:///{database}",
+            "METRICS_DIR": str(data_dir / "metrics"),
+            "RUNNER_CHECKPOINT_DIR": str(data_dir / "checkpoints"),
+            "LOG_ARCHIVE_DIR": str(data_dir / "log_archives"),
+            "RUNNER_NOTIFY_PORT": "0",
+            "RUNNER_ENGINE": "dummy",
+            "SIMULATION_TIME_SCALE": "0",
+            "RUNNER_CHECKPOINT_INTERVAL": "0",
+            "RUNNER_ID": f"runner-{len(runners)}",
+            **env,
+        }
+        # Las variables de un runner anterior no se heredan
+        for name in overrides - settings.keys():
+            monkeypatch.delenv(name, raising=False)
+        overrides.update(env)
+        for name, value in settings.items():
+            monkeypatch.setenv(name, value)
+        from simulation_runner import SimulationRunner
+
+        runner = SimulationRunner()
+        runners.append(runner)
+        return runner
+
+    yield make
+    for runner in runners:
+        runner.log_sink.close()
+        runner.storage.dispose()
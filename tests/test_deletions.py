@@ -0,0 +1,51 @@
+import sqlite3
+
+
+def _add_logs(database, simulation, count):
+    with sqlite3.connect(database) as conn:
+        conn.executemany(
+            "INSERT INTO training_logs (simulation_id, robot_id, user_id, log_level, message) VALUES (?, ?, ?, 'INFO', ?)",
+            [(simulation["id"], simulation["robot_id"], simulation["user_id"], f"log {i}") for i in range(count)],
+        )
+
+
+def _count(database, table, column, value):
+    with sqlite3.connect(database) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} = ?", (value,)).fetchone()[0]
+
+
+def test_delete_robot_cascades_in_batches(client, database, user, robot, create_simulation):
+    # DELETE_BATCH_SIZE=2 (conftest): 5 logs por simulación ocupan varios lotes
+    for simulation in (create_simulation(), create_simulation()):
+        _add_logs(database, simulation, 5)
+    other_robot = client.post("/robots/", json={"name": "other", "robot_type": "mobile_robot"}, headers=user.headers).json()
+    other = client.post("/simulations/", json={"robot_id": other_robot["id"], "name": "other"}, headers=user.headers).json()
+    _add_logs(database, other, 3)
+
+    response = client.delete(f"/robots/{robot['id']}", headers=user.headers)
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == {"training_logs": 10, "simulations": 2, "robots": 1}
+    assert client.get(f"/robots/{robot['id']}", headers=user.headers).status_code == 404
+    assert _count(database, "simulations", "robot_id", robot["id"]) == 0
+    assert _count(database, "training_logs", "robot_id", robot["id"]) == 0
+    assert _count(database, "training_logs", "simulation_id", other["id"]) == 3
+
+
+def test_delete_simulation_keeps_siblings(client, database, user, create_simulation):
+    target, sibling = create_simulation(), create_simulation()
+    _add_logs(database, target, 3)
+    _add_logs(database, sibling, 2)
+
+    response = client.delete(f"/simulations/{target['id']}", headers=user.headers)
+
+    assert response.json()["deleted"] == {"training_logs": 3, "simulations": 1, "robots": 0}
+    assert client.get(f"/simulations/{target['id']}", headers=user.headers).status_code == 404
+    assert _count(database, "training_logs", "simulation_id", sibling["id"]) == 2
+
+
+def test_delete_requires_ownership(client, robot):
+    from common import register_and_login
+
+    stranger = register_and_login(client, "stranger@example.com", "test-password")
+    assert client.delete(f"/robots/{robot['id']}", headers=stranger).status_code == 404
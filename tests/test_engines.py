@@ -0,0 +1,35 @@
+import sqlite3
+
+import pytest
+
+from engines import InvalidParameters, build_engine
+
+
+@pytest.mark.parametrize("parameters", [
+    {"population": 0},
+    {"num_envs": 10**9},
+    {"iterations": -1},
+    {"max_steps": "many"},
+    {"max_steps": 2.5},
+])
+def test_diff_drive_rejects_out_of_range_sizes(parameters):
+    with pytest.raises(InvalidParameters) as error:
+        build_engine("diff_drive", {}, parameters)
+    assert f"`{next(iter(parameters))}`" in str(error.value)
+
+
+def test_invalid_parameters_fail_without_retries(database, user, create_simulation, make_runner):
+    simulation_id = create_simulation(parameters={"engine": "diff_drive", "population": 0})["id"]
+    runner = make_runner()
+
+    runner.process_simulation(runner.claim_user_simulation(user.id))
+
+    with sqlite3.connect(database) as conn:
+        status, attempts = conn.execute(
+            "SELECT status, attempts FROM simulations WHERE id = ?", (simulation_id,)
+        ).fetchone()
+        message = conn.execute(
+            "SELECT message FROM training_logs WHERE simulation_id = ? AND log_level = 'ERROR'", (simulation_id,)
+        ).fetchone()[0]
+    assert (status, attempts) == ("failed", 1)
+    assert "`population` debe ser entre 1 y 4096" in message
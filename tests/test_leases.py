@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+
+import pytest
+
+from simulation_runner import LeaseLostError
+
+
+def _rows(database, ids):
+    with sqlite3.connect(database) as conn:
+        conn.row_factory = sqlite3.Row
+        marks = ",".join("?" * len(ids))
+        return {
+            row["id"]: dict(row)
+            for row in conn.execute(f"SELECT id, status, worker_id FROM simulations WHERE id IN ({marks})", ids)
+        }
+
+
+def test_concurrent_claims_are_exclusive(database, user, create_simulation, make_runner):
+    ids = [create_simulation()["id"] for _ in range(20)]
+    runners = [make_runner(), make_runner()]
+    claims = []
+    claims_lock = threading.Lock()
+
+    def claim_all(runner):
+        while True:
+            simulation = runner.claim_user_simulation(user.id)
+            if simulation is None:
+                # Un fallo puntual (lock ocupado) también devuelve None: parar solo con la cola vacía
+                if all(row["status"] != "pending" for row in _rows(database, ids).values()):
+                    return
+                continue
+            with claims_lock:
+                claims.append((simulation["id"], simulation["worker_id"]))
+
+    threads = [threading.Thread(target=claim_all, args=(runner,)) for runner in runners for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    claimed_ids = [simulation_id for simulation_id, _ in claims]
+    assert sorted(claimed_ids) == sorted(ids)
+    rows = _rows(database, ids)
+    for simulation_id, worker_id in claims:
+        assert rows[simulation_id]["status"] == "running"
+        assert rows[simulation_id]["worker_id"] == worker_id
+
+
+def test_reclaim_returns_only_expired_leases(database, user, create_simulation, make_runner):
+    stalled_id = create_simulation(priority=1)["id"]
+    live_id = create_simulation()["id"]
+    # Un lease negativo nace expirado: el runner "dejó de renovarlo"
+    stalled_runner = make_runner(RUNNER_LEASE_SECONDS="-1")
+    live_runner = make_runner()
+
+    stalled = stalled_runner.claim_user_simulation(user.id)
+    live = live_runner.claim_user_simulation(user.id)
+    assert (stalled["id"], live["id"]) == (stalled_id, live_id)
+
+    assert live_runner.reclaim_expired_leases() == 1
+    rows = _rows(database, [stalled_id, live_id])
+    assert rows[stalled_id] == {"id": stalled_id, "status": "pending", "worker_id": None}
+    assert rows[live_id]["status"] == "running"
+
+    # El runner original ya no puede renovar; otro la vuelve a reclamar
+    with pytest.raises(LeaseLostError):
+        stalled_runner.renew_lease(stalled)
+    live_runner.renew_lease(live)
+    assert live_runner.claim_user_simulation(user.id)["id"] == stalled_id
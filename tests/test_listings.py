@@ -0,0 +1,55 @@
+def _pages(client, headers, limit, between_pages=None):
+    """Recorrer /simulations/ por cursor; `between_pages` se llama tras la primera página"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/simulations/", params=params, headers=headers)
+        assert response.status_code == 200
+        ids.extend(simulation["id"] for simulation in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        pages += 1
+        if pages == 1 and between_pages:
+            between_pages()
+        if cursor is None:
+            return ids
+
+
+def test_cursor_pages_are_stable_under_inserts(client, user, create_simulation):
+    ids = [create_simulation(name=f"sim-{i}")["id"] for i in range(7)]
+    inserted = []
+
+    ids_seen = _pages(client, user.headers, limit=3, between_pages=lambda: inserted.append(create_simulation()["id"]))
+
+    # De la más reciente a la más antigua, sin repetir ni saltar filas; la
+    # insertada durante el recorrido queda antes del cursor y no aparece
+    assert ids_seen == sorted(ids, reverse=True)
+    assert _pages(client, user.headers, limit=3) == sorted(ids + inserted, reverse=True)
+
+
+def test_same_cursor_returns_same_page(client, user, create_simulation):
+    for i in range(5):
+        create_simulation(name=f"sim-{i}")
+    cursor = client.get("/simulations/", params={"limit": 2}, headers=user.headers).headers["X-Next-Cursor"]
+    first = client.get("/simulations/", params={"limit": 2, "cursor": cursor}, headers=user.headers)
+    create_simulation(name="newer")
+    second = client.get("/simulations/", params={"limit": 2, "cursor": cursor}, headers=user.headers)
+    assert first.json() == second.json()
+    assert first.headers["X-Next-Cursor"] == second.headers["X-Next-Cursor"]
+
+
+def test_etag_changes_after_runner_write(client, user, create_simulation, make_runner):
+    simulation = create_simulation()
+    response = client.get("/simulations/", headers=user.headers)
+    etag = response.headers["ETag"]
+    assert client.get("/simulations/", headers={**user.headers, "If-None-Match": etag}).status_code == 304
+
+    # El runner escribe directamente en la base, sin pasar por el backend
+    runner = make_runner()
+    assert runner.claim_user_simulation(user.id)["id"] == simulation["id"]
+
+    response = client.get("/simulations/", headers={**user.headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["status"] == "running"
+    new_etag = response.headers["ETag"]
+    assert client.get("/simulations/", headers={**user.headers, "If-None-Match": new_etag}).status_code == 304
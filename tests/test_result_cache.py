@@ -0,0 +1,74 @@
+import sqlite3
+
+from engines import engine_class
+from result_cache import cache_key
+
+
+def _key(parameters, engine="dummy", version="1", settings=None):
+    return cache_key("mobile_robot", {"wheel_base": 0.5}, parameters, engine, version, settings)
+
+
+def test_cache_key_requires_seed():
+    assert _key({"iterations": 10}) is None
+
+
+def test_cache_key_ignores_equivalent_spellings():
+    base = _key({"seed": 1, "iterations": 10, "dt": 1})
+    assert _key({"dt": 1.0, "iterations": 10, "seed": 1}) == base
+    assert _key({"seed": 1, "iterations": 10, "dt": 1, "checkpoint_interval": 5}) == base
+    # El motor entra por su nombre efectivo, venga o no en los parámetros
+    assert _key({"seed": 1, "iterations": 10, "dt": 1, "engine": "dummy"}) == base
+
+
+def test_cache_key_covers_results_inputs():
+    base = _key({"seed": 1})
+    assert _key({"seed": 2}) != base
+    assert _key({"seed": 1}, engine="diff_drive") != base
+    assert _key({"seed": 1}, version="2") != base
+    assert _key({"seed": 1}, settings={"rollout_workers": 2}) != base
+    assert cache_key("arm", {"wheel_base": 0.5}, {"seed": 1}, "dummy", "1") != base
+
+
+def test_rollout_workers_from_environment_change_the_key(monkeypatch):
+    settings = engine_class("diff_drive").result_settings
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    monkeypatch.setenv("RUNNER_ROLLOUT_WORKERS", "1")
+    one = _key({"seed": 1}, "diff_drive", settings=settings({"seed": 1}))
+    monkeypatch.setenv("RUNNER_ROLLOUT_WORKERS", "4")
+    four = _key({"seed": 1}, "diff_drive", settings=settings({"seed": 1}))
+    assert one != four
+    assert four == _key({"seed": 1, "rollout_workers": 4}, "diff_drive", settings=settings({"rollout_workers": 4}))
+
+
+def test_repeated_simulation_completes_from_cache(database, user, create_simulation, make_runner):
+    parameters = {"engine": "dummy", "seed": 7}
+    first_id = create_simulation(parameters=parameters)["id"]
+    second_id = create_simulation(parameters=parameters)["id"]
+    runner = make_runner()
+
+    for _ in range(2):
+        runner.process_simulation(runner.claim_user_simulation(user.id))
+
+    with sqlite3.connect(database) as conn:
+        rows = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT id, status, results, result_cache_hit FROM simulations WHERE id IN (?, ?)",
+                (first_id, second_id),
+            )
+        }
+    assert rows[first_id][0] == rows[second_id][0] == "completed"
+    assert rows[second_id][1] == rows[first_id][1]
+    assert (rows[first_id][2], rows[second_id][2]) == (0, 1)
+    stats = runner.result_cache.stats()
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+
+
+def test_rollout_workers_are_clamped_in_the_key(monkeypatch):
+    settings = engine_class("diff_drive").result_settings
+    monkeypatch.setattr("os.cpu_count", lambda: 4)
+    monkeypatch.setenv("RUNNER_MAX_ROLLOUT_WORKERS", "2")
+    assert settings({"rollout_workers": 500}) == {"rollout_workers": 2}
+    assert settings({"rollout_workers": 0}) == settings({"rollout_workers": -3}) == {"rollout_workers": 1}
+    monkeypatch.delenv("RUNNER_MAX_ROLLOUT_WORKERS")
+    assert settings({"rollout_workers": 500}) == {"rollout_workers": 4}
@@ -0,0 +1,26 @@
+import pytest
+
+
+@pytest.mark.parametrize("spec", [
+    {"min": "a", "max": 1},
+    {"min": True, "max": 2},
+    {"type": "int", "min": 5, "max": 1},
+    {"min": 0.5, "max": 0.1},
+])
+def test_malformed_random_spec_is_a_bad_request(client, user, robot, spec):
+    body = {"robot_id": robot["id"], "name": "sweep", "random": {"space": {"lr": spec}, "count": 3}}
+    response = client.post("/simulations/batch", json=body, headers=user.headers)
+    assert response.status_code == 400
+    assert "'lr'" in response.json()["detail"]
+
+
+def test_random_sweep_samples_within_range(client, user, robot):
+    body = {
+        "robot_id": robot["id"], "name": "sweep",
+        "random": {"space": {"steps": {"type": "int", "min": 3, "max": 3}, "lr": {"min": 0.1, "max": 0.2}}, "count": 4, "seed": 1},
+    }
+    response = client.post("/simulations/batch", json=body, headers=user.headers)
+    assert response.status_code == 200
+    simulations = client.get("/simulations/", params={"sweep_id": response.json()["sweep_id"]}, headers=user.headers).json()
+    assert len(simulations) == 4
+    assert all(s["parameters"]["steps"] == 3 and 0.1 <= s["parameters"]["lr"] <= 0.2 for s in simulations)